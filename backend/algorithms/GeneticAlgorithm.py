@@ -1,11 +1,127 @@
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from collections import OrderedDict
+import multiprocessing
+import multiprocessing.util
+import threading
+from contextlib import nullcontext
 import random
+import os
+
+import numpy as np
+
+from algorithms.core import Problem, SearchStats, StopCriteria, OVERLOAD_PENALTY, ROUTE_PENALTY, is_bike_type, vehicle_profile
+from algorithms.granular import GranularNeighborhood, apply_move
+from algorithms.matrix import SharedMatrix, attach_shared, detach_shared, CAR, BIKE
+from algorithms.population import ArrayPopulation, DECODERS, encode, decode
+from algorithms.savings import clarke_wright_routes
+
+# list: chrom list dengan separator -1, array: populasi numpy (algorithms/population.py)
+ENCODINGS = ("list", "array")
+
+# Maksimal island yang berevolusi bersamaan di process pool
+ISLAND_WORKERS = int(os.environ.get("GA_ISLAND_WORKERS", os.cpu_count() or 1))
+
+# Ukuran default cache fitness (per chrom) dan cost per rute, 0 = tanpa cache
+FITNESS_CACHE_SIZE = 20000
+ROUTE_CACHE_SIZE = 50000
+
+# Memetic (opt-in, params.localSearch): setiap generasi sekian chrom terbaik
+# yang belum lokal optimum diperbaiki dengan descent granular. GA murni
+# jarang lebih baik dari solusi savings awal, tapi descent membuat tiap
+# generasi ~2-3x lebih lambat. 0 = GA murni (default)
+LOCAL_SEARCH_SIZE = 0
+# batas move per descent dan jumlah tetangga granular
+LOCAL_SEARCH_STEPS = 100
+LOCAL_SEARCH_K = 10
+
+_island_pool = None
+_island_pool_lock = threading.Lock()
+# solver island per run yang disimpan di setiap proses worker
+ISLAND_SOLVERS_PER_WORKER = 2
+_island_solvers = OrderedDict()
+
+
+class MemoCache:
+    """LRU cache berukuran tetap yang menghitung hit / miss."""
+
+    def __init__(self, size):
+        self.size = size
+        self.data = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        value = self.data.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self.data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key, value):
+        if self.size <= 0:
+            return
+        self.data[key] = value
+        if len(self.data) > self.size:
+            self.data.popitem(last=False)
+
+
+def routes_chrom(routes):
+    # rute (tanpa depot) -> chrom, rute dipisah -1
+    chrom = []
+    for route in routes:
+        if not route:
+            continue
+        if chrom:
+            chrom.append(-1)
+        chrom.extend(route)
+    return chrom
+
+
+def chrom_key(chrom):
+    # bentuk kanonik: separator di ujung / berurutan tidak mengubah hasil decode
+    key = []
+    prev = -1
+    for gene in chrom:
+        if gene != -1 or prev != -1:
+            key.append(gene)
+        prev = gene
+    if key and key[-1] == -1:
+        key.pop()
+    return tuple(key)
+
+
+def cache_report(counts):
+    """counts: {nama: (hits, misses)} -> hit rate untuk response."""
+    report = {}
+    for name, (hits, misses) in counts.items():
+        lookups = hits + misses
+        report[name] = {
+            "hits": hits,
+            "misses": misses,
+            "hitRate": hits / lookups if lookups else 0.0,
+        }
+    return report
+
 
 class VRPSolver:
     def __init__(self, dist_car, dist_bike, pop_size, generations, mutation_rate,
-                 car_count, bike_count, car_capacity, bike_capacity, demands):
+                 car_count, bike_count, car_capacity, bike_capacity, demands,
+                 cache_size=FITNESS_CACHE_SIZE, encoding="list", decode="greedy",
+                 split_max_length=None, deadline=None, local_search=LOCAL_SEARCH_SIZE):
+        if encoding not in ENCODINGS:
+            raise ValueError(f"Unknown encoding '{encoding}'")
+        if decode not in DECODERS:
+            raise ValueError(f"Unknown decode mode '{decode}'")
+
         # init input to attr
-        self.dist_car = dist_car
-        self.dist_bike = dist_bike
+        # fleet GA = car_count mobil lalu bike_count motor
+        self.problem = Problem.from_counts(dist_car, dist_bike, demands, car_count, bike_count,
+                                           car_capacity, bike_capacity)
+        self.matrices = self.problem.matrices
+        self.dist_car = self.matrices.car
+        self.dist_bike = self.matrices.bike
         self.pop_size = pop_size
         self.generations = generations
         self.mutation_rate = mutation_rate
@@ -20,64 +136,40 @@ class VRPSolver:
         self.depot_idx = 0
         self.customer_locations = list(range(1, self.n_location))
         self.total_vehicles = car_count + bike_count
-        self.vehicle_capacities = [car_capacity] * car_count + [bike_capacity] * bike_count
+        self.vehicle_capacities = self.problem.capacities
+        # counter diagnostics: chromosome dinilai, offspring masuk generasi baru
+        self.stats = SearchStats()
+        # evolusi berhenti lebih awal kalau deadline lewat (island: per worker)
+        self.stop = StopCriteria(deadline)
+        # split optimal hanya ada untuk populasi array; keduanya butuh minimal 1 customer
+        if self.n_location > 1:
+            self.encoding = "array" if decode == "split" else encoding
+            self.decode = decode
+        else:
+            self.encoding = "list"
+            self.decode = "greedy"
+        self.split_max_length = split_max_length
+
+        # memo: chrom kanonik -> (fitness, cost), (rute, tipe) -> cost rute
+        self.fitness_cache = MemoCache(cache_size)
+        self.route_cache = MemoCache(ROUTE_CACHE_SIZE if cache_size > 0 else 0)
+
+        # granular butuh minimal 2 customer
+        self.local_search_size = max(0, int(local_search)) if self.n_location > 2 else 0
+        self.granular = None
+        # chrom kanonik yang sudah pernah di-local search, tidak diulang
+        self.local_optima = set()
 
     # generate routes/chrom with cw saving 
     def generate_clarke_wright_chrom(self):
-        # calc saving
-        savings = []
-        for i in self.customer_locations:
-            for j in self.customer_locations:
-                if i != j:
-                    # savings = d(0,i) + d(0,j) - d(i,j)
-                    s_val = self.dist_car[0][i] + self.dist_car[0][j] - self.dist_car[i][j]
-                    savings.append((s_val, i, j))
-        
-        # sort savings descending
-        savings.sort(key=lambda x: x[0], reverse=True)
-        
-        # init route each customer in single route
-        routes = []
-        for c in self.customer_locations:
-            routes.append([c])
-            
-        def find_route(node):
-            for r in routes:
-                if node in r:
-                    return r
-            return None
-
-        # merge route based on saving
-        max_cap = max(self.car_capacity, self.bike_capacity) 
-        
-        for s_val, i, j in savings:
-            route_i = find_route(i)
-            route_j = find_route(j)
-            
-            if route_i != route_j:
-
-                if route_i[-1] == i and route_j[0] == j:
-                    dem_i = sum(self.demands[x] for x in route_i)
-                    dem_j = sum(self.demands[x] for x in route_j)
-                    if dem_i + dem_j <= max_cap:
-                        route_i.extend(route_j)
-                        routes.remove(route_j)
-                        
-                elif route_i[0] == i and route_j[-1] == j:
-                    dem_i = sum(self.demands[x] for x in route_i)
-                    dem_j = sum(self.demands[x] for x in route_j)
-                    if dem_i + dem_j <= max_cap:
-                        route_j.extend(route_i)
-                        routes.remove(route_i)
+        # parallel savings; route > smallest capacity only as many as the bigger vehicles
+        caps = self.vehicle_capacities or [max(self.car_capacity, self.bike_capacity)]
+        small = min(caps)
+        routes = clarke_wright_routes(self.dist_car, self.demands, max(caps),
+                                      small, sum(1 for c in caps if c > small))
 
         # convert route to chromosome
-        cw_chrom = []
-        for idx, r in enumerate(routes):
-            cw_chrom.extend(r)
-            if idx < len(routes) - 1:
-                cw_chrom.append(-1)
-        
-        return cw_chrom
+        return routes_chrom(routes)
 
     # generate routes/chrom with randomization
     def generate_chrom(self):
@@ -108,14 +200,18 @@ class VRPSolver:
         
         return chrom
 
-    def generate_population(self):
+    def generate_population(self, with_savings=True, seed=None):
         pop = []
+        # warm start: chrom dari plan sebelumnya ikut jadi individu
+        if seed is not None:
+            pop.append(seed[:])
         # first chrom from cw saving 
-        cw_solution = self.generate_clarke_wright_chrom()
-        pop.append(cw_solution)
+        if with_savings:
+            cw_solution = self.generate_clarke_wright_chrom()
+            pop.append(cw_solution)
         
         # fill rest with random generate chrom
-        for _ in range(self.pop_size - 1):
+        while len(pop) < self.pop_size:
             pop.append(self.generate_chrom())
             
         return pop
@@ -202,43 +298,80 @@ class VRPSolver:
 
     # calc each route cost in a chrom
     def calculate_cost(self, routes_with_types):
-        total = 0
+        total = 0.0
+        missed = []
+        missed_keys = []
+        profiles = []
         capacity_penalty = 0
         
         for route_info in routes_with_types:
-            route = route_info["route"]
             vtype = route_info["type"]
             demand = route_info["demand"]
             
-            # select distance matrix based on vehicle type
-            dist = self.dist_bike if vtype == "bike" else self.dist_car
-            
-            # calc route distance
-            for j in range(len(route) - 1):
-                total += dist[route[j]][route[j+1]]
+            # route already starts & ends at depot
+            route = route_info["route"][1:-1]
+            key = (tuple(route), vtype)
+            cost = self.route_cache.get(key)
+            if cost is None:
+                missed.append(route)
+                missed_keys.append(key)
+                profiles.append(vehicle_profile(vtype))
+            else:
+                total += cost
             
             # get capacity based on vehicle type
-            capacity = self.bike_capacity if vtype == "bike" else self.car_capacity
+            capacity = self.bike_capacity if is_bike_type(vtype) else self.car_capacity
             
             # check capacity violation
             if demand > capacity:
-                capacity_penalty += (demand - capacity) * 10000
+                capacity_penalty += (demand - capacity) * OVERLOAD_PENALTY
+        
+        # calc distance of uncached routes with one gather
+        if missed:
+            costs = self.matrices.route_costs(missed, self.matrices.profile_offsets(profiles), self.depot_idx)
+            for key, cost in zip(missed_keys, costs.tolist()):
+                self.route_cache.put(key, cost)
+            total += float(costs.sum())
     
         return total + capacity_penalty
 
-    # fitness function to check the chrom
-    def fitness(self, chrom):
+    # (fitness, cost) of a chrom, memoized on the canonical chrom
+    def score(self, chrom):
+        key = chrom_key(chrom)
+        cached = self.fitness_cache.get(key)
+        if cached is not None:
+            return cached
+
         routes = self.decode_chrom(chrom)
         cost = self.calculate_cost(routes)
+        penalized = cost
 
         num_routes = len(routes)
         
         if num_routes > self.total_vehicles:
-            penalty = 50000 * (num_routes - self.total_vehicles)
-            cost += penalty
+            penalty = ROUTE_PENALTY * (num_routes - self.total_vehicles)
+            penalized += penalty
         
-        if cost == 0: return float('inf')
-        return 1 / cost
+        fitness = float('inf') if penalized == 0 else 1 / penalized
+        self.fitness_cache.put(key, (fitness, cost))
+        return fitness, cost
+
+    # fitness function to check the chrom
+    def fitness(self, chrom):
+        return self.score(chrom)[0]
+
+    def cache_counts(self):
+        return {
+            "fitness": (self.fitness_cache.hits, self.fitness_cache.misses),
+            "routeCost": (self.route_cache.hits, self.route_cache.misses),
+        }
+
+    def cache_summary(self, counts):
+        # populasi array (dan split) dinilai batch tanpa memo: tidak ada cache
+        # yang dipakai, jadi tidak dilaporkan (None) daripada hit rate 0
+        if self.encoding != "list":
+            return None
+        return cache_report(counts)
 
     # alternatin edge crossover for explorative 
     def aex_crossover(self, parent1, parent2):
@@ -343,60 +476,440 @@ class VRPSolver:
 
         return chrom
 
-    def run(self):
-        """Main evolution loop"""
-        population = self.generate_population()
-        history = []
+    # evaluate pop, best chrom first
+    def evaluate(self, population):
+        scored = [(ind, self.fitness(ind)) for ind in population]
+        scored.sort(key=lambda x: x[1], reverse=True)
+        return scored
+
+    # new pop with selection and elitism
+    def breed(self, scored):
+        new_pop = [scored[0][0]]
+        sample_size = min(len(scored), max(15, self.pop_size // 3))
+
+        while len(new_pop) < self.pop_size:
+            # tournament selections
+            parents = random.sample(scored[:sample_size], 2)
+            p1, _ = parents[0]
+            p2, _ = parents[1]
+
+            child = self.aex_crossover(p1, p2)
+            child = self.inversion_mutation(child)
+            new_pop.append(child)
+
+        return new_pop
+
+    def local_search(self, chrom):
+        """
+        Descent granular (relocate, swap, 2-opt*, or-opt; move terbaik selama
+        masih memperbaiki) pada rute chrom. Return chrom baru, atau None kalau
+        rutenya lebih banyak dari armada.
+        """
+        if self.granular is None:
+            self.granular = GranularNeighborhood(self.problem, LOCAL_SEARCH_K)
+
+        # rute -> slot kendaraan Problem (mobil dulu, lalu motor)
+        solution = [[] for _ in range(self.total_vehicles)]
+        free = [0, self.car_count]
+        end = [self.car_count, self.total_vehicles]
+        for route_info in self.decode_routes(chrom):
+            kind = 1 if is_bike_type(route_info["type"]) else 0
+            if free[kind] == end[kind]:
+                return None
+            solution[free[kind]] = route_info["route"][1:-1]
+            free[kind] += 1
+
+        for _ in range(LOCAL_SEARCH_STEPS):
+            state, deltas, moves = self.granular.evaluate(solution)
+            if not len(deltas):
+                break
+            best = int(np.argmin(deltas))
+            if deltas[best] >= -1e-9:
+                break
+            apply_move(solution, state, moves[:, best])
+        return routes_chrom(solution)
+
+    def _pick_local_search(self, ranked):
+        # chrom (urut best dulu) yang belum pernah di-local search
+        picked = []
+        for i, chrom in ranked:
+            if len(picked) == self.local_search_size:
+                break
+            key = chrom_key(chrom)
+            if key not in self.local_optima:
+                self.local_optima.add(key)
+                picked.append((i, chrom))
+        return picked
+
+    def improve(self, scored):
+        """Local search untuk chrom terbaik di scored (list path); return scored terurut."""
+        changed = False
+        for i, chrom in self._pick_local_search((i, c) for i, (c, _) in enumerate(scored)):
+            new = self.local_search(chrom)
+            if new is None:
+                continue
+            fitness = self.fitness(new)
+            self.local_optima.add(chrom_key(new))
+            if fitness > scored[i][1]:
+                scored[i] = (new, fitness)
+                changed = True
+        if changed:
+            scored.sort(key=lambda x: x[1], reverse=True)
+        return scored
+
+    def improve_rows(self, ops, tours, starts, fitness, cost):
+        """Local search untuk baris terbaik populasi array, semua array diubah in place."""
+        ranked = ((i, decode(tours[i], starts[i])) for i in np.argsort(-fitness, kind="stable").tolist())
+        rows = []
+        chroms = []
+        for i, chrom in self._pick_local_search(ranked):
+            new = self.local_search(chrom)
+            if new is not None:
+                rows.append(i)
+                chroms.append(new)
+        if not rows:
+            return
+
+        new_tours, new_starts = encode(chroms, self.n_location - 1)
+        new_fitness, new_cost = ops.evaluate(new_tours, new_starts)
+        better = new_fitness > fitness[rows]
+        rows = np.asarray(rows)[better]
+        tours[rows] = new_tours[better]
+        starts[rows] = new_starts[better]
+        fitness[rows] = new_fitness[better]
+        cost[rows] = new_cost[better]
+
+    def _count_generation(self, size):
+        # satu elite, sisanya offspring baru
+        self.stats.evaluated += size
+        self.stats.accepted += size - 1
+        self.stats.iterations += 1
+
+    def _evolve_list(self, population, generations, on_best):
+        for gen in range(generations):
+            scored = self.evaluate(population)
+            if self.local_search_size:
+                scored = self.improve(scored)
+            # cost of the best chrom is already in the fitness cache
+            best = scored[0][0]
+            cost = self.score(best)[1]
+            on_best(gen, best, cost)
+            population = self.breed(scored)
+            self._count_generation(len(scored))
+            if self.stop.done(cost):
+                break
+        return population
+
+    def array_ops(self, rng=None):
+        return ArrayPopulation(self.matrices, self.problem.demand_arr, self.car_count, self.bike_count,
+                               self.car_capacity, self.bike_capacity, self.mutation_rate, rng,
+                               self.decode, self.split_max_length)
+
+    # routes_with_types for a chrom, via optimal split when decode == "split"
+    def decode_routes(self, chrom):
+        if self.decode != "split":
+            return self.decode_chrom(chrom)
+
+        ops = self.array_ops()
+        tour = np.array([g for g in chrom if g != -1], dtype=np.intp)
+        routes = ops.split_routes(tour)
+        if routes is None:
+            # fleet too small for a feasible split, same fallback as evaluate_split
+            return self.decode_chrom(decode(tour, ops.split(tour[None, :])[0]))
+
+        routes_with_types = []
+        for route, is_bike in routes:
+            routes_with_types.append({
+                "route": [self.depot_idx] + route + [self.depot_idx],
+                "type": "bike" if is_bike else "car",
+                "demand": sum(self.demands[c] for c in route)
+            })
+        return routes_with_types
+
+    def _evolve_array(self, population, generations, on_best):
+        ops = self.array_ops(np.random.default_rng(random.randrange(2 ** 32)))
+        tours, starts = encode(population, self.n_location - 1)
+
+        for gen in range(generations):
+            fitness, cost = ops.evaluate(tours, starts)
+            if self.local_search_size:
+                self.improve_rows(ops, tours, starts, fitness, cost)
+            best = int(np.argmax(fitness))
+            on_best(gen, decode(tours[best], starts[best]), float(cost[best]))
+            tours, starts = ops.next_generation(tours, starts, fitness)
+            self._count_generation(len(fitness))
+            if self.stop.done(float(cost[best])):
+                break
+
+        return [decode(tour, start) for tour, start in zip(tours, starts)]
+
+    def _evolve(self, population, generations, on_best):
+        # on_best(gen, best chrom generasi ini, cost) dipanggil setiap generasi
+        if self.encoding == "array":
+            return self._evolve_array(population, generations, on_best)
+        return self._evolve_list(population, generations, on_best)
+
+    def rank(self, population):
+        # population terurut best dulu
+        if self.encoding == "array":
+            fitness, _ = self.array_ops().evaluate(*encode(population, self.n_location - 1))
+            return [population[i] for i in np.argsort(-fitness, kind="stable")]
+        return [ind for ind, _ in self.evaluate(population)]
+
+    def evolve(self, population, generations):
+        """
+        Satu epoch island: evolusi `generations` generasi tanpa history.
+        Return (population terurut best dulu, best chrom, best cost).
+        """
         best_chrom = None
         best_cost = float("inf")
 
-        for gen in range(self.generations):
-            # evaluate pop
-            scored = [(ind, self.fitness(ind)) for ind in population]
-            scored.sort(key=lambda x: x[1], reverse=True)
+        def on_best(gen, chrom, cost):
+            nonlocal best_chrom, best_cost
+            if cost < best_cost:
+                best_cost = cost
+                best_chrom = chrom[:]
+                self.stats.improved += 1
+
+        population = self._evolve(population, generations, on_best)
+        return self.rank(population), best_chrom, best_cost
+
+    def run(self, progress=None, seed=None):
+        """
+        Main evolution loop. progress: callback untuk setiap titik history baru.
+        seed: chrom awal opsional (warm start).
+        """
+        population = self.generate_population(seed=seed)
+        history = []
+        best_chrom = None
+        best_cost = float("inf")
 
-            # get best chrom
-            best = scored[0][0]
-            routes = self.decode_chrom(best)
-            cost = self.calculate_cost(routes)
+        last = None
+
+        def record(gen, best):
+            routes = self.decode_routes(best)
+            car_routes = sum(1 for r in routes if r["type"] == "car")
+            bike_routes = sum(1 for r in routes if r["type"] == "bike")
+            history.append({
+                "iteration": gen,
+                "cost": best_cost,
+                "carsUsed": car_routes,
+                "bikesUsed": bike_routes
+            })
+            if progress:
+                progress(history[-1])
 
+        def on_best(gen, best, cost):
+            nonlocal best_chrom, best_cost, last
             if cost < best_cost:
                 best_cost = cost
                 best_chrom = best[:]
+                self.stats.improved += 1
 
+            last = (gen, best)
             if gen % 5 == 0:
-                car_routes = sum(1 for r in routes if r["type"] == "car")
-                bike_routes = sum(1 for r in routes if r["type"] == "bike")
-                history.append({
-                    "iteration": gen,
-                    "cost": best_cost,
-                    "carsUsed": car_routes,
-                    "bikesUsed": bike_routes
-                })
-
-            # new pop with selection and elitism
-            new_pop = [best]
-            
-            while len(new_pop) < self.pop_size:
-                # tournament selections
-                sample_size = min(len(scored), max(15, self.pop_size // 3))
-                parents = random.sample(scored[:sample_size], 2)
-                p1, _ = parents[0]
-                p2, _ = parents[1]
-
-                child = self.aex_crossover(p1, p2)
-                child = self.inversion_mutation(child)
-                new_pop.append(child)
-
-            population = new_pop
+                record(gen, best)
+
+        self._evolve(population, self.generations, on_best)
+        # berhenti lebih awal (deadline / stagnation): titik generasi terakhir
+        if last is not None and last[0] % 5 != 0 and self.stop.reason != "iterationLimit":
+            record(*last)
         
-        final_routes = self.decode_chrom(best_chrom)
-        return final_routes, best_cost, history
+        final_routes = self.decode_routes(best_chrom)
+        return final_routes, best_cost, history, self.cache_summary(self.cache_counts())
+
+
+# ============================
+# ISLAND MODEL
+# ============================
+def _island_solver(spec, config):
+    """
+    Solver island di proses worker, dipakai ulang untuk setiap epoch run yang
+    sama (key: nama shared memory) supaya cache fitness / rute dan chrom yang
+    sudah di-local search tidak hilang tiap epoch.
+    """
+    name = spec[0]
+    if name in _island_solvers:
+        _island_solvers.move_to_end(name)
+        return _island_solvers[name][1]
+
+    shm, block = attach_shared(spec)
+    solver = VRPSolver(block[CAR], block[BIKE], generations=0, **config)
+    _island_solvers[name] = (shm, solver)
+    # run yang sudah lama tidak kirim epoch ke worker ini dilepas
+    while len(_island_solvers) > ISLAND_SOLVERS_PER_WORKER:
+        _, (old_shm, _) = _island_solvers.popitem(last=False)
+        detach_shared(old_shm)
+    return solver
+
+
+def _evolve_island(spec, config, population, generations, seed, with_savings):
+    """
+    Satu epoch satu island di proses worker. population None = island baru,
+    dibangkitkan di worker.
+    """
+    random.seed(seed)
+    solver = _island_solver(spec, config)
+    # cache tetap, counter dan stop per epoch (hitungannya dikirim balik)
+    solver.stats = SearchStats()
+    solver.stop = StopCriteria(config["deadline"])
+    for cache in (solver.fitness_cache, solver.route_cache):
+        cache.hits = cache.misses = 0
+    if population is None:
+        population = solver.generate_population(with_savings)
+    return solver.evolve(population, generations) + ((solver.cache_counts(), solver.stats.report()),)
+
+
+def _get_island_pool():
+    global _island_pool
+    with _island_pool_lock:
+        if _island_pool is None:
+            _island_pool = ProcessPoolExecutor(
+                ISLAND_WORKERS, mp_context=multiprocessing.get_context("spawn")
+            )
+            # sama seperti pool portfolio: tetap di-shutdown di proses worker job
+            multiprocessing.util.Finalize(_island_pool, _island_pool.shutdown, exitpriority=100)
+        return _island_pool
+
+
+def _run_epoch(solver, shared, config, populations, generations, seeds, workers):
+    # evolusi semua island satu epoch; serial di proses ini kalau workers <= 1
+    if shared is None:
+        results = []
+        for i, population in enumerate(populations):
+            random.seed(seeds[i])
+            if population is None:
+                population = solver.generate_population(i == 0)
+            # solver dipakai semua island, cache-nya ikut dipakai bersama
+            results.append(solver.evolve(population, generations) + (None,))
+        return results
+
+    pool = _get_island_pool()
+    results = [None] * len(populations)
+    queue = list(range(len(populations)))
+    pending = {}
+    while queue or pending:
+        while queue and len(pending) < workers:
+            i = queue.pop(0)
+            future = pool.submit(
+                _evolve_island, shared.spec, config, populations[i], generations, seeds[i], i == 0
+            )
+            pending[future] = i
+        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            results[pending.pop(future)] = future.result()
+    return results
+
+
+def island_genetic_algorithm(dist_car, dist_bike, pop_size, generations, mutation_rate,
+                             car_count, bike_count, car_capacity, bike_capacity, demands,
+                             islands=4, migration_interval=10, migration_size=2,
+                             workers=None, cache_size=FITNESS_CACHE_SIZE, encoding="list",
+                             decode="greedy", split_max_length=None, progress=None, stats=None,
+                             stop=None, initial_routes=None, local_search=LOCAL_SEARCH_SIZE):
+    """
+    Island model: pop_size dibagi ke `islands` sub-populasi yang berevolusi
+    paralel di process pool. Setiap `migration_interval` generasi, migration_size
+    chrom terbaik tiap island menggantikan chrom terburuk island berikutnya (ring).
+    stop: deadline dicek juga di dalam epoch (di worker), stagnation per epoch.
+    Return (routes, cost, history, info, cache) - history satu titik per epoch.
+    """
+    if stop is None:
+        stop = StopCriteria()
+    islands = max(1, int(islands))
+    migration_interval = max(1, int(migration_interval))
+    island_size = max(2, pop_size // islands)
+    migration_size = max(0, min(int(migration_size), island_size - 1))
+    workers = min(islands, ISLAND_WORKERS if workers is None else int(workers), ISLAND_WORKERS)
+
+    config = dict(pop_size=island_size, mutation_rate=mutation_rate,
+                  car_count=car_count, bike_count=bike_count,
+                  car_capacity=car_capacity, bike_capacity=bike_capacity, demands=demands,
+                  cache_size=cache_size, encoding=encoding, decode=decode,
+                  split_max_length=split_max_length, deadline=stop.deadline,
+                  local_search=local_search)
+    # solver lokal untuk decode hasil (dan evolusi kalau serial)
+    solver = VRPSolver(dist_car, dist_bike, generations=generations, **config)
+    if stats is not None:
+        solver.stats = stats
+
+    populations = [None] * islands
+    if initial_routes is not None:
+        # warm start: plan sebelumnya masuk island pertama
+        populations[0] = solver.generate_population(True, routes_chrom(initial_routes))
+    history = []
+    best_chrom = None
+    best_cost = float("inf")
+    gen = 0
+    worker_counts = []
+    worker_stats = []
+
+    with (SharedMatrix(dist_car, dist_bike) if workers > 1 else nullcontext()) as shared:
+        while gen < generations:
+            epoch = min(migration_interval, generations - gen)
+            # seed per island diambil dari RNG utama supaya run dengan seed sama reproducible
+            seeds = [random.randrange(2 ** 31) for _ in range(islands)]
+            results = _run_epoch(solver, shared, config, populations, epoch, seeds, workers)
+            gen += epoch
+
+            populations = [r[0] for r in results]
+            worker_counts += [r[3][0] for r in results if r[3] is not None]
+            worker_stats += [r[3][1] for r in results if r[3] is not None]
+            for _, chrom, cost, _ in results:
+                if cost < best_cost:
+                    best_cost = cost
+                    best_chrom = chrom
+
+            # migrasi ring: elite island i menggantikan yang terburuk di island i+1
+            if islands > 1 and migration_size > 0 and gen < generations:
+                migrants = [[c[:] for c in pop[:migration_size]] for pop in populations]
+                for i in range(islands):
+                    target = populations[(i + 1) % islands]
+                    target[-migration_size:] = migrants[i]
+
+            routes = solver.decode_routes(best_chrom)
+            history.append({
+                "iteration": gen,
+                "cost": best_cost,
+                "carsUsed": sum(1 for r in routes if r["type"] == "car"),
+                "bikesUsed": sum(1 for r in routes if r["type"] == "bike"),
+                "islandCosts": [r[2] for r in results],
+            })
+            if progress:
+                progress(history[-1])
+            if stop.done(best_cost, steps=epoch):
+                break
+
+    info = {
+        "islands": islands,
+        "populationPerIsland": island_size,
+        "migrationInterval": migration_interval,
+        "migrationSize": migration_size,
+        "workers": workers,
+    }
+    counts = solver.cache_counts()
+    for worker in worker_counts:
+        for name, (hits, misses) in worker.items():
+            counts[name] = (counts[name][0] + hits, counts[name][1] + misses)
+    for report in worker_stats:
+        solver.stats.add(report)
+    return solver.decode_routes(best_chrom), best_cost, history, info, solver.cache_summary(counts)
 
-def genetic_algorithm(dist_car, dist_bike, pop_size, generations, mutation_rate,
-                      car_count, bike_count, car_capacity, bike_capacity, demands):
 
-    solver = VRPSolver(dist_car, dist_bike, pop_size, generations, car_count, 
-                       bike_count, car_capacity, bike_capacity, demands, mutation_rate=0.2)
+def genetic_algorithm(dist_car, dist_bike, pop_size, generations, mutation_rate,
+                      car_count, bike_count, car_capacity, bike_capacity, demands,
+                      cache_size=FITNESS_CACHE_SIZE, encoding="list", decode="greedy",
+                      split_max_length=None, progress=None, stats=None, stop=None,
+                      initial_routes=None, local_search=LOCAL_SEARCH_SIZE):
+
+    solver = VRPSolver(dist_car, dist_bike, pop_size, generations, mutation_rate,
+                       car_count, bike_count, car_capacity, bike_capacity, demands,
+                       cache_size, encoding, decode, split_max_length,
+                       local_search=local_search)
+    if stats is not None:
+        solver.stats = stats
+    if stop is not None:
+        solver.stop = stop
     
-    return solver.run()
\ No newline at end of file
+    seed = routes_chrom(initial_routes) if initial_routes is not None else None
+    return solver.run(progress, seed)
\ No newline at end of file
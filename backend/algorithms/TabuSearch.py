@@ -1,64 +1,87 @@
 import random
+import numpy as np
 
-def solve_tabu_search(dist_car, dist_bike, demands, vehicles, max_iter=500, tabu_tenure=10):
+from algorithms.core import Problem, SearchStats, StopCriteria
+from algorithms.granular import GranularNeighborhood, apply_move, move_attributes as granular_attributes
+from algorithms.savings import INITIAL_SOLUTIONS, savings_solution
+
+# Mode evaluasi neighborhood:
+# "sampled"  -> 200 move random per iterasi
+# "granular" -> semua move ke k tetangga terdekat tiap customer
+NEIGHBORHOODS = ("sampled", "granular")
+
+
+class TabuMemory:
+    """
+    Memori tabu berbasis atribut (customer, kendaraan) -> iterasi kadaluarsa.
+    Setelah customer c keluar dari kendaraan v, memasukkan c kembali ke v
+    tabu selama tenure iterasi. Cek dan update O(1) per atribut.
+
+    tenure_jitter > 0: tenure tiap atribut diacak di [tenure - jitter, tenure + jitter].
+    dynamic=True: tenure naik 1 setiap iterasi tanpa perbaikan best
+    (maksimal 2x tenure), kembali ke tenure awal saat best membaik.
+    """
+
+    def __init__(self, tenure=10, tenure_jitter=0, dynamic=False):
+        self.base_tenure = max(1, int(tenure))
+        self.tenure = self.base_tenure
+        self.jitter = max(0, int(tenure_jitter))
+        self.dynamic = dynamic
+        self.expiry = {}
+
+    def is_tabu(self, attributes, iteration):
+        expiry = self.expiry
+        for attr in attributes:
+            if expiry.get(attr, -1) > iteration:
+                return True
+        return False
+
+    def add(self, attributes, iteration):
+        for attr in attributes:
+            tenure = self.tenure
+            if self.jitter:
+                tenure = max(1, tenure + random.randint(-self.jitter, self.jitter))
+            self.expiry[attr] = iteration + tenure
+
+    def improved(self):
+        self.tenure = self.base_tenure
+
+    def stalled(self):
+        if self.dynamic:
+            self.tenure = min(self.tenure + 1, 2 * self.base_tenure)
+
+
+def solve_tabu_search(dist_car, dist_bike, demands, vehicles, max_iter=500, tabu_tenure=10,
+                      neighborhood="sampled", granular_k=10, tenure_jitter=0, dynamic_tenure=False,
+                      initial="default", progress=None, stats=None, stop=None,
+                      initial_routes=None):
     """
     Tabu Search Logic for Single-Trip Heterogeneous VRP.
     Setiap kendaraan hanya melakukan 1 trip (Depot -> Cust... -> Depot).
+    initial: "default" (insertion greedy acak) atau "savings" (Clarke-Wright).
+    initial_routes: solusi awal per kendaraan (warm start), menggantikan `initial`.
+    progress: callback opsional, dipanggil dengan setiap titik history baru.
+    stats: SearchStats opsional, counter move dinilai / diterima.
+    stop: StopCriteria opsional (deadline / stagnation), selain max_iter.
     """
+    if neighborhood not in NEIGHBORHOODS:
+        raise ValueError(f"Unknown neighborhood '{neighborhood}'")
+    if initial not in INITIAL_SOLUTIONS:
+        raise ValueError(f"Unknown initial solution '{initial}'")
+    if stats is None:
+        stats = SearchStats()
+    if stop is None:
+        stop = StopCriteria()
     
     # --- 1. SETUP DATA ---
-    n_location = len(dist_car)
-    customers = list(range(1, n_location))
-    
-    # Flatten vehicles list (memecah count > 1 menjadi instance individu)
-    vehicle_instances = []
-    for v in vehicles:
-        for _ in range(v["count"]):
-            vehicle_instances.append({
-                "type": v["type"],
-                "capacity": v["capacity"],
-                # Pilih matriks jarak sesuai tipe kendaraan
-                "matrix": dist_bike if v["type"].lower() in ["motor", "bike"] else dist_car
-            })
-    
-    total_vehicles = len(vehicle_instances)
+    # fleet di-flatten, matriks per kendaraan, cost & operator move dari core
+    problem = Problem.from_vehicles(dist_car, dist_bike, demands, vehicles)
+    customers = problem.customers
+    total_vehicles = problem.total_vehicles
     if total_vehicles == 0:
-        return [], 0, [], vehicle_instances
-
-    # --- 2. COST FUNCTIONS ---
-    def calculate_route_cost(route, matrix):
-        if not route: return 0
-        # Depot -> Cust 1
-        cost = matrix[0][route[0]] 
-        # Cust i -> Cust i+1
-        for i in range(len(route) - 1):
-            cost += matrix[route[i]][route[i+1]]
-        # Cust Last -> Depot
-        cost += matrix[route[-1]][0] 
-        return cost
-
-    def calculate_total_cost(solution):
-        total_dist = 0
-        penalty = 0
-        
-        for v_idx, route in enumerate(solution):
-            if not route: continue
-            
-            matrix = vehicle_instances[v_idx]["matrix"]
-            capacity = vehicle_instances[v_idx]["capacity"]
-            
-            # Hitung jarak
-            total_dist += calculate_route_cost(route, matrix)
-            
-            # Hitung penalty kapasitas
-            load = sum(demands[c] for c in route)
-            if load > capacity:
-                # Penalty multiplier besar agar solusi infeasible dihindari
-                penalty += (load - capacity) * 10000 
-                
-        return total_dist + penalty
+        return [], 0, [], problem.vehicles
 
-    # --- 3. INITIAL SOLUTION (Greedy) ---
+    # --- 2. INITIAL SOLUTION (Greedy) ---
     def generate_initial_solution():
         sol = [[] for _ in range(total_vehicles)]
         unassigned = customers[:]
@@ -71,14 +94,14 @@ def solve_tabu_search(dist_car, dist_bike, demands, vehicles, max_iter=500, tabu
             # Coba masukkan ke setiap kendaraan yang muat
             for v_idx in range(total_vehicles):
                 current_load = sum(demands[c] for c in sol[v_idx])
-                if current_load + demands[cust] <= vehicle_instances[v_idx]["capacity"]:
+                if current_load + demands[cust] <= problem.capacities[v_idx]:
                     # Simple check: cost jika ditaruh di akhir
-                    matrix = vehicle_instances[v_idx]["matrix"]
+                    matrix = problem.route_matrix[v_idx]
                     if not sol[v_idx]:
-                        cost_increase = matrix[0][cust]
+                        cost_increase = matrix[0, cust]
                     else:
                         last = sol[v_idx][-1]
-                        cost_increase = matrix[last][cust]
+                        cost_increase = matrix[last, cust]
                     
                     if cost_increase < best_insertion_cost:
                         best_insertion_cost = cost_increase
@@ -92,87 +115,134 @@ def solve_tabu_search(dist_car, dist_bike, demands, vehicles, max_iter=500, tabu
                 sol[v_random].append(cust)
         return sol
 
-    # --- 4. MAIN TABU LOOP ---
-    current_solution = generate_initial_solution()
+    # --- 3. MAIN TABU LOOP ---
+    # Move dinilai dari edge yang berubah saja (O(1)) + perubahan penalty dari
+    # load per rute yang di-cache; solusi hanya diubah untuk move yang diterima.
+    if initial_routes is not None:
+        current_solution = [list(r) for r in initial_routes]
+    elif initial == "savings":
+        current_solution = savings_solution(problem)
+    else:
+        current_solution = generate_initial_solution()
+    loads = problem.route_loads(current_solution)
+    current_cost = problem.total_cost(current_solution)
     best_solution = [r[:] for r in current_solution]
-    best_cost = calculate_total_cost(best_solution)
+    best_cost = current_cost
     
-    tabu_list = [] 
+    tabu = TabuMemory(tabu_tenure, tenure_jitter, dynamic_tenure)
     history = [{"iteration": 0, "cost": best_cost}]
 
+    granular = None
+    if neighborhood == "granular" and problem.n > 2:
+        granular = GranularNeighborhood(problem, granular_k)
+
     for it in range(max_iter):
-        neighbors = []
-        
+        best_move = None
+        best_move_cost = float('inf')
+        improved = False
+        evaluated = 0
+
+        if granular is not None:
+            # Scan seluruh candidate list, ambil move terbaik yang admissible
+            state, deltas, moves = granular.evaluate(current_solution)
+            evaluated += len(deltas)
+            for i in np.argsort(deltas, kind="stable"):
+                cost = current_cost + float(deltas[i])
+                placed, removed = granular_attributes(state, moves[:, i])
+                if not tabu.is_tabu(placed, it) or (cost < best_cost):
+                    best_move = (('granular', state, moves[:, i]), removed, cost)
+                    break
+
         # Sampling neighbors (Batasi jumlah sample untuk performa)
         # Kita gunakan 2 jenis move: RELOCATE dan SWAP
-        for _ in range(200): 
-            candidate = [r[:] for r in current_solution]
+        for _ in range(200 if granular is None else 0): 
             move_type = random.choice(['relocate', 'swap'])
-            move_signature = None
             
             if move_type == 'relocate':
                 # Pindahkan customer dari v_src ke v_dst
                 v_src = random.randint(0, total_vehicles - 1)
-                if not candidate[v_src]: continue
+                if not current_solution[v_src]: continue
                 
-                c_idx = random.randint(0, len(candidate[v_src]) - 1)
-                cust = candidate[v_src].pop(c_idx)
+                c_idx = random.randint(0, len(current_solution[v_src]) - 1)
+                cust = current_solution[v_src][c_idx]
                 
                 v_dst = random.randint(0, total_vehicles - 1)
-                # Insert di posisi random
-                if not candidate[v_dst]:
-                    candidate[v_dst].append(cust)
-                else:
-                    pos = random.randint(0, len(candidate[v_dst]))
-                    candidate[v_dst].insert(pos, cust)
+                # Insert di posisi random (panjang rute tujuan setelah customer diambil)
+                dst_len = len(current_solution[v_dst]) - (1 if v_dst == v_src else 0)
+                pos = random.randint(0, dst_len) if dst_len > 0 else 0
                 
-                move_signature = ('relocate', cust, v_src, v_dst)
+                delta = (problem.relocate_delta(current_solution, v_src, c_idx, v_dst, pos)
+                         + problem.transfer_penalty(loads, v_src, v_dst, demands[cust]))
+                move = (move_type, v_src, c_idx, v_dst, pos)
+                placed = ((cust, v_dst),)
+                removed = ((cust, v_src),)
 
-            elif move_type == 'swap':
+            else:
                 # Tukar customer antar rute atau dalam rute sama
                 v1 = random.randint(0, total_vehicles - 1)
                 v2 = random.randint(0, total_vehicles - 1)
                 
-                if not candidate[v1] or not candidate[v2]: continue
+                if not current_solution[v1] or not current_solution[v2]: continue
                 
-                idx1 = random.randint(0, len(candidate[v1])-1)
-                idx2 = random.randint(0, len(candidate[v2])-1)
+                idx1 = random.randint(0, len(current_solution[v1])-1)
+                idx2 = random.randint(0, len(current_solution[v2])-1)
                 
-                candidate[v1][idx1], candidate[v2][idx2] = candidate[v2][idx2], candidate[v1][idx1]
+                c1 = current_solution[v2][idx2] # Customer baru di v1
+                c2 = current_solution[v1][idx1] # Customer baru di v2
                 
-                c1 = candidate[v1][idx1] # Customer baru di v1
-                c2 = candidate[v2][idx2] # Customer baru di v2
-                move_signature = ('swap', c1, c2)
+                delta = (problem.swap_delta(current_solution, v1, idx1, v2, idx2)
+                         + problem.transfer_penalty(loads, v2, v1, demands[c1] - demands[c2]))
+                move = (move_type, v1, idx1, v2, idx2)
+                placed = ((c1, v1), (c2, v2))
+                removed = ((c2, v1), (c1, v2))
 
-            if move_signature:
-                cost = calculate_total_cost(candidate)
-                neighbors.append((cost, candidate, move_signature))
-        
-        # Urutkan neighbor berdasarkan cost terendah
-        neighbors.sort(key=lambda x: x[0])
-        
-        found_move = False
-        for cost, cand, move in neighbors:
-            is_tabu = move in tabu_list
+            evaluated += 1
+            cost = current_cost + delta
+            if cost >= best_move_cost:
+                continue
             
             # Aspiration criteria: kalau cost lebih baik dari global best, abaikan status tabu
-            if (not is_tabu) or (cost < best_cost):
-                current_solution = cand
-                found_move = True
-                
-                # Masukkan ke tabu list
-                tabu_list.append(move)
-                if len(tabu_list) > tabu_tenure:
-                    tabu_list.pop(0)
-                
-                # Update Best Global
-                if cost < best_cost:
-                    best_cost = cost
-                    best_solution = [r[:] for r in cand]
-                break
+            if not tabu.is_tabu(placed, it) or (cost < best_cost):
+                best_move = (move, removed, cost)
+                best_move_cost = cost
+        
+        if best_move is not None:
+            move, removed, cost = best_move
+            
+            # Terapkan hanya move yang diterima
+            if move[0] == 'granular':
+                apply_move(current_solution, move[1], move[2])
+                loads = problem.route_loads(current_solution)
+            else:
+                problem.apply_move(current_solution, loads, move)
+            current_cost = cost
+            stats.accepted += 1
+            
+            # Customer tidak boleh kembali ke kendaraan asalnya selama tenure
+            tabu.add(removed, it)
+            
+            # Update Best Global (cost dihitung ulang penuh supaya tidak drift)
+            if current_cost < best_cost:
+                current_cost = problem.total_cost(current_solution)
+                if current_cost < best_cost:
+                    best_cost = current_cost
+                    best_solution = [r[:] for r in current_solution]
+                    tabu.improved()
+                    improved = True
+                    stats.improved += 1
+
+        if not improved:
+            tabu.stalled()
+        stats.evaluated += evaluated
+        stats.iterations += 1
         
-        # Logging
-        if (it + 1) % 10 == 0 or it == max_iter - 1:
+        # Logging (titik terakhir juga dicatat kalau berhenti lebih awal)
+        stopping = stop.done(best_cost)
+        if (it + 1) % 10 == 0 or it == max_iter - 1 or stopping:
             history.append({"iteration": it + 1, "cost": best_cost})
+            if progress:
+                progress(history[-1])
+        if stopping:
+            break
 
-    return best_solution, best_cost, history, vehicle_instances
\ No newline at end of file
+    return best_solution, best_cost, history, problem.vehicles
@@ -0,0 +1,348 @@
+"""
+Model problem bersama untuk semua solver (tabu, SA, GA) + library operator.
+
+Problem dibangun sekali per solve: fleet yang sudah di-flatten (satu entry
+per kendaraan), matriks per profil, array demand, kapasitas, dan neighbour
+list (lazy). Operator move (relocate, swap, 2-opt, cross exchange) dinilai
+dari edge yang berubah saja (O(1) / O(panjang segmen)) tanpa mengubah rute,
+lalu diterapkan in place hanya kalau move diterima.
+
+Konvensi tipe kendaraan: "bike", "motor", "motorcycle" (case-insensitive)
+= profil BIKE, tipe lain = CAR.
+"""
+import time
+
+import numpy as np
+
+from algorithms.matrix import DistanceMatrices, CAR, BIKE, route_loads
+
+BIKE_TYPES = ("bike", "motor", "motorcycle")
+CAR_TYPES = ("car", "mobil")
+
+# Penalty per unit kelebihan muatan
+OVERLOAD_PENALTY = 10000
+# Penalty per rute yang melebihi jumlah kendaraan (GA)
+ROUTE_PENALTY = 50000
+
+
+def is_bike_type(vtype):
+    return str(vtype).lower() in BIKE_TYPES
+
+
+def vehicle_profile(vtype):
+    return BIKE if is_bike_type(vtype) else CAR
+
+
+def neighbor_lists(matrix, k):
+    """
+    k customer terdekat untuk setiap customer (granular candidate list),
+    dihitung sekali dari matriks jarak. Baris 0 (depot) tidak dipakai.
+    """
+    n = matrix.shape[0]
+    k = max(1, min(k, n - 2))
+    d = np.array(matrix[1:, 1:], dtype=np.float64)
+    np.fill_diagonal(d, np.inf)
+
+    near = np.argpartition(d, k - 1, axis=1)[:, :k]
+    order = np.argsort(np.take_along_axis(d, near, axis=1), axis=1)
+    near = np.take_along_axis(near, order, axis=1) + 1
+
+    lists = np.zeros((n, k), dtype=np.intp)
+    lists[1:] = near
+    return lists
+
+
+def node_at(route, k):
+    # depot di luar ujung rute
+    return route[k] if 0 <= k < len(route) else 0
+
+
+def segment_cost(m, seg, prev, nxt):
+    # cost prev -> seg[0] -> ... -> seg[-1] -> nxt
+    cost = m[prev, seg[0]] + m[seg[-1], nxt]
+    for a, b in zip(seg, seg[1:]):
+        cost += m[a, b]
+    return cost
+
+
+class SearchStats:
+    """
+    Counter solver untuk diagnostics: kandidat (move / chromosome) yang
+    dinilai, move yang diterima, dan berapa kali best membaik.
+    """
+
+    def __init__(self):
+        self.evaluated = 0
+        self.accepted = 0
+        self.improved = 0
+        self.iterations = 0
+        self.started = time.perf_counter()
+
+    def add(self, report):
+        # counter dari run lain (mis. island di proses worker)
+        self.evaluated += report["movesEvaluated"]
+        self.accepted += report["movesAccepted"]
+        self.improved += report["improvements"]
+        self.iterations += report["iterations"]
+
+    def report(self):
+        seconds = time.perf_counter() - self.started
+        return stats_report(self.evaluated, self.accepted, self.improved, self.iterations, seconds)
+
+
+class StopCriteria:
+    """
+    Kriteria berhenti selain jumlah iterasi. Solver memanggil done(best_cost)
+    sekali per iterasi / generasi; setelah berhenti, reason berisi:
+      "iterationLimit"  iterasi habis (default)
+      "timeBudget"      deadline wall-clock lewat (time.time(), absolut supaya
+                        bisa dikirim ke proses worker)
+      "stagnation"      `stagnation` iterasi berturut-turut tanpa perbaikan best
+    """
+
+    def __init__(self, deadline=None, stagnation=None):
+        self.deadline = deadline
+        self.stagnation = stagnation
+        self.best = float("inf")
+        self.stalled = 0
+        self.reason = "iterationLimit"
+
+    def expired(self):
+        return self.deadline is not None and time.time() >= self.deadline
+
+    def done(self, best_cost, steps=1):
+        # steps > 1: satu panggilan mewakili beberapa iterasi (epoch island)
+        if best_cost < self.best:
+            self.best = best_cost
+            self.stalled = 0
+        else:
+            self.stalled += steps
+        if self.expired():
+            self.reason = "timeBudget"
+            return True
+        if self.stagnation and self.stalled >= self.stagnation:
+            self.reason = "stagnation"
+            return True
+        return False
+
+
+def stats_report(evaluated, accepted, improved, iterations, seconds):
+    return {
+        "movesEvaluated": evaluated,
+        "movesAccepted": accepted,
+        "improvements": improved,
+        "iterations": iterations,
+        "seconds": round(seconds, 6),
+        "evaluationsPerSec": round(evaluated / seconds, 1) if seconds > 0 else None,
+    }
+
+
+def merge_stats(reports):
+    # gabungan beberapa run (restart portfolio / island): counter dijumlah,
+    # evaluationsPerSec per detik waktu solver total
+    keys = ("movesEvaluated", "movesAccepted", "improvements", "iterations", "seconds")
+    total = {k: sum(r[k] for r in reports) for k in keys}
+    return stats_report(*(total[k] for k in keys))
+
+
+class Problem:
+    """
+    Instance VRP heterogen single-trip yang sudah "dikompilasi".
+
+    vehicles     list dict {"type", "capacity"} per kendaraan (urutan fleet)
+    profiles     CAR / BIKE per kendaraan
+    route_matrix matriks jarak per kendaraan (view dari matrices)
+    offsets      offset profil di matriks flat (untuk routes_cost)
+    """
+
+    def __init__(self, dist_car, dist_bike, demands, fleet):
+        self.matrices = DistanceMatrices(dist_car, dist_bike)
+        self.dist_car = self.matrices.car
+        self.dist_bike = self.matrices.bike
+        self.n = self.matrices.n
+        self.customers = list(range(1, self.n))
+        self.demands = demands
+        self.demand_arr = np.asarray(demands, dtype=np.float64)
+
+        self.vehicles = [{"type": vtype, "capacity": capacity} for vtype, capacity in fleet]
+        self.capacities = [capacity for _, capacity in fleet]
+        self.capacity_arr = np.array(self.capacities, dtype=np.float64)
+        self.profiles = [vehicle_profile(vtype) for vtype, _ in fleet]
+        self.is_bike = [p == BIKE for p in self.profiles]
+        self.route_matrix = [self.matrices.data[p] for p in self.profiles]
+        self.offsets = self.matrices.profile_offsets(self.profiles)
+        self._neighbors = {}
+
+    @classmethod
+    def from_vehicles(cls, dist_car, dist_bike, demands, vehicles):
+        # vehicles dari request: [{"type", "count", "capacity"}], count > 1 dipecah
+        fleet = [(v["type"], v["capacity"]) for v in vehicles for _ in range(v["count"])]
+        return cls(dist_car, dist_bike, demands, fleet)
+
+    @classmethod
+    def from_counts(cls, dist_car, dist_bike, demands, car_count, bike_count,
+                    car_capacity, bike_capacity):
+        # fleet GA: semua mobil dulu, lalu motor
+        fleet = [("car", car_capacity)] * car_count + [("bike", bike_capacity)] * bike_count
+        return cls(dist_car, dist_bike, demands, fleet)
+
+    @property
+    def total_vehicles(self):
+        return len(self.vehicles)
+
+    def neighbors(self, k, profile=CAR):
+        """k tetangga terdekat per customer, dihitung sekali per (k, profil)."""
+        key = (k, profile)
+        if key not in self._neighbors:
+            self._neighbors[key] = neighbor_lists(self.matrices.data[profile], k)
+        return self._neighbors[key]
+
+    # --- cost & load ---
+
+    def route_loads(self, routes):
+        return [sum(self.demands[c] for c in r) for r in routes]
+
+    def distance(self, routes):
+        # semua rute (mobil & motor) dengan satu gather
+        return self.matrices.routes_cost(routes, self.offsets)
+
+    def overload(self, routes):
+        over = np.maximum(route_loads(self.demand_arr, routes) - self.capacity_arr, 0)
+        return float(over.sum()) * OVERLOAD_PENALTY
+
+    def total_cost(self, routes):
+        # jarak + penalty kapasitas
+        return self.distance(routes) + self.overload(routes)
+
+    def vehicles_used(self, routes):
+        bikes = sum(1 for b, r in zip(self.is_bike, routes) if r and b)
+        cars = sum(1 for b, r in zip(self.is_bike, routes) if r and not b)
+        return bikes, cars
+
+    def overload_penalty(self, load, v):
+        capacity = self.capacities[v]
+        return (load - capacity) * OVERLOAD_PENALTY if load > capacity else 0
+
+    def transfer_penalty(self, loads, v_from, v_to, amount):
+        """Perubahan penalty kapasitas kalau `amount` demand pindah dari v_from ke v_to."""
+        if v_from == v_to:
+            return 0
+        return (
+            self.overload_penalty(loads[v_from] - amount, v_from)
+            + self.overload_penalty(loads[v_to] + amount, v_to)
+            - self.overload_penalty(loads[v_from], v_from)
+            - self.overload_penalty(loads[v_to], v_to)
+        )
+
+    # --- operator library ---
+    # Move berupa tuple:
+    #   ('relocate', v_src, idx, v_dst, pos)   pos = posisi setelah customer diambil
+    #   ('swap', v1, idx1, v2, idx2)           v1 == v2 boleh
+    #   ('two_opt', v, i, j)                   reverse route[i..j]
+    #   ('cross_exchange', v1, s1, l1, v2, s2, l2)
+    # *_delta hanya menghitung perubahan jarak (penalty kapasitas: transfer_penalty).
+    # Delta selalu ditulis (edge baru) - (edge lama) supaya delta move balikannya
+    # tepat -delta (floating point); kalau tidak, VNS bisa bolak-balik di move
+    # yang netral (mis. reverse rute 2 customer) karena keduanya tampak "< 0".
+
+    def relocate_delta(self, routes, v_src, c_idx, v_dst, pos):
+        if v_src == v_dst and pos == c_idx:
+            return 0
+        src = routes[v_src]
+        cust = src[c_idx]
+        m = self.route_matrix[v_src]
+        prev, nxt = node_at(src, c_idx - 1), node_at(src, c_idx + 1)
+        removal = m[prev, nxt] - (m[prev, cust] + m[cust, nxt])
+
+        dst = routes[v_dst]
+        m = self.route_matrix[v_dst]
+        if v_dst == v_src:
+            # posisi pada rute setelah customer diambil
+            shift = lambda k: k if k < c_idx else k + 1
+            prev = node_at(dst, shift(pos - 1)) if pos > 0 else 0
+            nxt = node_at(dst, shift(pos)) if pos < len(dst) - 1 else 0
+        else:
+            prev, nxt = node_at(dst, pos - 1), node_at(dst, pos)
+        return removal + ((m[prev, cust] + m[cust, nxt]) - m[prev, nxt])
+
+    def swap_delta(self, routes, v1, idx1, v2, idx2):
+        r1, r2 = routes[v1], routes[v2]
+        if v1 != v2:
+            a, b = r1[idx1], r2[idx2]
+            return (self._replace_delta(r1, self.route_matrix[v1], idx1, a, b)
+                    + self._replace_delta(r2, self.route_matrix[v2], idx2, b, a))
+
+        if idx1 == idx2:
+            return 0
+        i, j = min(idx1, idx2), max(idx1, idx2)
+        a, b = r1[i], r1[j]
+        m = self.route_matrix[v1]
+        prev, nxt = node_at(r1, i - 1), node_at(r1, j + 1)
+        if j == i + 1:
+            return segment_cost(m, [b, a], prev, nxt) - segment_cost(m, [a, b], prev, nxt)
+        n_i, p_j = r1[i + 1], r1[j - 1]
+        return ((m[prev, b] + m[b, n_i] + m[p_j, a] + m[a, nxt])
+                - (m[prev, a] + m[a, n_i] + m[p_j, b] + m[b, nxt]))
+
+    @staticmethod
+    def _replace_delta(route, m, k, old, new):
+        prev, nxt = node_at(route, k - 1), node_at(route, k + 1)
+        return (m[prev, new] + m[new, nxt]) - (m[prev, old] + m[old, nxt])
+
+    def two_opt_delta(self, routes, v, i, j):
+        route, m = routes[v], self.route_matrix[v]
+        seg = route[i:j + 1]
+        prev, nxt = node_at(route, i - 1), node_at(route, j + 1)
+        return segment_cost(m, seg[::-1], prev, nxt) - segment_cost(m, seg, prev, nxt)
+
+    def cross_delta(self, routes, v1, s1, l1, v2, s2, l2):
+        route1, route2 = routes[v1], routes[v2]
+        m1, m2 = self.route_matrix[v1], self.route_matrix[v2]
+        seg1, seg2 = route1[s1:s1 + l1], route2[s2:s2 + l2]
+        p1, n1 = node_at(route1, s1 - 1), node_at(route1, s1 + l1)
+        p2, n2 = node_at(route2, s2 - 1), node_at(route2, s2 + l2)
+        return ((segment_cost(m1, seg2, p1, n1) - segment_cost(m1, seg1, p1, n1))
+                + (segment_cost(m2, seg1, p2, n2) - segment_cost(m2, seg2, p2, n2)))
+
+    def move_delta(self, routes, move):
+        """Perubahan jarak kalau move diterapkan (routes tidak diubah)."""
+        if move is None:
+            return 0
+        op = move[0]
+        if op == 'relocate':
+            return self.relocate_delta(routes, *move[1:])
+        if op == 'swap':
+            return self.swap_delta(routes, *move[1:])
+        if op == 'two_opt':
+            return self.two_opt_delta(routes, *move[1:])
+        return self.cross_delta(routes, *move[1:])
+
+    def apply_move(self, routes, loads, move):
+        """Terapkan move in place, load per rute ikut diupdate."""
+        op = move[0]
+        demands = self.demands
+        if op == 'relocate':
+            _, v_src, c_idx, v_dst, pos = move
+            cust = routes[v_src].pop(c_idx)
+            routes[v_dst].insert(pos, cust)
+            loads[v_src] -= demands[cust]
+            loads[v_dst] += demands[cust]
+        elif op == 'swap':
+            _, v1, idx1, v2, idx2 = move
+            a, b = routes[v1][idx1], routes[v2][idx2]
+            routes[v1][idx1], routes[v2][idx2] = b, a
+            loads[v1] += demands[b] - demands[a]
+            loads[v2] += demands[a] - demands[b]
+        elif op == 'two_opt':
+            _, v, i, j = move
+            routes[v][i:j + 1] = routes[v][i:j + 1][::-1]
+        else:
+            _, v1, s1, l1, v2, s2, l2 = move
+            route1, route2 = routes[v1], routes[v2]
+            seg1, seg2 = route1[s1:s1 + l1], route2[s2:s2 + l2]
+            route1[s1:s1 + l1] = seg2
+            route2[s2:s2 + l2] = seg1
+            diff = sum(demands[c] for c in seg2) - sum(demands[c] for c in seg1)
+            loads[v1] += diff
+            loads[v2] -= diff
+
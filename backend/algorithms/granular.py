@@ -0,0 +1,294 @@
+import numpy as np
+
+from algorithms.matrix import CAR, BIKE
+from algorithms.core import OVERLOAD_PENALTY
+
+OR_OPT_LENGTHS = (2, 3)
+
+
+class RouteState:
+    """
+    Representasi array dari solusi (rute per kendaraan) untuk evaluasi move
+    secara vektor: posisi/tetangga tiap node, prefix cost per profil dan
+    prefix load. Dibangun ulang setiap kali solusi berubah (O(n)).
+    """
+
+    def __init__(self, matrices, solution, profiles, demands):
+        n = matrices.n
+        data = matrices.data
+        self.route_of = np.full(n, -1, dtype=np.intp)
+        self.pos_of = np.zeros(n, dtype=np.intp)
+        self.prev_of = np.zeros(n, dtype=np.intp)
+        self.next_of = np.zeros(n, dtype=np.intp)
+        # pre[p, x]: cost depot -> ... -> x, tail[p, x]: cost x -> ... -> depot,
+        # keduanya di sepanjang rute x sendiri tapi memakai matriks profil p
+        self.pre = np.zeros((2, n))
+        self.tail = np.zeros((2, n))
+        self.pre_load = np.zeros(n)
+        self.tail_load = np.zeros(n)
+        self.full = np.zeros((2, len(solution)))
+        self.loads = np.zeros(len(solution))
+
+        for v, route in enumerate(solution):
+            if not route:
+                continue
+            r = np.asarray(route, dtype=np.intp)
+            path = np.concatenate(([0], r, [0]))
+            self.route_of[r] = v
+            self.pos_of[r] = np.arange(len(r))
+            self.prev_of[r] = path[:-2]
+            self.next_of[r] = path[2:]
+
+            for p in range(2):
+                cum = np.cumsum(data[p][path[:-1], path[1:]])
+                self.pre[p, r] = cum[:-1]
+                self.tail[p, r] = cum[-1] - cum[:-1]
+                self.full[p, v] = cum[-1]
+
+            load = np.cumsum(demands[r])
+            self.pre_load[r] = load
+            self.tail_load[r] = load[-1] - load + demands[r]
+            self.loads[v] = load[-1]
+
+
+class GranularNeighborhood:
+    """
+    Evaluasi semua move relocate, swap, 2-opt* dan or-opt yang menghubungkan
+    customer dengan salah satu k tetangga terdekatnya. Semua delta dihitung
+    sekaligus dengan numpy; hasilnya array delta + deskripsi move.
+    """
+
+    def __init__(self, problem, k=10):
+        matrices = problem.matrices
+        self.matrices = matrices
+        self.n = matrices.n
+        self.flat = matrices.data.reshape(-1)
+        self.profiles = np.asarray(problem.profiles, dtype=np.intp)
+        self.capacities = problem.capacity_arr
+        self.demands = problem.demand_arr
+
+        # neighbor list per profil: matriks OSRM mobil / motor bisa berbeda
+        # (profil lain, jalan satu arah), jadi kandidat = k tetangga mobil
+        # ditambah tetangga motor yang belum ada di list mobil
+        self.lists = problem.neighbors(k, CAR)
+        self.k = self.lists.shape[1]
+        customers = np.arange(1, self.n, dtype=np.intp)
+        self.U = np.repeat(customers, self.k)
+        self.V = self.lists[1:].ravel()
+        if BIKE in problem.profiles:
+            bike = problem.neighbors(k, BIKE)[1:]
+            extra = ~(bike[:, :, None] == self.lists[1:, None, :]).any(axis=2)
+            self.U = np.concatenate((self.U, np.repeat(customers, bike.shape[1])[extra.ravel()]))
+            self.V = np.concatenate((self.V, bike[extra]))
+        self.customers = customers
+
+    def _d(self, p, a, b):
+        return self.flat[(p * self.n + a) * self.n + b]
+
+    def _penalty(self, load, v):
+        return np.maximum(load - self.capacities[v], 0) * OVERLOAD_PENALTY
+
+    def _load_delta(self, s, rA, rB, loadA, loadB):
+        # perubahan penalty kalau load rute rA, rB menjadi loadA, loadB
+        return (self._penalty(loadA, rA) + self._penalty(loadB, rB)
+                - self._penalty(s.loads[rA], rA) - self._penalty(s.loads[rB], rB))
+
+    def evaluate(self, solution):
+        """
+        Return (state, deltas, moves) dengan moves berupa list array kolom
+        (kode move, u, v, arg) sejajar dengan deltas.
+        """
+        s = RouteState(self.matrices, solution, self.profiles, self.demands)
+        parts = [
+            self._relocate(s),
+            self._relocate_empty(s, solution),
+            self._swap(s),
+            self._two_opt_star(s),
+        ]
+        for length in OR_OPT_LENGTHS:
+            parts.append(self._or_opt(s, length))
+
+        parts = [p for p in parts if len(p[0])]
+        if not parts:
+            return s, np.empty(0), np.empty((4, 0), dtype=np.intp)
+        deltas = np.concatenate([p[0] for p in parts])
+        moves = np.concatenate([p[1] for p in parts], axis=1)
+        return s, deltas, moves
+
+    def _pack(self, code, delta, mask, U, V, arg):
+        arg = np.broadcast_to(arg, U.shape)
+        return delta[mask], np.vstack((
+            np.full(int(mask.sum()), code, dtype=np.intp), U[mask], V[mask], arg[mask]
+        ))
+
+    def _removal(self, s, U):
+        rA = s.route_of[U]
+        pA = self.profiles[rA]
+        pu, nu = s.prev_of[U], s.next_of[U]
+        return rA, pA, pu, nu, self._d(pA, pu, nu) - self._d(pA, pu, U) - self._d(pA, U, nu)
+
+    def _relocate(self, s):
+        # u dipindah ke setelah (arg=0) atau sebelum (arg=1) tetangga v
+        U, V = self.U, self.V
+        rA, pA, pu, nu, removal = self._removal(s, U)
+        rB = s.route_of[V]
+        pB = self.profiles[rB]
+        dem = self.demands[U]
+        load = np.where(rA != rB, self._load_delta(s, rA, rB, s.loads[rA] - dem, s.loads[rB] + dem), 0)
+
+        vn = s.next_of[V]
+        after = removal + self._d(pB, V, U) + self._d(pB, U, vn) - self._d(pB, V, vn) + load
+        vp = s.prev_of[V]
+        before = removal + self._d(pB, vp, U) + self._d(pB, U, V) - self._d(pB, vp, V) + load
+
+        d1, m1 = self._pack(0, after, vn != U, U, V, 0)
+        d2, m2 = self._pack(0, before, vp != U, U, V, 1)
+        return np.concatenate((d1, d2)), np.concatenate((m1, m2), axis=1)
+
+    def _relocate_empty(self, s, solution):
+        # kendaraan kosong tidak punya tetangga; coba pindahkan semua customer
+        empty = [v for v, r in enumerate(solution) if not r]
+        # cukup satu kendaraan kosong untuk setiap (profil, kapasitas)
+        seen, targets = set(), []
+        for v in empty:
+            key = (self.profiles[v], self.capacities[v])
+            if key not in seen:
+                seen.add(key)
+                targets.append(v)
+        if not targets:
+            return np.empty(0), np.empty((4, 0), dtype=np.intp)
+
+        U = np.tile(self.customers, len(targets))
+        E = np.repeat(np.asarray(targets, dtype=np.intp), len(self.customers))
+        rA, pA, pu, nu, removal = self._removal(s, U)
+        pE = self.profiles[E]
+        dem = self.demands[U]
+        delta = (removal + self._d(pE, 0, U) + self._d(pE, U, 0)
+                 + self._load_delta(s, rA, E, s.loads[rA] - dem, dem))
+        return self._pack(1, delta, np.ones(len(U), dtype=bool), U, np.zeros_like(U), E)
+
+    def _swap(self, s):
+        U, V = self.U, self.V
+        rA, rB = s.route_of[U], s.route_of[V]
+        pA, pB = self.profiles[rA], self.profiles[rB]
+        pu, nu = s.prev_of[U], s.next_of[U]
+        pv, nv = s.prev_of[V], s.next_of[V]
+        d = self._d
+
+        delta = (d(pA, pu, V) + d(pA, V, nu) - d(pA, pu, U) - d(pA, U, nu)
+                 + d(pB, pv, U) + d(pB, U, nv) - d(pB, pv, V) - d(pB, V, nv))
+        # customer bersebelahan di rute yang sama
+        u_first = nu == V
+        v_first = nv == U
+        delta = np.where(u_first, d(pA, pu, V) + d(pA, V, U) + d(pA, U, nv)
+                         - d(pA, pu, U) - d(pA, U, V) - d(pA, V, nv), delta)
+        delta = np.where(v_first, d(pA, pv, U) + d(pA, U, V) + d(pA, V, nu)
+                         - d(pA, pv, V) - d(pA, V, U) - d(pA, U, nu), delta)
+
+        diff = self.demands[V] - self.demands[U]
+        delta = delta + np.where(rA != rB, self._load_delta(s, rA, rB, s.loads[rA] + diff, s.loads[rB] - diff), 0)
+        return self._pack(2, delta, np.ones(len(U), dtype=bool), U, V, 0)
+
+    def _two_opt_star(self, s):
+        # A' = A[..u] + B[v..], B' = B[..prev(v)] + A[next(u)..]
+        U, V = self.U, self.V
+        rA, rB = s.route_of[U], s.route_of[V]
+        pA, pB = self.profiles[rA], self.profiles[rB]
+        nu, pv = s.next_of[U], s.prev_of[V]
+
+        new_a = s.pre[pA, U] + self._d(pA, U, V) + s.tail[pA, V]
+        new_b = (np.where(pv != 0, s.pre[pB, pv], 0) + self._d(pB, pv, nu)
+                 + np.where(nu != 0, s.tail[pB, nu], 0))
+        # B' kosong kalau u terakhir di A dan v pertama di B
+        new_b = np.where((pv == 0) & (nu == 0), 0, new_b)
+        delta = new_a + new_b - s.full[pA, rA] - s.full[pB, rB]
+
+        load_a = s.pre_load[U] + s.tail_load[V]
+        load_b = np.where(pv != 0, s.pre_load[pv], 0) + np.where(nu != 0, s.tail_load[nu], 0)
+        delta = delta + self._load_delta(s, rA, rB, load_a, load_b)
+        return self._pack(3, delta, rA != rB, U, V, 0)
+
+    def _or_opt(self, s, length):
+        # segmen [u .. u+length-1] dipindah ke setelah v (urutan tetap)
+        U, V = self.U, self.V
+        last = U.copy()
+        valid = np.ones(len(U), dtype=bool)
+        for _ in range(length - 1):
+            last = s.next_of[last]
+            valid &= last != 0
+
+        rA, rB = s.route_of[U], s.route_of[V]
+        pA, pB = self.profiles[rA], self.profiles[rB]
+        pu, after = s.prev_of[U], s.next_of[last]
+        vn = s.next_of[V]
+        same = rA == rB
+        inside = same & (s.pos_of[V] >= s.pos_of[U]) & (s.pos_of[V] < s.pos_of[U] + length)
+        valid &= ~inside & (V != pu)
+
+        seg_a = s.pre[pA, last] - s.pre[pA, U]
+        seg_b = s.pre[pB, last] - s.pre[pB, U]
+        d = self._d
+        delta = (d(pA, pu, after) - d(pA, pu, U) - d(pA, last, after) - seg_a
+                 + d(pB, V, U) + d(pB, last, vn) - d(pB, V, vn) + seg_b)
+
+        seg_load = s.pre_load[last] - s.pre_load[U] + self.demands[U]
+        delta = delta + np.where(~same, self._load_delta(s, rA, rB, s.loads[rA] - seg_load, s.loads[rB] + seg_load), 0)
+        return self._pack(4, delta, valid, U, V, length)
+
+
+def apply_move(solution, state, move):
+    """Terapkan satu move (kode, u, v, arg) dari GranularNeighborhood ke solution."""
+    code, u, v, arg = (int(x) for x in move)
+    rA = int(state.route_of[u])
+    A = solution[rA]
+    iu = A.index(u)
+
+    if code == 0:
+        # relocate
+        rB = int(state.route_of[v])
+        A.pop(iu)
+        B = solution[rB]
+        iv = B.index(v)
+        B.insert(iv + 1 if arg == 0 else iv, u)
+    elif code == 1:
+        # relocate ke kendaraan kosong
+        A.pop(iu)
+        solution[arg].append(u)
+    elif code == 2:
+        rB = int(state.route_of[v])
+        B = solution[rB]
+        iv = B.index(v)
+        A[iu], B[iv] = v, u
+    elif code == 3:
+        rB = int(state.route_of[v])
+        B = solution[rB]
+        iv = B.index(v)
+        solution[rA], solution[rB] = A[:iu + 1] + B[iv:], B[:iv] + A[iu + 1:]
+    else:
+        rB = int(state.route_of[v])
+        segment = A[iu:iu + arg]
+        del A[iu:iu + arg]
+        B = solution[rB]
+        iv = B.index(v)
+        B[iv + 1:iv + 1] = segment
+
+
+def move_attributes(state, move):
+    """
+    Atribut tabu (customer, kendaraan) untuk move granular:
+    (placed, removed) = customer yang masuk ke kendaraan, dan asalnya.
+    Untuk 2-opt* dipakai customer pertama dari tiap ekor yang ditukar.
+    """
+    code, u, v, arg = (int(x) for x in move)
+    rA = int(state.route_of[u])
+    rB = arg if code == 1 else int(state.route_of[v])
+    if code == 2:
+        return ((v, rA), (u, rB)), ((u, rA), (v, rB))
+    if code == 3:
+        nu = int(state.next_of[u])
+        placed, removed = [(v, rA)], [(v, rB)]
+        if nu:
+            placed.append((nu, rB))
+            removed.append((nu, rA))
+        return tuple(placed), tuple(removed)
+    return ((u, rB),), ((u, rA),)
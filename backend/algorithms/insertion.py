@@ -0,0 +1,67 @@
+"""
+Cheapest insertion: customer disisipkan ke (kendaraan, posisi) dengan tambahan
+jarak terkecil yang masih muat kapasitas. Biaya semua posisi satu rute
+dihitung sekaligus (numpy), jadi satu insertion O(jumlah stop).
+Dipakai warm start (stop baru ke plan lama) dan insertion real-time order
+baru ke rute yang sedang berjalan (start = posisi kendaraan, bukan depot).
+"""
+import numpy as np
+
+
+def insertion_costs(m, route, customer, start=0):
+    # tambahan jarak untuk setiap posisi 0..len(route), rute mulai dari
+    # `start` (default depot) dan kembali ke depot
+    path = np.array([start] + list(route) + [0], dtype=np.intp)
+    prev, nxt = path[:-1], path[1:]
+    return m[prev, customer] + m[customer, nxt] - m[prev, nxt]
+
+
+def best_insertion(problem, routes, loads, customer):
+    """
+    Return (delta, v, pos) termurah. Kendaraan yang jadi kelebihan muatan
+    hanya dipilih kalau tidak ada yang muat (delta termasuk penalty kapasitas).
+    """
+    demand = problem.demands[customer]
+    best = None
+    overloaded = None
+    for v, route in enumerate(routes):
+        costs = insertion_costs(problem.route_matrix[v], route, customer)
+        pos = int(np.argmin(costs))
+        delta = float(costs[pos])
+        if loads[v] + demand <= problem.capacities[v]:
+            if best is None or delta < best[0]:
+                best = (delta, v, pos)
+            continue
+        delta += problem.overload_penalty(loads[v] + demand, v) - problem.overload_penalty(loads[v], v)
+        if overloaded is None or delta < overloaded[0]:
+            overloaded = (delta, v, pos)
+    return best if best is not None else overloaded
+
+
+def vehicle_insertions(problem, routes, loads, customer, starts):
+    """
+    Insertion termurah per kendaraan yang masih muat: list (delta, v, pos).
+    starts: node awal per kendaraan (posisi kendaraan saat ini).
+    """
+    demand = problem.demands[customer]
+    options = []
+    for v, route in enumerate(routes):
+        if loads[v] + demand > problem.capacities[v]:
+            continue
+        costs = insertion_costs(problem.route_matrix[v], route, customer, starts[v])
+        pos = int(np.argmin(costs))
+        options.append((float(costs[pos]), v, pos))
+    return options
+
+
+def insert_customers(problem, routes, customers):
+    """
+    Sisipkan customers satu per satu ke routes (per kendaraan, in place),
+    demand terbesar dulu karena paling sulit mendapat tempat.
+    """
+    loads = problem.route_loads(routes)
+    for customer in sorted(customers, key=lambda c: -problem.demands[c]):
+        _, v, pos = best_insertion(problem, routes, loads, customer)
+        routes[v].insert(pos, customer)
+        loads[v] += problem.demands[customer]
+    return routes
@@ -0,0 +1,175 @@
+from multiprocessing import shared_memory
+import gc
+
+import numpy as np
+
+# Index profil di DistanceMatrices
+CAR = 0
+BIKE = 1
+
+
+def as_matrix(dist, dtype=None):
+    """
+    Matriks jarak contiguous (numpy) dari nested list / array.
+    Array float yang sudah ada dipakai apa adanya (float32 tetap float32).
+    """
+    if dtype is None and isinstance(dist, np.ndarray) and dist.dtype.kind == "f":
+        return np.ascontiguousarray(dist)
+    return np.ascontiguousarray(dist, dtype=dtype or np.float64)
+
+
+def stack_profiles(dist_car, dist_bike, dtype=None):
+    """
+    Satu blok contiguous (2, n, n): [CAR] mobil, [BIKE] motor.
+    Kalau input sudah berupa view dari blok seperti ini, blok itu dipakai
+    langsung tanpa copy.
+    """
+    car = as_matrix(dist_car, dtype)
+    bike = as_matrix(dist_bike, car.dtype)
+    base = car.base
+    if (
+        base is not None and base is bike.base and base.shape == (2,) + car.shape
+        and base.flags.c_contiguous and base.dtype == car.dtype
+        and car.ctypes.data == base.ctypes.data
+        and bike.ctypes.data == base.ctypes.data + car.nbytes
+    ):
+        return base
+    return np.stack([car, bike])
+
+
+class SharedMatrix:
+    """
+    Blok matriks (2, n, n) di shared memory, dibuat di proses utama.
+    Proses worker cukup menerima `spec` lalu attach_shared(spec), jadi
+    matriks tidak di-pickle per task.
+    """
+
+    def __init__(self, dist_car, dist_bike):
+        block = stack_profiles(dist_car, dist_bike)
+        self.shm = shared_memory.SharedMemory(create=True, size=max(block.nbytes, 1))
+        self.spec = (self.shm.name, block.shape, block.dtype.str)
+        np.ndarray(block.shape, dtype=block.dtype, buffer=self.shm.buf)[:] = block
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.shm.close()
+        self.shm.unlink()
+
+
+def attach_shared(spec):
+    """Attach ke SharedMatrix dari proses lain -> (shm, block)."""
+    name, shape, dtype = spec
+    shm = shared_memory.SharedMemory(name=name)
+    return shm, np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+
+
+def detach_shared(shm):
+    # closure solver bisa masih memegang view ke buffer sampai gc jalan
+    gc.collect()
+    try:
+        shm.close()
+    except BufferError:
+        pass
+
+
+class DistanceMatrices:
+    """
+    Matriks jarak per profil kendaraan dalam satu array contiguous,
+    dipakai bersama oleh semua solver. Cost rute dihitung dengan satu
+    gather vektor, bukan loop Python per edge.
+    """
+
+    def __init__(self, dist_car, dist_bike, dtype=None):
+        self.data = stack_profiles(dist_car, dist_bike, dtype)
+        self.car = self.data[CAR]
+        self.bike = self.data[BIKE]
+        self.n = self.car.shape[0]
+        self._flat = self.data.reshape(-1)
+
+    @property
+    def nbytes(self):
+        return self.data.nbytes
+
+    def profile_offsets(self, profiles):
+        # offset awal tiap profil di array flat
+        return np.asarray(profiles, dtype=np.intp) * (self.n * self.n)
+
+    def routes_cost(self, routes, offsets, depot=0):
+        """
+        Total cost rute-rute (tanpa depot di ujung, depot marker di tengah
+        boleh). offsets dari profile_offsets(), satu per rute.
+        """
+        idx = [depot]
+        for route in routes:
+            if route:
+                idx += route
+                idx.append(depot)
+        if len(idx) < 2:
+            return 0.0
+
+        a = np.array(idx, dtype=np.intp)
+        lengths = np.fromiter(map(len, routes), dtype=np.intp, count=len(routes))
+        # rute dengan k customer punya k + 1 edge, rute kosong tidak punya edge
+        edge_offsets = np.repeat(offsets, lengths + (lengths > 0))
+        return float(self._flat[edge_offsets + a[:-1] * self.n + a[1:]].sum())
+
+    def route_costs(self, routes, offsets, depot=0):
+        """Seperti routes_cost, tapi return cost per rute (satu gather juga)."""
+        lengths = np.fromiter(map(len, routes), dtype=np.intp, count=len(routes))
+        edges = lengths + (lengths > 0)
+        if not edges.any():
+            return np.zeros(len(routes))
+
+        idx = [depot]
+        for route in routes:
+            if route:
+                idx += route
+                idx.append(depot)
+        a = np.array(idx, dtype=np.intp)
+        values = self._flat[np.repeat(offsets, edges) + a[:-1] * self.n + a[1:]]
+        owner = np.repeat(np.arange(len(routes)), edges)
+        return np.bincount(owner, weights=values, minlength=len(routes))
+
+
+def tour_indices(routes, depot=0):
+    # gabungkan rute jadi satu tour: depot r1 depot r2 depot ...
+    idx = [depot]
+    for route in routes:
+        if route:
+            idx.extend(route)
+            idx.append(depot)
+    return np.array(idx, dtype=np.intp)
+
+
+def routes_cost(D, routes, depot=0):
+    """Total cost beberapa rute (tanpa depot) pada satu matriks D dengan satu gather."""
+    idx = tour_indices(routes, depot)
+    if len(idx) < 2:
+        return 0.0
+    return float(D[idx[:-1], idx[1:]].sum())
+
+
+def route_cost(D, route, depot=0):
+    """Cost satu rute depot -> route -> depot."""
+    return routes_cost(D, [route], depot)
+
+
+def path_cost(D, path):
+    """Cost path yang sudah lengkap (mis. [0, a, b, 0])."""
+    if len(path) < 2:
+        return 0.0
+    r = np.asarray(path, dtype=np.intp)
+    return float(D[r[:-1], r[1:]].sum())
+
+
+def route_loads(demands, routes):
+    """Total demand setiap rute; demands berupa numpy array."""
+    lengths = np.fromiter(map(len, routes), dtype=np.intp, count=len(routes))
+    total = int(lengths.sum())
+    if total == 0:
+        return np.zeros(len(routes))
+    nodes = np.fromiter((c for r in routes for c in r), dtype=np.intp, count=total)
+    owner = np.repeat(np.arange(len(routes)), lengths)
+    return np.bincount(owner, weights=demands[nodes], minlength=len(routes))
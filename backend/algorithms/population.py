@@ -0,0 +1,420 @@
+"""
+Populasi GA berbasis array untuk VRPSolver (encoding="array").
+
+Satu populasi = dua array (P, m), m = jumlah customer:
+  tours   giant tour customer per chrom
+  starts  True di posisi customer pertama setiap rute (pengganti separator -1)
+Evaluasi seluruh populasi dilakukan dengan satu gather ke blok matriks
+(2, n, n); crossover, split separator, dan mutasi dijalankan per posisi
+tapi tervektorisasi untuk semua anak sekaligus.
+
+decode="split": separator diabaikan, chrom = permutasi customer saja, dan
+rute diambil dari split optimal (Prins) - DP atas (posisi, mobil terpakai,
+motor terpakai) dengan kapasitas dan jumlah armada sebagai batas keras.
+"""
+import numpy as np
+
+from algorithms.matrix import CAR, BIKE
+from algorithms.core import OVERLOAD_PENALTY as CAPACITY_PENALTY, ROUTE_PENALTY
+
+# greedy: separator dari chrom (decode_chrom), split: split optimal
+DECODERS = ("greedy", "split")
+
+# Batas memori tabel DP split (byte); populasi diproses per blok baris
+SPLIT_DP_BYTES = 64 * 2 ** 20
+
+
+def max_trip_length(demands, capacity):
+    # customer terbanyak yang muat dalam satu trip (demand terkecil dulu)
+    smallest = np.sort(np.asarray(demands[1:], dtype=np.float64))
+    return max(1, int(np.searchsorted(np.cumsum(smallest), capacity, side="right")))
+
+
+def encode(chroms, m):
+    # list chrom (-1 separator) -> (tours, starts)
+    tours = np.empty((len(chroms), m), dtype=np.intp)
+    starts = np.zeros((len(chroms), m), dtype=bool)
+    for p, chrom in enumerate(chroms):
+        pos = 0
+        new_route = True
+        for gene in chrom:
+            if gene == -1:
+                new_route = True
+                continue
+            tours[p, pos] = gene
+            starts[p, pos] = new_route
+            new_route = False
+            pos += 1
+    return tours, starts
+
+
+def decode(tour, start):
+    # satu baris (tours, starts) -> list chrom dengan separator -1
+    chrom = []
+    for pos, (gene, new_route) in enumerate(zip(tour.tolist(), start.tolist())):
+        if new_route and pos > 0:
+            chrom.append(-1)
+        chrom.append(gene)
+    return chrom
+
+
+class ArrayPopulation:
+    """Operator GA untuk populasi array; logika mengikuti versi list di VRPSolver."""
+
+    def __init__(self, matrices, demands, car_count, bike_count, car_capacity, bike_capacity,
+                 mutation_rate, rng, decode="greedy", max_trip=None):
+        self.n = matrices.n
+        self.m = self.n - 1
+        self.data = matrices.data
+        self.flat = matrices.data.reshape(-1)
+        self.demands = np.asarray(demands, dtype=np.float64)
+        self.car_count = car_count
+        self.bike_count = bike_count
+        self.car_capacity = car_capacity
+        self.bike_capacity = bike_capacity
+        self.total_vehicles = car_count + bike_count
+        self.mutation_rate = mutation_rate
+        self.rng = rng
+        # kapasitas per kendaraan untuk split greedy, inf setelah kendaraan terakhir
+        self.split_caps = np.array(
+            [car_capacity] * car_count + [bike_capacity] * bike_count + [np.inf], dtype=np.float64
+        )
+        self.decode = decode
+        # batas panjang trip untuk split optimal (k di O(n * k))
+        longest = max_trip_length(self.demands, max(car_capacity, bike_capacity))
+        self.max_trip = longest if max_trip is None else max(1, min(int(max_trip), longest))
+
+    def evaluate(self, tours, starts):
+        """Return (fitness, cost) per chrom sesuai mode decode."""
+        if self.decode == "split":
+            return self.evaluate_split(tours)
+        return self.evaluate_starts(tours, starts)
+
+    def evaluate_starts(self, tours, starts):
+        """
+        Return (fitness, cost) per chrom, sama dengan VRPSolver.fitness dan
+        calculate_cost(decode_chrom(...)).
+        """
+        P, m = tours.shape
+        rows = np.arange(P)[:, None]
+        rid = np.cumsum(starts, axis=1) - 1
+        n_routes = rid[:, -1] + 1
+
+        # load per rute, index rute 0..n_routes-1
+        owner = (rid + rows * m).ravel()
+        loads = np.bincount(owner, weights=self.demands[tours].ravel(), minlength=P * m).reshape(P, m)
+        exists = np.arange(m) < n_routes[:, None]
+
+        # assign vehicle seperti decode_chrom: urut demand turun (stabil), lalu greedy
+        order = np.argsort(np.where(exists, -loads, np.inf), axis=1, kind="stable")
+        sorted_loads = np.take_along_axis(loads, order, axis=1)
+        sorted_bike = np.zeros((P, m), dtype=bool)
+        bikes = np.zeros(P, dtype=np.intp)
+        cars = np.zeros(P, dtype=np.intp)
+        for k in range(int(n_routes.max())):
+            demand = sorted_loads[:, k]
+            active = k < n_routes
+            bike_ok = bikes < self.bike_count
+            car_ok = cars < self.car_count
+            fits_bike = demand <= self.bike_capacity
+            fits_car = demand <= self.car_capacity
+
+            use_bike = fits_bike & bike_ok
+            use_car = ~use_bike & fits_car & car_ok
+            spill_bike = ~use_bike & ~use_car & bike_ok
+            spill_car = ~use_bike & ~use_car & ~spill_bike & car_ok
+            # armada habis: best-fit tanpa menambah counter
+            over_bike = ~(use_bike | use_car | spill_bike | spill_car) & ~fits_car & fits_bike
+
+            sorted_bike[:, k] = use_bike | spill_bike | over_bike
+            bikes += (use_bike | spill_bike) & active
+            cars += (use_car | spill_car) & active
+
+        is_bike = np.zeros((P, m), dtype=bool)
+        np.put_along_axis(is_bike, order, sorted_bike, axis=1)
+
+        capacity = np.where(is_bike, self.bike_capacity, self.car_capacity)
+        over = np.maximum(loads - capacity, 0) * exists
+        penalty = over.sum(axis=1) * CAPACITY_PENALTY
+
+        # satu gather untuk semua edge: prev -> customer, dan customer terakhir -> depot
+        offset = np.where(np.take_along_axis(is_bike, rid, axis=1), BIKE, CAR) * (self.n * self.n)
+        prev = np.empty_like(tours)
+        prev[:, 0] = 0
+        prev[:, 1:] = tours[:, :-1]
+        prev[starts] = 0
+        ends = np.empty_like(starts)
+        ends[:, :-1] = starts[:, 1:]
+        ends[:, -1] = True
+
+        dist = self.flat[offset + prev * self.n + tours].sum(axis=1)
+        dist += (self.flat[offset + tours * self.n] * ends).sum(axis=1)
+
+        cost = dist + penalty
+        penalized = cost + ROUTE_PENALTY * np.maximum(n_routes - self.total_vehicles, 0)
+        with np.errstate(divide="ignore"):
+            fitness = np.where(penalized == 0, np.inf, 1 / penalized)
+        return fitness, cost
+
+    def _split_dp(self, tours, keep_pred=False):
+        """
+        DP split untuk semua tour sekaligus. V[:, j, c, b] = jarak minimum
+        melayani j customer pertama dengan c mobil dan b motor (satu trip per
+        kendaraan). Return (V[:, m], pred) - pred (start trip, motor?) hanya
+        kalau keep_pred.
+
+        Trip paling panjang max_trip customer, jadi V[:, i] hanya butuh
+        max_trip layer sebelumnya: V disimpan sebagai ring max_trip + 1 layer
+        dan populasi dipecah per blok baris supaya memori DP kira-kira
+        <= SPLIT_DP_BYTES. pred tetap penuh (hanya dipakai split_routes,
+        satu tour).
+        """
+        P, m = tours.shape
+        layers = min(self.max_trip, m) + 1
+        layer_bytes = 8 * layers * (self.car_count + 1) * (self.bike_count + 1)
+        # ring V + candidate (P, w, c, b) + sementara numpy
+        block = max(1, SPLIT_DP_BYTES // (4 * layer_bytes))
+        if keep_pred or P <= block:
+            return self._split_block(tours, layers, keep_pred)
+        ends = [self._split_block(tours[s:s + block], layers)[0] for s in range(0, P, block)]
+        return np.concatenate(ends), None
+
+    def _split_block(self, tours, layers, keep_pred=False):
+        P, m = tours.shape
+        load = np.zeros((P, m + 1))
+        load[:, 1:] = np.cumsum(self.demands[tours], axis=1)
+
+        # per profil: depot -> customer, customer -> depot, prefix edge dalam tour
+        profiles = []
+        for profile, capacity, count in ((CAR, self.car_capacity, self.car_count),
+                                         (BIKE, self.bike_capacity, self.bike_count)):
+            if count == 0:
+                continue
+            D = self.data[profile]
+            inner = np.zeros((P, m))
+            inner[:, 1:] = np.cumsum(D[tours[:, :-1], tours[:, 1:]], axis=1)
+            profiles.append((profile == BIKE, D[0, tours], D[tours, 0], inner, capacity))
+
+        # ring: V[:, j] ada di slot j % layers
+        V = np.full((P, layers, self.car_count + 1, self.bike_count + 1), np.inf)
+        V[:, 0, 0, 0] = 0
+        if keep_pred:
+            shape = (P, m + 1, self.car_count + 1, self.bike_count + 1)
+            pred_start = np.zeros(shape, dtype=np.intp)
+            pred_bike = np.zeros(shape, dtype=bool)
+
+        max_capacity = max(self.car_capacity, self.bike_capacity)
+        for i in range(m):
+            # slot layer i - 1 sudah selesai dipakai, jadi slot layer i - 1 + layers
+            if i:
+                V[:, (i - 1) % layers] = np.inf
+            base = V[:, i % layers]
+            if not np.isfinite(base).any():
+                continue
+
+            # trip i..j-1, j = i+1 .. i+w; load naik terus jadi window bisa dipotong
+            trip_load = load[:, i + 1:i + 1 + self.max_trip] - load[:, i, None]
+            w = int(np.count_nonzero((trip_load <= max_capacity).any(axis=0)))
+            if w == 0:
+                continue
+            trip_load = trip_load[:, :w]
+            # layer i+1 .. i+w di ring: paling banyak dua potongan (wrap)
+            first = (i + 1) % layers
+            split = min(w, layers - first)
+            parts = [(slice(first, first + split), slice(0, split))]
+            if split < w:
+                parts.append((slice(0, w - split), slice(split, w)))
+
+            for is_bike, out, back, inner, capacity in profiles:
+                cost = out[:, i, None] + inner[:, i:i + w] - inner[:, i, None] + back[:, i:i + w]
+                cost[trip_load > capacity] = np.inf
+                if is_bike:
+                    candidate = base[:, None, :, :-1] + cost[:, :, None, None]
+                    vehicles = (slice(None), slice(1, None))
+                else:
+                    candidate = base[:, None, :-1, :] + cost[:, :, None, None]
+                    vehicles = (slice(1, None), slice(None))
+                for ring, window in parts:
+                    target = V[(slice(None), ring) + vehicles]
+                    part = candidate[:, window]
+                    if keep_pred:
+                        better = part < target
+                        j = slice(i + 1 + window.start, i + 1 + window.stop)
+                        pred_start[(slice(None), j) + vehicles][better] = i
+                        pred_bike[(slice(None), j) + vehicles][better] = is_bike
+                    np.minimum(target, part, out=target)
+
+        # copy: view akan menahan seluruh ring V selama blok lain dihitung
+        return V[:, m % layers].copy(), (pred_start, pred_bike) if keep_pred else None
+
+    def evaluate_split(self, tours):
+        """
+        Fitness dengan split optimal. Tour yang tidak bisa dilayani armada
+        (DP tanpa solusi) dinilai dengan split greedy + penalti seperti biasa.
+        """
+        P = len(tours)
+        end, _ = self._split_dp(tours)
+        cost = end.reshape(P, -1).min(axis=1)
+        with np.errstate(divide="ignore"):
+            fitness = np.where(cost == 0, np.inf, 1 / cost)
+
+        infeasible = ~np.isfinite(cost)
+        if infeasible.any():
+            rows = tours[infeasible]
+            fitness[infeasible], cost[infeasible] = self.evaluate_starts(rows, self.split(rows))
+        return fitness, cost
+
+    def split_routes(self, tour):
+        """
+        Rute split optimal satu tour -> [(rute, motor?)], None kalau armada
+        tidak cukup.
+        """
+        end, (pred_start, pred_bike) = self._split_dp(tour[None, :], keep_pred=True)
+        end = end[0]
+        if not np.isfinite(end).any():
+            return None
+
+        c, b = np.unravel_index(np.argmin(end), end.shape)
+        j = len(tour)
+        routes = []
+        while j > 0:
+            i = pred_start[0, j, c, b]
+            is_bike = bool(pred_bike[0, j, c, b])
+            routes.append((tour[i:j].tolist(), is_bike))
+            if is_bike:
+                b -= 1
+            else:
+                c -= 1
+            j = i
+        routes.reverse()
+        return routes
+
+    def crossover(self, p1, p2):
+        """Alternating edge crossover untuk semua pasangan parent (baris p1, p2)."""
+        C, m = p1.shape
+        rows = np.arange(C)
+
+        # successor tiap kota di tour parent (siklik)
+        succ1 = np.zeros((C, self.n), dtype=np.intp)
+        succ2 = np.zeros((C, self.n), dtype=np.intp)
+        succ1[rows[:, None], p1] = np.roll(p1, -1, axis=1)
+        succ2[rows[:, None], p2] = np.roll(p2, -1, axis=1)
+
+        # index flat (baris * n + kota) supaya gather per langkah murah
+        base = rows * self.n
+        succ1 = succ1.ravel()
+        succ2 = succ2.ravel()
+        child = np.empty((C, m), dtype=np.intp)
+        visited = np.zeros(C * self.n, dtype=bool)
+        # pointer ke kota pertama yang mungkin belum dikunjungi di urutan parent 1
+        pointer = np.zeros(C, dtype=np.intp)
+        p1_flat = p1.ravel()
+        p1_base = rows * m
+
+        current = p1[rows, self.rng.integers(m, size=C)]
+        child[:, 0] = current
+        visited[base + current] = True
+
+        for t in range(1, m):
+            succ = succ1 if t % 2 == 1 else succ2
+            nxt = succ[base + current]
+            stuck = np.flatnonzero(visited[base + nxt])
+            if len(stuck):
+                # kota belum dikunjungi pertama menurut urutan parent 1
+                ptr = pointer[stuck]
+                city = p1_flat[p1_base[stuck] + ptr]
+                seen = visited[base[stuck] + city]
+                while seen.any():
+                    ptr += seen
+                    city = p1_flat[p1_base[stuck] + ptr]
+                    seen = visited[base[stuck] + city]
+                pointer[stuck] = ptr
+                nxt[stuck] = city
+            child[:, t] = nxt
+            visited[base + nxt] = True
+            current = nxt
+
+        if self.decode == "split":
+            # separator tidak dipakai, rute ditentukan saat evaluasi
+            starts = np.zeros((C, m), dtype=bool)
+            starts[:, 0] = True
+            return child, starts
+        return child, self.split(child)
+
+    def split(self, tours):
+        # reinsert separator greedy per kapasitas kendaraan (seperti aex_crossover)
+        C, m = tours.shape
+        demand = self.demands[tours]
+        starts = np.zeros((C, m), dtype=bool)
+        starts[:, 0] = True
+        load = np.zeros(C)
+        vehicle = np.zeros(C, dtype=np.intp)
+        for j in range(m):
+            cut = (load + demand[:, j] > self.split_caps[vehicle]) & (load > 0)
+            starts[:, j] |= cut
+            vehicle += cut
+            load = np.where(cut, 0, load) + demand[:, j]
+        return starts
+
+    def mutate(self, tours, starts):
+        """inversion / move_separator / swap pada baris terpilih, in place."""
+        C, m = tours.shape
+        if m < 2:
+            return
+        rows = np.flatnonzero(self.rng.random(C) < self.mutation_rate)
+        if self.decode == "split":
+            # move_separator tidak berarti tanpa separator: inversion / swap saja
+            kinds = 2 * self.rng.integers(2, size=len(rows))
+        else:
+            kinds = self.rng.integers(3, size=len(rows))
+
+        # dua posisi berbeda per baris
+        a = self.rng.integers(m, size=len(rows))
+        b = self.rng.integers(m - 1, size=len(rows))
+        b += b >= a
+        lo = np.minimum(a, b)
+        hi = np.maximum(a, b)
+
+        inv = kinds == 0
+        if inv.any():
+            r = rows[inv]
+            idx = np.arange(m)
+            inside = (idx >= lo[inv, None]) & (idx <= hi[inv, None])
+            src = np.where(inside, lo[inv, None] + hi[inv, None] - idx, idx)
+            tours[r] = np.take_along_axis(tours[r], src, axis=1)
+
+        swap = kinds == 2
+        if swap.any():
+            r = rows[swap]
+            tours[r, a[swap]], tours[r, b[swap]] = tours[r, b[swap]], tours[r, a[swap]]
+
+        move = (kinds == 1) & (self.total_vehicles > 1)
+        if move.any():
+            r = rows[move]
+            r = r[starts[r, 1:].any(axis=1)]
+            if len(r):
+                # hapus satu separator acak, lalu sisipkan di posisi acak
+                weights = self.rng.random((len(r), m - 1)) * starts[r, 1:]
+                starts[r, 1 + np.argmax(weights, axis=1)] = False
+                starts[r, self.rng.integers(m, size=len(r))] = True
+
+    def next_generation(self, tours, starts, fitness):
+        """Elitism + tournament dari top sample + crossover + mutasi."""
+        P = len(tours)
+        ranked = np.argsort(-fitness, kind="stable")
+        sample_size = min(P, max(15, P // 3))
+        top = ranked[:sample_size]
+
+        children = P - 1
+        i1 = self.rng.integers(sample_size, size=children)
+        i2 = self.rng.integers(max(sample_size - 1, 1), size=children)
+        i2 += i2 >= i1
+
+        child_tours, child_starts = self.crossover(tours[top[i1]], tours[top[i2]])
+        self.mutate(child_tours, child_starts)
+
+        elite = ranked[0]
+        return (
+            np.concatenate([tours[elite:elite + 1], child_tours]),
+            np.concatenate([starts[elite:elite + 1], child_starts]),
+        )
@@ -0,0 +1,148 @@
+"""
+Clarke-Wright savings (versi paralel) dalam O(n^2 log n).
+
+Tiap baris matriks savings diurutkan sekali (numpy), lalu heap berisi satu
+kandidat terbaik per customer i (rute berakhir di i -> rute mulai di j).
+Kandidat yang tidak valid dibuang secara lazy: begitu i bukan ujung rute
+atau j bukan awal rute, pasangan itu tidak akan valid lagi.
+Rute disimpan lewat ujung-ujungnya saja (other_end, load di ujung, succ),
+jadi cek "rute sama", load, dan merge semuanya O(1).
+"""
+import heapq
+
+import numpy as np
+
+from algorithms.matrix import as_matrix
+
+# initial solution tabu / SA: "default" = heuristik bawaan solver
+INITIAL_SOLUTIONS = ("default", "savings")
+
+
+def clarke_wright_routes(dist, demands, capacity, small_capacity=None, big_count=None):
+    """
+    Return list rute (tanpa depot) hasil merge savings d(i,0) + d(0,j) - d(i,j).
+
+    capacity        load maksimal satu rute
+    small_capacity  varian heterogen: rute dengan load > small_capacity hanya
+    big_count       bisa dilayani kendaraan besar, dan jumlahnya dibatasi
+                    big_count (tidak boleh bertambah melewati batas itu)
+    """
+    D = as_matrix(dist)
+    n = len(D)
+    m = n - 1
+    if m <= 0:
+        return []
+    demand = [float(d) for d in demands]
+
+    # savings customer x customer, diagonal tidak dipakai
+    savings = D[1:, :1] + D[:1, 1:] - D[1:, 1:]
+    np.fill_diagonal(savings, -np.inf)
+    order = np.argsort(-savings, axis=1, kind="stable") + 1
+    ranked = np.take_along_axis(savings, order - 1, axis=1)
+    order = order.tolist()
+    ranked = ranked.tolist()
+
+    # setiap customer awalnya rute sendiri
+    is_start = [True] * n
+    is_end = [True] * n
+    other_end = list(range(n))
+    load = demand[:]
+    succ = [0] * n
+    pointer = [0] * n
+
+    def is_big(value):
+        return small_capacity is not None and value > small_capacity
+
+    big = sum(1 for c in range(1, n) if is_big(demand[c]))
+
+    heap = [(-ranked[i - 1][0], i) for i in range(1, n) if m > 1]
+    heapq.heapify(heap)
+
+    while heap:
+        _, i = heapq.heappop(heap)
+        row = i - 1
+        k = pointer[i]
+        j = order[row][k]
+        pointer[i] = k + 1
+
+        if is_start[j] and other_end[i] != j:
+            total = load[i] + load[j]
+            merged_big = big - is_big(load[i]) - is_big(load[j]) + is_big(total)
+            fits = total <= capacity and (
+                big_count is None or merged_big <= max(big_count, big)
+            )
+            if fits:
+                a, b = other_end[i], other_end[j]
+                succ[i] = j
+                is_end[i] = False
+                is_start[j] = False
+                other_end[a], other_end[b] = b, a
+                load[a] = load[b] = total
+                big = merged_big
+
+        # i masih ujung rute: masukkan kandidat berikutnya (j terakhir = diagonal)
+        if is_end[i] and pointer[i] < m - 1:
+            heapq.heappush(heap, (-ranked[row][pointer[i]], i))
+
+    routes = []
+    for s in range(1, n):
+        if is_start[s]:
+            route = [s]
+            while route[-1] != other_end[s]:
+                route.append(succ[route[-1]])
+            routes.append(route)
+    return routes
+
+
+def assign_routes(routes, route_matrix, capacities, demands):
+    """
+    Bagi rute ke kendaraan (satu rute per kendaraan). Rute terberat dulu,
+    ke kendaraan kosong yang muat dengan cost rute termurah (seri: kapasitas
+    terkecil). Rute yang tidak kebagian kendaraan digabung ke kendaraan
+    dengan sisa kapasitas terbesar (nanti kena penalti kapasitas di solver).
+    Return list rute per kendaraan.
+    """
+    solution = [[] for _ in capacities]
+    loads = [0.0] * len(capacities)
+    leftovers = []
+
+    def cost(D, route):
+        path = [0] + route + [0]
+        return sum(D[a, b] for a, b in zip(path, path[1:]))
+
+    for route in sorted(routes, key=lambda r: -sum(demands[c] for c in r)):
+        route_load = sum(demands[c] for c in route)
+        best = None
+        for v, capacity in enumerate(capacities):
+            if solution[v] or route_load > capacity:
+                continue
+            key = (cost(route_matrix[v], route), capacity)
+            if best is None or key < best[0]:
+                best = (key, v)
+        if best is None:
+            leftovers.append(route)
+            continue
+        v = best[1]
+        solution[v] = route[:]
+        loads[v] = route_load
+
+    for route in leftovers:
+        v = min(range(len(capacities)), key=lambda x: loads[x] - capacities[x])
+        solution[v].extend(route)
+        loads[v] += sum(demands[c] for c in route)
+    return solution
+
+
+def savings_solution(problem):
+    """
+    Initial solution untuk tabu / SA: varian savings heterogen (kapasitas
+    mobil & motor) pada matriks mobil, lalu rute dibagi ke kendaraan.
+    problem: algorithms.core.Problem
+    """
+    capacities = problem.capacities
+    if not capacities:
+        return []
+    small = min(capacities)
+    big_count = sum(1 for c in capacities if c > small)
+    routes = clarke_wright_routes(problem.dist_car, problem.demands, max(capacities), small, big_count)
+    return assign_routes(routes, problem.route_matrix, capacities, problem.demands)
@@ -1,21 +1,30 @@
 import random
 import math
-import copy
+import numpy as np
 
-def simulated_annealing(dist_car, dist_bike, demands, vehicles, max_iter, temp, cooling):
-    
-    n = len(demands)
-    customers = list(range(1, n)) 
+from algorithms.core import Problem, SearchStats, StopCriteria
+from algorithms.savings import INITIAL_SOLUTIONS, savings_solution
+
+def simulated_annealing(dist_car, dist_bike, demands, vehicles, max_iter, temp, cooling, progress=None,
+                        initial="default", stats=None, stop=None, initial_routes=None):
+    # progress: callback opsional, dipanggil dengan setiap titik history baru
+    # initial: "default" (nearest neighbor) atau "savings" (Clarke-Wright)
+    # stats: SearchStats opsional, counter move dinilai / diterima
+    # stop: StopCriteria opsional (deadline / stagnation), selain max_iter
+    # initial_routes: solusi awal per kendaraan (warm start), menggantikan `initial`
+    if initial not in INITIAL_SOLUTIONS:
+        raise ValueError(f"Unknown initial solution '{initial}'")
+    if stats is None:
+        stats = SearchStats()
+    if stop is None:
+        stop = StopCriteria()
     
-    # buat list vehicles berdasarkan id, jadi misal ada 2 mobil 1 motor maka:
-    # mobil 1, mobil 2, motor 3
-    vehicle_list = []
-    for v in vehicles:
-        for _ in range(v["count"]):
-            vehicle_list.append({
-                "type": v["type"],
-                "capacity": v["capacity"]
-            })
+    # list vehicles berdasarkan id, jadi misal ada 2 mobil 1 motor maka:
+    # mobil 1, mobil 2, motor 3 (fleet, matriks, cost & operator dari core)
+    problem = Problem.from_vehicles(dist_car, dist_bike, demands, vehicles)
+    demand_arr = problem.demand_arr
+    customers = problem.customers
+    vehicle_list = problem.vehicles
     
     # buat initial solution dengan nearest neighbor heuristic
     def nearest_neighbor_init():
@@ -30,23 +39,19 @@ def simulated_annealing(dist_car, dist_bike, demands, vehicles, max_iter, temp,
             current_pos = 0
             route = []
             
+            dist_matrix = problem.route_matrix[v_idx]
+
             while remaining:
                 
-                best_customer = None
-                best_dist = float('inf')
-                
-                dist_matrix = dist_bike if vehicle["type"].lower() == "motor" else dist_car
-                
-                for customer in remaining:
-                    if current_load + demands[customer] <= vehicle["capacity"]:
-                        dist = dist_matrix[current_pos][customer]
-                        if dist < best_dist:
-                            best_dist = dist
-                            best_customer = customer
-                
-                if best_customer is None:
+                # customer terdekat yang masih muat, dicari sekaligus (vektor)
+                candidates = np.fromiter(remaining, dtype=np.intp, count=len(remaining))
+                fits = current_load + demand_arr[candidates] <= vehicle["capacity"]
+                if not fits.any():
                     break
                 
+                candidates = candidates[fits]
+                best_customer = int(candidates[np.argmin(dist_matrix[current_pos, candidates])])
+                
                 route.append(best_customer)
                 current_load += demands[best_customer]
                 current_pos = best_customer
@@ -56,161 +61,137 @@ def simulated_annealing(dist_car, dist_bike, demands, vehicles, max_iter, temp,
         
         return routes
 
+    capacity = problem.capacities
+
     def calculate_cost(routes):
-        total_cost = 0
-        bikes_used = 0
-        cars_used = 0
-        
-        for v_idx, route in enumerate(routes):
-            if not route:
-                continue
-            
-            vehicle = vehicle_list[v_idx]
-            dist_matrix = dist_bike if vehicle["type"].lower() == "motor" else dist_car
-            
-            if vehicle["type"].lower() == "motor":
-                bikes_used += 1
-            else:
-                cars_used += 1
-            
-            # Cost dari depot ke customer pertama
-            route_cost = dist_matrix[0][route[0]]
-            
-            # Cost antar customer
-            for i in range(len(route) - 1):
-                route_cost += dist_matrix[route[i]][route[i + 1]]
-            
-            # Cost dari customer terakhir kembali ke depot
-            route_cost += dist_matrix[route[-1]][0]
-            
-            total_cost += route_cost
+        # jarak semua rute (satu gather) + penalty overload: rute warm start
+        # bisa overload kalau stop baru tidak muat di kendaraan mana pun
+        total_cost = problem.total_cost(routes)
+        bikes_used, cars_used = problem.vehicles_used(routes)
         
         return total_cost, bikes_used, cars_used
-    
-    def is_valid(routes):
-        for v_idx, route in enumerate(routes):
-            vehicle = vehicle_list[v_idx]
-            load = sum(demands[customer] for customer in route)
-            if load > vehicle["capacity"]:
-                return False
-        return True
-    
-    def get_neighbor(routes):
-        new_routes = copy.deepcopy(routes)
-        
-        # Get non-empty routes
-        non_empty = [i for i, r in enumerate(new_routes) if r]
-        
+
+    # --- MOVE ---
+    # Neighbor tidak dibuat dengan copy: delta cost dihitung dari edge yang
+    # berubah (problem.move_delta) tanpa mengubah routes, dan move hanya
+    # diterapkan in place (problem.apply_move) kalau diterima.
+    # Load per rute disimpan di list `loads` dan ikut diupdate.
+
+    def sample_move(routes, loads, operation=None):
+        """
+        Pilih move random (urutan random sama dengan versi deepcopy lama).
+        Return None kalau move tidak mengubah apa-apa (mis. tidak muat).
+        """
+        non_empty = [i for i, r in enumerate(routes) if r]
         if not non_empty:
-            return new_routes
-        
-        
+            return None
+
         # pilihan neighbor structur :
         # 1. swap : tukar dua customer dalam satu rute
         # 2. relocate : pindah satu customer ke rute lain
         # 3. two_opt : reverse tiap customer dari ujung kiri -> ujung kanan
         # 4. cross_exchange : tuker segmen antar 2 rute
-        
-        operation = random.choice(['swap', 'relocate', 'two_opt', 'cross_exchange'])
-        
-        if operation == 'swap' and len(non_empty) >= 1:
+        if operation is None:
+            operation = random.choice(['swap', 'relocate', 'two_opt', 'cross_exchange'])
+
+        if operation == 'swap':
             route_idx = random.choice(non_empty)
-            route = new_routes[route_idx]
-            if len(route) >= 2:
-                i, j = random.sample(range(len(route)), 2)
-                route[i], route[j] = route[j], route[i]
-        
-        elif operation == 'relocate' and len(non_empty) >= 1:
+            if len(routes[route_idx]) >= 2:
+                i, j = random.sample(range(len(routes[route_idx])), 2)
+                return ('swap', route_idx, i, route_idx, j)
+
+        elif operation == 'relocate':
             # pindah customer ke rute lain
             from_idx = random.choice(non_empty)
-            from_route = new_routes[from_idx]
-            
-            if from_route:
-                # ambil index customer random
-                cust_idx = random.randint(0, len(from_route) - 1)
-                customer = from_route.pop(cust_idx)
-                
-                # ambil index rute tujuan
-                to_idx = random.randint(0, len(new_routes) - 1)
-                to_route = new_routes[to_idx]
-                
-                # cek kapasitas dulu sebelum insert
-                vehicle = vehicle_list[to_idx]
-                current_load = sum(demands[c] for c in to_route)
-                
-                if current_load + demands[customer] <= vehicle["capacity"]:
-                    if to_route:
-                        insert_pos = random.randint(0, len(to_route))
-                        to_route.insert(insert_pos, customer)
-                    else:
-                        to_route.append(customer)
-                else:
-                    # kembalikan ke rute asal kalo ga muat
-                    from_route.insert(cust_idx, customer)
-        
-        elif operation == 'two_opt' and len(non_empty) >= 1:
+            cust_idx = random.randint(0, len(routes[from_idx]) - 1)
+            customer = routes[from_idx][cust_idx]
+            to_idx = random.randint(0, len(routes) - 1)
+
+            # load & panjang rute tujuan setelah customer diambil
+            same = to_idx == from_idx
+            to_load = loads[to_idx] - (demands[customer] if same else 0)
+            to_len = len(routes[to_idx]) - (1 if same else 0)
+
+            # cek kapasitas dulu sebelum insert
+            if to_load + demands[customer] <= capacity[to_idx]:
+                insert_pos = random.randint(0, to_len) if to_len else 0
+                return ('relocate', from_idx, cust_idx, to_idx, insert_pos)
+
+        elif operation == 'two_opt':
             # reverse segmen dalam satu rute (ujung kiri ke ujung kanan)
             route_idx = random.choice(non_empty)
-            route = new_routes[route_idx]
-            if len(route) >= 2:
-                i, j = sorted(random.sample(range(len(route)), 2))
-                route[i:j+1] = reversed(route[i:j+1])
-        
+            if len(routes[route_idx]) >= 2:
+                i, j = sorted(random.sample(range(len(routes[route_idx])), 2))
+                return ('two_opt', route_idx, i, j)
+
         elif operation == 'cross_exchange' and len(non_empty) >= 2:
             # tuker segmen antar 2 rute, segmen itu beberapa customer
             route1_idx, route2_idx = random.sample(non_empty, 2)
-            route1 = new_routes[route1_idx]
-            route2 = new_routes[route2_idx]
-            
-            if route1 and route2:
-                # pilih segmen random (minimal 2 customer)
-                seg1_len = random.randint(1, min(2, len(route1)))
-                seg2_len = random.randint(1, min(2, len(route2)))
-                
-                seg1_start = random.randint(0, len(route1) - seg1_len)
-                seg2_start = random.randint(0, len(route2) - seg2_len)
-                
-                seg1 = route1[seg1_start:seg1_start + seg1_len]
-                seg2 = route2[seg2_start:seg2_start + seg2_len]
-                
-                # buat rute baru dengan segmen ditukar
-                new_route1 = route1[:seg1_start] + seg2 + route1[seg1_start + seg1_len:]
-                new_route2 = route2[:seg2_start] + seg1 + route2[seg2_start + seg2_len:]
-                
-                # cek kapasitas sebelum diterapkan
-                v1_cap = vehicle_list[route1_idx]["capacity"]
-                v2_cap = vehicle_list[route2_idx]["capacity"]
-                
-                load1 = sum(demands[c] for c in new_route1)
-                load2 = sum(demands[c] for c in new_route2)
-                
-                if load1 <= v1_cap and load2 <= v2_cap:
-                    new_routes[route1_idx] = new_route1
-                    new_routes[route2_idx] = new_route2
-        
-        return new_routes
+            route1 = routes[route1_idx]
+            route2 = routes[route2_idx]
+
+            seg1_len = random.randint(1, min(2, len(route1)))
+            seg2_len = random.randint(1, min(2, len(route2)))
+            seg1_start = random.randint(0, len(route1) - seg1_len)
+            seg2_start = random.randint(0, len(route2) - seg2_len)
+
+            # cek kapasitas sebelum diterapkan
+            seg1_load = sum(demands[c] for c in route1[seg1_start:seg1_start + seg1_len])
+            seg2_load = sum(demands[c] for c in route2[seg2_start:seg2_start + seg2_len])
+            if (loads[route1_idx] - seg1_load + seg2_load <= capacity[route1_idx]
+                    and loads[route2_idx] - seg2_load + seg1_load <= capacity[route2_idx]):
+                return ('cross_exchange', route1_idx, seg1_start, seg1_len,
+                        route2_idx, seg2_start, seg2_len)
+
+        return None
+
+    def penalty_delta(routes, loads, move):
+        # perubahan penalty overload; move hanya dipilih kalau tujuan muat,
+        # jadi ini hanya negatif saat memindahkan customer dari rute overload
+        op = move[0]
+        if op == 'two_opt':
+            return 0
+        if op == 'relocate':
+            _, v1, idx, v2, _ = move
+            diff = demands[routes[v1][idx]]
+        elif op == 'swap':
+            _, v1, idx1, v2, idx2 = move
+            diff = demands[routes[v1][idx1]] - demands[routes[v2][idx2]]
+        else:
+            _, v1, s1, l1, v2, s2, l2 = move
+            diff = (sum(demands[c] for c in routes[v1][s1:s1 + l1])
+                    - sum(demands[c] for c in routes[v2][s2:s2 + l2]))
+        if v1 == v2 or not diff:
+            return 0
+        penalty = problem.overload_penalty
+        return (penalty(loads[v1] - diff, v1) + penalty(loads[v2] + diff, v2)
+                - penalty(loads[v1], v1) - penalty(loads[v2], v2))
+
+    def evaluate_move(routes, loads, move):
+        # delta tanpa mengubah routes
+        if move is None:
+            return 0
+        return problem.move_delta(routes, move) + penalty_delta(routes, loads, move)
     
-    def local_search(routes, num_candidates=10):
-        # buat beberapa kandidat tetangga dan pilih yang terbaik
-        best_candidate = routes
-        best_candidate_cost = float('inf')
+    def local_search(routes, loads, num_candidates=10):
+        # buat beberapa kandidat tetangga dan pilih yang terbaik (berdasarkan delta)
+        best_move = None
+        best_delta = float('inf')
         
         for _ in range(num_candidates):
-            candidate = get_neighbor(routes)
+            move = sample_move(routes, loads)
+            delta = evaluate_move(routes, loads, move)
             
-            if not is_valid(candidate):
-                continue
-            
-            candidate_cost, _, _ = calculate_cost(candidate)
-            
-            if candidate_cost < best_candidate_cost:
-                best_candidate = candidate
-                best_candidate_cost = candidate_cost
+            if delta < best_delta:
+                best_move = move
+                best_delta = delta
         
-        return best_candidate, best_candidate_cost
+        stats.evaluated += num_candidates
+        return best_move, best_delta
     
     def variable_neighborhood_search(routes, max_no_improve=5):
-        current = copy.deepcopy(routes)
+        current = [r[:] for r in routes]
+        loads = problem.route_loads(current)
         current_cost, _, _ = calculate_cost(current)
         no_improve = 0
         
@@ -221,84 +202,23 @@ def simulated_annealing(dist_car, dist_bike, demands, vehicles, max_iter, temp,
             
             for operation in operations:
                 # generate neighbornya urut iteratif berdasarkan operation
-                best_neighbor = current
-                best_neighbor_cost = current_cost
+                best_move = None
+                best_delta = 0
                 
                 for _ in range(5):  # coba 5 neighbor tiap 1 operasi
-                    neighbor = copy.deepcopy(current)
-                    non_empty = [i for i, r in enumerate(neighbor) if r]
-                    
-                    if not non_empty:
-                        continue
-                    
-                    # if-else condition untuk tiap operasi
-                    if operation == 'swap' and len(non_empty) >= 1:
-                        route_idx = random.choice(non_empty)
-                        route = neighbor[route_idx]
-                        if len(route) >= 2:
-                            i, j = random.sample(range(len(route)), 2)
-                            route[i], route[j] = route[j], route[i]
+                    move = sample_move(current, loads, operation)
+                    delta = evaluate_move(current, loads, move)
                     
-                    elif operation == 'relocate' and len(non_empty) >= 1:
-                        from_idx = random.choice(non_empty)
-                        from_route = neighbor[from_idx]
-                        if from_route:
-                            cust_idx = random.randint(0, len(from_route) - 1)
-                            customer = from_route.pop(cust_idx)
-                            to_idx = random.randint(0, len(neighbor) - 1)
-                            to_route = neighbor[to_idx]
-                            vehicle = vehicle_list[to_idx]
-                            current_load = sum(demands[c] for c in to_route)
-                            if current_load + demands[customer] <= vehicle["capacity"]:
-                                if to_route:
-                                    insert_pos = random.randint(0, len(to_route))
-                                    to_route.insert(insert_pos, customer)
-                                else:
-                                    to_route.append(customer)
-                            else:
-                                from_route.insert(cust_idx, customer)
-                    
-                    elif operation == 'two_opt' and len(non_empty) >= 1:
-                        route_idx = random.choice(non_empty)
-                        route = neighbor[route_idx]
-                        if len(route) >= 2:
-                            i, j = sorted(random.sample(range(len(route)), 2))
-                            route[i:j+1] = reversed(route[i:j+1])
-                    
-                    elif operation == 'cross_exchange' and len(non_empty) >= 2:
-                        route1_idx, route2_idx = random.sample(non_empty, 2)
-                        route1 = neighbor[route1_idx]
-                        route2 = neighbor[route2_idx]
-                        if route1 and route2:
-                            seg1_len = random.randint(1, min(2, len(route1)))
-                            seg2_len = random.randint(1, min(2, len(route2)))
-                            seg1_start = random.randint(0, len(route1) - seg1_len)
-                            seg2_start = random.randint(0, len(route2) - seg2_len)
-                            seg1 = route1[seg1_start:seg1_start + seg1_len]
-                            seg2 = route2[seg2_start:seg2_start + seg2_len]
-                            new_route1 = route1[:seg1_start] + seg2 + route1[seg1_start + seg1_len:]
-                            new_route2 = route2[:seg2_start] + seg1 + route2[seg2_start + seg2_len:]
-                            v1_cap = vehicle_list[route1_idx]["capacity"]
-                            v2_cap = vehicle_list[route2_idx]["capacity"]
-                            load1 = sum(demands[c] for c in new_route1)
-                            load2 = sum(demands[c] for c in new_route2)
-                            if load1 <= v1_cap and load2 <= v2_cap:
-                                neighbor[route1_idx] = new_route1
-                                neighbor[route2_idx] = new_route2
-                    
-                    if not is_valid(neighbor):
-                        continue
-                    
-                    neighbor_cost, _, _ = calculate_cost(neighbor)
-                    
-                    if neighbor_cost < best_neighbor_cost:
-                        best_neighbor = neighbor
-                        best_neighbor_cost = neighbor_cost
+                    if delta < best_delta:
+                        best_move = move
+                        best_delta = delta
+                stats.evaluated += 5
                 
                 # jika ada improvement maka no improbe direset
-                if best_neighbor_cost < current_cost:
-                    current = best_neighbor
-                    current_cost = best_neighbor_cost
+                if best_move is not None:
+                    problem.apply_move(current, loads, best_move)
+                    stats.accepted += 1
+                    current_cost += best_delta
                     improved = True
                     no_improve = 0
                     break
@@ -307,13 +227,21 @@ def simulated_annealing(dist_car, dist_bike, demands, vehicles, max_iter, temp,
             if not improved:
                 no_improve += 1
         
+        # cost dihitung ulang penuh supaya tidak drift
+        current_cost, _, _ = calculate_cost(current)
         return current, current_cost
     
     # FUNGSI UTAMA (JALANNYA ALGORITMA SA)
-    current_routes = nearest_neighbor_init()
+    if initial_routes is not None:
+        current_routes = [list(r) for r in initial_routes]
+    elif initial == "savings":
+        current_routes = savings_solution(problem)
+    else:
+        current_routes = nearest_neighbor_init()
+    current_loads = problem.route_loads(current_routes)
     current_cost, bikes, cars = calculate_cost(current_routes)
     
-    best_routes = copy.deepcopy(current_routes)
+    best_routes = [r[:] for r in current_routes]
     best_cost = current_cost
     
     history = []
@@ -327,6 +255,8 @@ def simulated_annealing(dist_car, dist_bike, demands, vehicles, max_iter, temp,
         "bikesUsed": bikes,
         "carsUsed": cars
     })
+    if progress:
+        progress(history[-1])
     
     # MAIN SA LOOP
     for iteration in range(1, max_iter + 1):
@@ -336,11 +266,9 @@ def simulated_annealing(dist_car, dist_bike, demands, vehicles, max_iter, temp,
         # temperatur rendah = eksploitasi (lebih sedikit kandidat)
         # loop berhenti ketika suhu < 0.01, tapi kita batasi juga dengan max_iter
         num_candidates = int(5 + (15 * (1 - current_temp / temp)))
-        new_routes, new_cost = local_search(current_routes, num_candidates)
-        
-        # hitung delta cost (cost baru - cost lama)
-        delta = new_cost - current_cost
+        move, delta = local_search(current_routes, current_loads, num_candidates)
         
+        # delta cost (cost baru - cost lama) langsung dari move
         if delta < 0:
             # langsun terima, karena solusi baru lebih baik
             accept = True
@@ -350,14 +278,20 @@ def simulated_annealing(dist_car, dist_bike, demands, vehicles, max_iter, temp,
             accept = random.random() < prob
         
         if accept:
-            current_routes = new_routes
-            current_cost = new_cost
-            new_bikes, new_cars = calculate_cost(current_routes)[1:]
+            if move is not None:
+                problem.apply_move(current_routes, current_loads, move)
+                stats.accepted += 1
+            current_cost += delta
+            new_bikes, new_cars = problem.vehicles_used(current_routes)
             
             # update solusi terbaik
             if current_cost < best_cost:
-                best_routes = copy.deepcopy(current_routes)
+                # cost dihitung ulang penuh supaya tidak drift
+                current_cost = calculate_cost(current_routes)[0]
+            if current_cost < best_cost:
+                best_routes = [r[:] for r in current_routes]
                 best_cost = current_cost
+                stats.improved += 1
                 
                 # jalankan VNS
                 if iteration % 50 == 0:
@@ -365,11 +299,14 @@ def simulated_annealing(dist_car, dist_bike, demands, vehicles, max_iter, temp,
                     if improved_cost < best_cost:
                         best_routes = improved_routes
                         best_cost = improved_cost
+                        stats.improved += 1
         else:
             new_bikes, new_cars = bikes, cars
         
         # history hanya di update setiap 5 iterasi untuk mengurangi ukuran data
-        if iteration % 5 == 0:
+        # (dan di iterasi terakhir kalau berhenti lebih awal)
+        stopping = stop.done(best_cost)
+        if iteration % 5 == 0 or stopping:
             history.append({
                 "iteration": iteration,
                 "cost": current_cost,
@@ -377,14 +314,21 @@ def simulated_annealing(dist_car, dist_bike, demands, vehicles, max_iter, temp,
                 "bikesUsed": new_bikes,
                 "carsUsed": new_cars
             })
+            if progress:
+                progress(history[-1])
         
         # turunkan suhu, temp = temp * cooling_rate
         current_temp *= cooling
+        stats.iterations += 1
+        if stopping:
+            break
     
-    # VNS terakhir
-    final_routes, final_cost = variable_neighborhood_search(best_routes, max_no_improve=10)
-    if final_cost < best_cost:
-        best_routes = final_routes
-        best_cost = final_cost
+    # VNS terakhir (dilewati kalau deadline sudah lewat)
+    if stop.reason != "timeBudget":
+        final_routes, final_cost = variable_neighborhood_search(best_routes, max_no_improve=10)
+        if final_cost < best_cost:
+            best_routes = final_routes
+            best_cost = final_cost
+            stats.improved += 1
     
-    return best_routes, best_cost, history, vehicle_list
\ No newline at end of file
+    return best_routes, best_cost, history, vehicle_list
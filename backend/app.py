@@ -1,10 +1,9 @@
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify, stream_with_context
 from flask_cors import CORS
-from enum import Enum
-import requests
 import random
 import math
 import json
+import time
 import os
 
 app = Flask(__name__)
@@ -13,377 +12,164 @@ CORS(app)
 LOCATION_FILE = "./data/locations.json"
 VEHICLE_FILE = "./data/vehicles.json"
 
-class ROUTE_METHOD(Enum):
-    CAR = "driving"
-    BIKE = "bike"
+# Distance backends (OSRM table / offline estimate / hybrid) + persistent cache
+from routing.cache import route_cache
 
-# OSRM Distance
-distance_cache = {}
+# Pipeline solve (matriks -> TABU SEARCH / SIMULATED ANNEALING / GENETIC -> path)
+from solving.pipeline import solve_request, SolveError, SOLVERS
+# Diagnostics per solve + metrik Prometheus
+from solving import metrics
+# Job async + progress SSE
+from solving.jobs import job_manager, DONE, FAILED, CANCELLED
+# Insertion real-time order baru ke rute yang sedang berjalan
+from solving.dispatch import insert_order
+# Bulk solve skenario what-if (NDJSON)
+from solving.bulk import BulkSolve, CONTENT_TYPE as NDJSON
 
-def osrm_distance(p1, p2, route_method:ROUTE_METHOD):
-    key = (p1["lat"], p1["lng"], p2["lat"], p2["lng"])
-    if key in distance_cache:
-        return distance_cache[key]
+# ==================================================================
+# ROUTING API - TSP
+# ==================================================================
+@app.route("/api/solve/<algorithm>", methods=["POST"])
+def solve(algorithm):
+    data = request.json
 
-    url = f"https://router.project-osrm.org/route/v1/{route_method.value}/{p1['lng']},{p1['lat']};{p2['lng']},{p2['lat']}?overview=false"
+    if "locations" not in data:
+        return jsonify({"error": "No valid input data"}), 400
 
+    # nama algoritma dari URL tidak dipakai mentah sebagai label metrik
+    label = algorithm if algorithm in SOLVERS else "unknown"
     try:
-        res = requests.get(url, timeout=5).json()
-        d = res["routes"][0]["distance"]
-    except:
-        d = 9999999
+        result = solve_request(algorithm, data["locations"], data["params"])
+    except SolveError as e:
+        metrics.record_failure(label, e.status)
+        return jsonify(e.payload), e.status
 
-    distance_cache[key] = d
-    return d
+    # serialize diukur tanpa block diagnostics
+    diagnostics = result.pop("diagnostics")
+    started = time.perf_counter()
+    body = app.json.dumps(result)
+    diagnostics["phases"]["serialize"] = round(time.perf_counter() - started, 6)
+    metrics.record_solve(label, diagnostics)
 
-def osrm_route_path(p1, p2, route_method:ROUTE_METHOD):    
-    url = f"https://router.project-osrm.org/route/v1/{route_method.value}/{p1['lng']},{p1['lat']};{p2['lng']},{p2['lat']}?overview=full&geometries=geojson"
+    if not data["params"].get("diagnostics"):
+        # body yang sudah di-serialize dipakai langsung
+        return app.response_class(body + "\n", mimetype="application/json")
+    result["diagnostics"] = diagnostics
+    return jsonify(result)
+
+
+@app.get("/metrics")
+def get_metrics():
+    return Response(metrics.registry.render(), content_type=metrics.CONTENT_TYPE)
 
-    try:
-        res = requests.get(url, timeout=5).json()
-        return res["routes"][0]["geometry"]["coordinates"]
-    except:
-        return []
-
-def build_distance_matrix(locations:list):
-    n = len(locations)
-
-    dist_car = [[0] * n for _ in range(n)]
-    dist_bike = [[0] * n for _ in range(n)]
-
-    for i in range(n):
-        for j in range(n):
-            if i != j:
-                dist_car[i][j] = osrm_distance(locations[i], locations[j], ROUTE_METHOD.CAR)
-                dist_bike[i][j] = osrm_distance(locations[i], locations[j], ROUTE_METHOD.BIKE)
-    return dist_car, dist_bike
-
-def route_cost(route, dist):
-    total = 0
-    for i in range(len(route) - 1):
-        total += dist[route[i]][route[i+1]]
-    total += dist[route[-1]][route[0]]
-    return total
-
-
-# TABU SEARCH
-from algorithms.TabuSearch import solve_tabu_search
-# SIMULATED ANNEALING
-from algorithms.simulatedAnnealing import simulated_annealing
-# GENETIC ALGORITHM
-from algorithms.GeneticAlgorithm import genetic_algorithm
 
 # ==================================================================
-# ROUTING API - TSP
+# ROUTING API - ASYNC JOBS
 # ==================================================================
-@app.route("/api/solve/<algorithm>", methods=["POST"])
-def solve(algorithm):
+@app.post("/api/jobs/<algorithm>")
+def submit_job(algorithm):
     data = request.json
 
     if "locations" not in data:
         return jsonify({"error": "No valid input data"}), 400
 
-    # Global input
-    locations = data["locations"]
-    params = data["params"]
+    try:
+        job = job_manager.submit(algorithm, data["locations"], data["params"])
+    except SolveError as e:
+        return jsonify(e.payload), e.status
+
+    return jsonify(job.snapshot()), 202
+
+@app.get("/api/jobs/<job_id>")
+def get_job(job_id):
+    job = job_manager.get(job_id)
+    if job is None:
+        return jsonify({"error": f"Job '{job_id}' not found"}), 404
+
+    since = request.args.get("since", type=int)
+    return jsonify(job.snapshot(since))
+
+@app.get("/api/jobs/<job_id>/events")
+def job_events(job_id):
+    job = job_manager.get(job_id)
+    if job is None:
+        return jsonify({"error": f"Job '{job_id}' not found"}), 404
+
+    # reconnect EventSource: lanjut setelah titik terakhir yang diterima
+    cursor = int(request.headers.get("Last-Event-ID", -1)) + 1
+    return Response(
+        job.stream(cursor),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@app.post("/api/jobs/<job_id>/cancel")
+def cancel_job(job_id):
+    job = job_manager.cancel(job_id)
+    if job is None:
+        return jsonify({"error": f"Job '{job_id}' not found"}), 404
+    return jsonify(job.snapshot())
+
+@app.get("/api/jobs/<job_id>/result")
+def get_job_result(job_id):
+    job = job_manager.get(job_id)
+    if job is None:
+        return jsonify({"error": f"Job '{job_id}' not found"}), 404
+
+    if job.status == DONE:
+        return jsonify(job.result)
+    if job.status == FAILED:
+        return jsonify(job.error), job.error_status
+    if job.status == CANCELLED:
+        return jsonify({"error": "Job cancelled"}), 409
+    # belum selesai
+    return jsonify(job.snapshot()), 202
 
-    # Bangun matriks jarak
-    dist_car, dist_bike = build_distance_matrix(locations)
 
-    # Bangun demands
-    demands = [0] + [loc.get("demand", 0) for loc in locations[1:]]
-    vehicles = params.get("vehicles", [])
-    
-    car_count = 0
-    bike_count = 0
-    car_capacity = 0
-    bike_capacity = 0
-    
-    for v in vehicles:
-        if v["type"].lower() in ["mobil", "car"]:
-            car_count = v["count"]
-            car_capacity = v["capacity"]
-
-        elif v["type"].lower() in ["motor", "bike"]:
-            bike_count = v["count"]
-            bike_capacity = v["capacity"]
-
-    # ============================
-    # ALGORITHM: TABU SEARCH
-    # ============================
-    if algorithm == "tabu-search":
-        max_iter = params.get("maxIterations", 500)
-
-        best_routes, best_cost, history, vehicle_list = solve_tabu_search(
-            dist_car,
-            dist_bike,
-            demands,
-            vehicles,
-            max_iter
-        )
-
-        vehicle_routes = []
-        vehicle_paths = []
-        vehicle_types = []
-
-        for idx, route in enumerate(best_routes):
-            if idx < len(vehicle_list):
-                vtype = vehicle_list[idx]["type"]
-            else:
-                vtype = "unknown"
-
-            vehicle_types.append(vtype)
-
-            full_route = [0] + route + [0]
-            route_locations = [locations[i] for i in full_route]
-            vehicle_routes.append(route_locations)
-
-            method = ROUTE_METHOD.BIKE if vtype.lower() == "motor" else ROUTE_METHOD.CAR
-
-            path = []
-            for i in range(len(full_route) - 1):
-                p1 = locations[full_route[i]]
-                p2 = locations[full_route[i + 1]]
-                path.extend(osrm_route_path(p1, p2, method))
-
-            vehicle_paths.append(path)
-
-        return jsonify({
-            "algorithm": "tabu-search",
-            "vehicleRoutes": vehicle_routes,
-            "vehiclePaths": vehicle_paths,
-            "vehicleTypes": vehicle_types,
-            "finalCost": best_cost,
-            "history": history,
-            "totalVehicles": len(vehicle_routes)
-        })
-
-    # ============================
-    # ALGORITHM: SIMULATED ANNEALING
-    # ============================
-    elif algorithm == "simulated-annealing":
-
-        max_iter = params.get("maxIterations", 500)
-        initial_temp = params.get("initialTemp", 1000)
-        cooling_rate = params.get("coolingRate", 0.995)
-
-        print(f"SA Parameters: maxIter={max_iter}, temp={initial_temp}, cooling={cooling_rate}")
-
-        best_routes, best_cost, history, vehicle_list = simulated_annealing(
-            dist_car,
-            dist_bike,
-            demands,
-            vehicles,
-            max_iter,
-            initial_temp,
-            cooling_rate
-        )
-
-        vehicle_routes = []
-        vehicle_paths = []
-        vehicle_types = []
-
-        for idx, route in enumerate(best_routes):
-            if not route:
-                continue
-
-            vtype = vehicle_list[idx]["type"]
-            vehicle_types.append(vtype)
-
-            # Tambahkan depot di awal, dan handle depot markers (0) di tengah
-            route_with_depots = [0]  # Start from depot
-            
-            for customer in route:
-                if customer == 0:
-                    # Marker untuk kembali ke depot dan mulai trip baru
-                    route_with_depots.append(0)  # Kembali ke depot
-                    route_with_depots.append(0)  # Mulai dari depot lagi
-                else:
-                    route_with_depots.append(customer)
-            
-            route_with_depots.append(0)  # End at depot
-            
-            # Convert ke locations
-            route_locations = [locations[i] for i in route_with_depots]
-            vehicle_routes.append(route_locations)
-
-            # Generate path untuk visualisasi
-            method = ROUTE_METHOD.BIKE if vtype.lower() == "motor" else ROUTE_METHOD.CAR
-
-            path = []
-            for i in range(len(route_with_depots) - 1):
-                p1 = locations[route_with_depots[i]]
-                p2 = locations[route_with_depots[i + 1]]
-                path.extend(osrm_route_path(p1, p2, method))
-
-            vehicle_paths.append(path)
-
-        return jsonify({
-            "algorithm": "simulated-annealing",
-            "vehicleRoutes": vehicle_routes,
-            "vehiclePaths": vehicle_paths,
-            "vehicleTypes": vehicle_types,
-            "finalCost": best_cost,
-            "history": history,
-            "totalVehicles": len(vehicle_routes),
-            "parameters": {
-                "initialTemp": initial_temp,
-                "coolingRate": cooling_rate,
-                "maxIterations": max_iter
-            }
-        })
-    
-    # elif algorithm == "simulated-annealing":
-        max_iter = params.get("maxIterations", 500)
-        initial_temp = params.get("initialTemp", 1000)
-        cooling_rate = params.get("coolingRate", 0.995)
-
-        print(f"SA Parameters: maxIter={max_iter}, temp={initial_temp}, cooling={cooling_rate}")
-
-        best_routes, best_cost, history, vehicle_list = simulated_annealing(
-            dist_car,
-            dist_bike,
-            demands,
-            vehicles,
-            max_iter,
-            initial_temp,
-            cooling_rate
-        )
-
-        vehicle_routes = []
-        vehicle_paths = []
-        vehicle_types = []
-
-        for idx, route in enumerate(best_routes):
-            if not route:
-                continue
-
-            vtype = vehicle_list[idx]["type"]
-            vehicle_types.append(vtype)
-
-            # ✅ Handle depot markers dengan benar
-            route_with_depots = [0]  # Start from depot
-            
-            for customer in route:
-                if customer == 0:
-                    # Marker: kembali ke depot dan mulai trip baru
-                    route_with_depots.append(0)  # Kembali ke depot (end trip)
-                    # Tidak perlu append 0 lagi karena trip baru akan otomatis dari depot
-                else:
-                    route_with_depots.append(customer)
-            
-            route_with_depots.append(0)  # End at depot
-            
-            # Convert ke locations
-            route_locations = [locations[i] for i in route_with_depots]
-            vehicle_routes.append(route_locations)
-
-            # Generate path
-            method = ROUTE_METHOD.BIKE if vtype.lower() == "motor" else ROUTE_METHOD.CAR
-
-            path = []
-            for i in range(len(route_with_depots) - 1):
-                p1 = locations[route_with_depots[i]]
-                p2 = locations[route_with_depots[i + 1]]
-                path.extend(osrm_route_path(p1, p2, method))
-
-            vehicle_paths.append(path)
-
-        return jsonify({
-            "algorithm": "simulated-annealing",
-            "vehicleRoutes": vehicle_routes,
-            "vehiclePaths": vehicle_paths,
-            "vehicleTypes": vehicle_types,
-            "finalCost": best_cost,
-            "history": history,
-            "totalVehicles": len(vehicle_routes),
-            "parameters": {
-                "initialTemp": initial_temp,
-                "coolingRate": cooling_rate,
-                "maxIterations": max_iter
-            }
-        })
-    
-    # ============================
-    # ALGORITHM: GENETIC
-    # ============================
-    elif algorithm == "genetic":
-                vehicles = params.get("vehicles", [])
-                car_count = 0
-                bike_count = 0
-                car_capacity = 100  # default capacity
-                bike_capacity = 50   # default capacity
-
-                for vehicle in vehicles:
-                    vtype = vehicle.get("type", "").lower()
-                    count = vehicle.get("count", 1)
-                    cap = vehicle.get("capacity", 0)
-
-                    if vtype in ["car", "mobil"]:
-                        car_count = count
-                        if cap > 0:
-                            car_capacity = cap
-                    elif vtype in ["bike", "motor", "motorcycle"]:
-                        bike_count = count
-                        if cap > 0:
-                            bike_capacity = cap
-
-                # default value
-                if car_count == 0 and bike_count == 0:
-                    car_count = 2
-                    bike_count = 1
-
-                demands = [0] + [loc.get("demand", 0) for loc in locations[1:]]
-
-                routes_with_types, cost, history = genetic_algorithm(
-                    dist_car,
-                    dist_bike,
-                    params.get("populationSize", 50),
-                    params.get("generations", 100),
-                    params.get("mutationRate", 0.05),
-                    car_count,
-                    bike_count,
-                    car_capacity,    
-                    bike_capacity,   
-                    demands
-                )
-
-                vehicle_routes = []
-                vehicle_paths = []
-                vehicle_types = []
-                
-                for route_info in routes_with_types:
-                    route = route_info["route"]
-                    vtype = route_info["type"]
-                    vehicle_types.append(vtype)
-
-                    route_locations = [locations[i] for i in route]
-                    vehicle_routes.append(route_locations)
-
-                    method = ROUTE_METHOD.BIKE if vtype.lower() == "bike" else ROUTE_METHOD.CAR
-            
-                    path = []
-                    for i in range(len(route) - 1):
-                        p1 = locations[route[i]]
-                        p2 = locations[route[i + 1]]
-                        path.extend(osrm_route_path(p1, p2, method))
-
-                    vehicle_paths.append(path)
-                
-                return jsonify({
-                    "algorithm": "genetic",
-                    "vehicleRoutes": vehicle_routes,
-                    "vehiclePaths": vehicle_paths,
-                    "vehicleTypes": vehicle_types,
-                    "finalCost": cost,
-                    "history": history,
-                    "totalVehicles": len(routes_with_types)
-                })
-    # ============================
-    # WRONG ALGORITHM
-    # ============================
-    else:
-        return jsonify({"error": "Algorithm Not Found"}), 400
+# ==================================================================
+# ROUTING API - BULK (NDJSON, satu baris per skenario)
+# ==================================================================
+@app.post("/api/bulk/solve/<algorithm>")
+def bulk_solve(algorithm):
+    # baris pertama (lokasi bersama) dibaca & matriks dibangun sebelum
+    # response mulai, skenario dibaca bertahap selama streaming
+    try:
+        header = json.loads(request.stream.readline() or "null")
+    except ValueError:
+        return jsonify({"error": "No valid input data"}), 400
+
+    try:
+        bulk = BulkSolve(algorithm, header)
+    except SolveError as e:
+        return jsonify(e.payload), e.status
+
+    return Response(
+        stream_with_context(bulk.stream(request.stream)),
+        mimetype=NDJSON,
+        headers={"X-Accel-Buffering": "no"}
+    )
+
+
+# ==================================================================
+# ROUTING API - DISPATCH (order baru saat rute sudah berjalan)
+# ==================================================================
+@app.post("/api/dispatch/insert")
+def dispatch_insert():
+    data = request.json
+
+    if not data or "order" not in data:
+        return jsonify({"error": "No valid input data"}), 400
+
+    params = data.get("params", {})
+    try:
+        result = insert_order(data.get("locations"), data.get("routes"), data["order"], params)
+    except SolveError as e:
+        return jsonify(e.payload), e.status
+
+    diagnostics = result.pop("diagnostics")
+    if params.get("diagnostics"):
+        result["diagnostics"] = diagnostics
+    return jsonify(result)
 
     
 @app.get("/api/locations")
@@ -410,6 +196,10 @@ def add_location():
 
     return jsonify({"message": "Location added", "locations": data})
 
+@app.get("/api/cache/stats")
+def get_cache_stats():
+    return jsonify(route_cache.stats)
+
 @app.post("/api/locations/delete")
 def delete_location():
     loc_to_be_deleted = request.json
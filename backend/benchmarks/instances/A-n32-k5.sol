@@ -0,0 +1,6 @@
+Route #1: 21 31 19 17 13 7 26
+Route #2: 12 1 16 30
+Route #3: 27 24
+Route #4: 29 18 8 9 22 15 10 25 5 20
+Route #5: 14 28 11 4 23 3 2 6
+Cost 784
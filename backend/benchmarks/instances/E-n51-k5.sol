@@ -0,0 +1,6 @@
+Route #1: 27 48 23 7 43 24 25 14 6
+Route #2: 46 32 1 22 20 35 36 3 28 31 26 8
+Route #3: 18 13 41 40 19 42 4 47
+Route #4: 11 2 29 21 16 50 34 30 9 38
+Route #5: 12 17 37 44 15 45 33 39 10 49 5
+Cost 521
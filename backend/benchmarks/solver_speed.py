@@ -0,0 +1,124 @@
+"""
+Benchmark kecepatan solver (iterasi per detik) pada instance sintetis.
+
+    cd backend
+    python benchmarks/solver_speed.py --algorithm tabu-search --sizes 100 200 300
+    python benchmarks/solver_speed.py --algorithm simulated-annealing --iterations 2000
+    python benchmarks/solver_speed.py --algorithm tabu-search-granular --initial savings
+    python benchmarks/solver_speed.py --algorithm genetic-array --population 500 --iterations 50
+    python benchmarks/solver_speed.py --algorithm genetic-split --population 200 --iterations 50
+
+Untuk GA, iterasi = generasi.
+"""
+import argparse
+import random
+import time
+import sys
+import os
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from algorithms.TabuSearch import solve_tabu_search
+from algorithms.simulatedAnnealing import simulated_annealing
+from algorithms.GeneticAlgorithm import genetic_algorithm
+from algorithms.savings import INITIAL_SOLUTIONS
+
+
+def synthetic_instance(n_customers, seed=0):
+    """Customer acak di bidang 10 km x 10 km, depot di tengah, armada mobil + motor."""
+    rng = np.random.default_rng(seed)
+    coords = rng.random((n_customers + 1, 2)) * 10000
+    coords[0] = 5000
+
+    dist_car = np.sqrt(((coords[:, None, :] - coords[None, :, :]) ** 2).sum(axis=2))
+    dist_bike = dist_car * 0.9
+    demands = [0] + [int(d) for d in rng.integers(5, 30, n_customers)]
+
+    total = sum(demands)
+    vehicles = [
+        {"type": "Mobil", "count": 6, "capacity": int(total / 8)},
+        {"type": "Motor", "count": 6, "capacity": int(total / 12)},
+    ]
+    return dist_car, dist_bike, demands, vehicles
+
+
+def run_tabu(instance, args):
+    dist_car, dist_bike, demands, vehicles = instance
+    _, cost, _, _ = solve_tabu_search(
+        dist_car, dist_bike, demands, vehicles, args.iterations, initial=args.initial
+    )
+    return cost
+
+
+def run_tabu_granular(instance, args):
+    dist_car, dist_bike, demands, vehicles = instance
+    _, cost, _, _ = solve_tabu_search(
+        dist_car, dist_bike, demands, vehicles, args.iterations, neighborhood="granular",
+        initial=args.initial
+    )
+    return cost
+
+
+def run_annealing(instance, args):
+    dist_car, dist_bike, demands, vehicles = instance
+    _, cost, _, _ = simulated_annealing(
+        dist_car, dist_bike, demands, vehicles, args.iterations, 1000, 0.995, initial=args.initial
+    )
+    return cost
+
+
+def run_genetic(instance, args, encoding="list", decode="greedy"):
+    dist_car, dist_bike, demands, vehicles = instance
+    car, bike = vehicles
+    _, cost, _, _ = genetic_algorithm(
+        dist_car, dist_bike, args.population, args.iterations, 0.05,
+        car["count"], bike["count"], car["capacity"], bike["capacity"], demands,
+        encoding=encoding, decode=decode
+    )
+    return cost
+
+
+def run_genetic_array(instance, args):
+    return run_genetic(instance, args, encoding="array")
+
+
+def run_genetic_split(instance, args):
+    return run_genetic(instance, args, encoding="array", decode="split")
+
+
+ALGORITHMS = {
+    "tabu-search": run_tabu,
+    "tabu-search-granular": run_tabu_granular,
+    "simulated-annealing": run_annealing,
+    "genetic": run_genetic,
+    "genetic-array": run_genetic_array,
+    "genetic-split": run_genetic_split,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--algorithm", choices=sorted(ALGORITHMS), default="tabu-search")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 200, 300])
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--population", type=int, default=500, help="populationSize untuk GA")
+    parser.add_argument("--initial", choices=INITIAL_SOLUTIONS, default="default",
+                        help="initial solution tabu / SA")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    run = ALGORITHMS[args.algorithm]
+    print(f"{'n':>6} {'seconds':>9} {'iter/s':>10} {'cost':>14}")
+    for n in args.sizes:
+        instance = synthetic_instance(n, args.seed)
+        random.seed(args.seed)
+        started = time.perf_counter()
+        cost = run(instance, args)
+        elapsed = time.perf_counter() - started
+        print(f"{n:>6} {elapsed:>9.3f} {args.iterations / elapsed:>10.1f} {cost:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
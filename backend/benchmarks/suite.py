@@ -0,0 +1,256 @@
+"""
+Benchmark suite deterministik: setiap (instance, algoritma, seed) dijalankan
+lewat entry point solver yang sama dengan API (solving.runners.RUNNERS),
+masing-masing di proses baru, lalu dicatat wall time, iterasi per detik,
+peak RSS, cost, gap ke best-known dan feasibility. Hasil dibandingkan dengan
+baseline yang disimpan (benchmarks/baseline.json) supaya regresi kelihatan
+saat review.
+
+    cd backend
+    python benchmarks/suite.py                       # semua, bandingkan dengan baseline
+    python benchmarks/suite.py --instances A-n32-k5 synthetic-n300 --seeds 0 1 2
+    python benchmarks/suite.py --algorithms tabu-search genetic-split
+    python benchmarks/suite.py --output /tmp/bench.json
+    python benchmarks/suite.py --update-baseline     # simpan hasil sebagai baseline baru
+
+Exit code 1 kalau ada regresi terhadap baseline.
+
+Instance CVRPLIB di benchmarks/instances (format .vrp, + .sol untuk cek data);
+file .vrp lain (mis. subset Uchoa X) cukup ditaruh di direktori itu.
+Cost dengan seed tetap deterministik, jadi toleransi cost default 0; waktu dan
+RSS tergantung mesin, jadi baseline sebaiknya dibuat di mesin yang sama.
+"""
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing
+import argparse
+import platform
+import random
+import json
+import time
+import sys
+import os
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from algorithms.core import is_bike_type
+from solving.runners import RUNNERS
+from vrplib import load_instance, vendored_names
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+DEFAULT_SYNTHETIC = ["synthetic-n100", "synthetic-n200"]
+# selisih waktu di bawah ini dianggap noise (run pendek)
+MIN_TIME_DELTA = 0.05
+
+# nama -> (runner, params, key jumlah iterasi di params)
+VARIANTS = {
+    "tabu-search": ("tabu-search", {"maxIterations": 300}, "maxIterations"),
+    "tabu-search-granular": (
+        "tabu-search", {"maxIterations": 300, "neighborhood": "granular"}, "maxIterations"
+    ),
+    "simulated-annealing": ("simulated-annealing", {"maxIterations": 2000}, "maxIterations"),
+    "genetic": ("genetic", {"generations": 100, "populationSize": 50}, "generations"),
+    "genetic-array": (
+        "genetic", {"generations": 100, "populationSize": 200, "encoding": "array"}, "generations"
+    ),
+    "genetic-split": (
+        "genetic", {"generations": 30, "populationSize": 100, "decode": "split"}, "generations"
+    ),
+    "genetic-memetic": (
+        "genetic", {"generations": 100, "populationSize": 50, "localSearch": 1}, "generations"
+    ),
+}
+
+
+def peak_rss_mb():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux: KiB, macOS: byte
+    return round(peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024, 1)
+
+
+def check_feasible(full_routes, vehicle_types, demands, vehicles):
+    """Semua customer terlayani sekali, load <= kapasitas, jumlah rute <= armada."""
+    capacity = {}
+    count = {}
+    for v in vehicles:
+        bike = is_bike_type(v["type"])
+        capacity[bike] = v["capacity"]
+        count[bike] = count.get(bike, 0) + v["count"]
+
+    used = {}
+    served = []
+    for route, vtype in zip(full_routes, vehicle_types):
+        customers = [c for c in route if c != 0]
+        if not customers:
+            continue
+        bike = is_bike_type(vtype)
+        used[bike] = used.get(bike, 0) + 1
+        if bike not in capacity or sum(demands[c] for c in customers) > capacity[bike]:
+            return False
+        served += customers
+    if sorted(served) != list(range(1, len(demands))):
+        return False
+    return all(used[b] <= count[b] for b in used)
+
+
+def run_case(instance_name, variant, seed):
+    """Satu run (dipanggil di proses baru). Return dict hasil."""
+    instance = load_instance(instance_name)
+    algorithm, params, iteration_key = VARIANTS[variant]
+    params = dict(params, vehicles=instance.vehicles)
+
+    random.seed(seed)
+    np.random.seed(seed)
+    started = time.perf_counter()
+    full_routes, _, result = RUNNERS[algorithm](
+        instance.dist_car, instance.dist_bike, instance.demands, params
+    )
+    seconds = time.perf_counter() - started
+
+    cost = float(result["finalCost"])
+    iterations = params[iteration_key]
+    return {
+        "instance": instance_name,
+        "algorithm": variant,
+        "seed": seed,
+        "n": instance.size,
+        "seconds": round(seconds, 4),
+        "iterations": iterations,
+        "iterPerSec": round(iterations / seconds, 2) if seconds > 0 else None,
+        "peakRssMb": peak_rss_mb(),
+        "cost": round(cost, 4),
+        "bks": instance.bks,
+        "gap": round(100 * (cost - instance.bks) / instance.bks, 3) if instance.bks else None,
+        "feasible": check_feasible(full_routes, result["vehicleTypes"], instance.demands, instance.vehicles),
+    }
+
+
+def run_suite(cases, isolate=True):
+    if not isolate:
+        return [run_case(*case) for case in cases]
+    # satu proses baru per run: peak RSS per run, tidak ada cache / state
+    # yang terbawa dari run sebelumnya
+    context = multiprocessing.get_context("spawn")
+    results = []
+    for case in cases:
+        with ProcessPoolExecutor(1, mp_context=context) as pool:
+            results.append(pool.submit(run_case, *case).result())
+        print_result(results[-1])
+    return results
+
+
+def print_result(r):
+    gap = "" if r["gap"] is None else f"{r['gap']:7.2f}%"
+    rss = "" if r["peakRssMb"] is None else f"{r['peakRssMb']:7.1f}MB"
+    print(f"{r['instance']:18} {r['algorithm']:22} seed={r['seed']:<3} {r['seconds']:8.3f}s "
+          f"{r['iterPerSec']:10.1f} it/s {rss:>9} cost={r['cost']:<14.2f} {gap:>8} "
+          f"{'' if r['feasible'] else 'INFEASIBLE'}")
+
+
+def case_key(r):
+    return r["instance"], r["algorithm"], r["seed"]
+
+
+def compare(results, baseline, time_tolerance, cost_tolerance, rss_tolerance):
+    """Return list (key, pesan) regresi terhadap baseline."""
+    base = {case_key(r): r for r in baseline["results"]}
+    regressions = []
+    for r in results:
+        old = base.get(case_key(r))
+        if old is None:
+            continue
+        key = "/".join(map(str, case_key(r)))
+        if r["cost"] > old["cost"] * (1 + cost_tolerance) + 1e-6:
+            regressions.append((key, f"cost {old['cost']} -> {r['cost']}"))
+        slower = r["seconds"] - old["seconds"]
+        if r["seconds"] > old["seconds"] * (1 + time_tolerance) and slower > MIN_TIME_DELTA:
+            regressions.append((key, f"time {old['seconds']}s -> {r['seconds']}s"))
+        if r["peakRssMb"] and old.get("peakRssMb") and r["peakRssMb"] > old["peakRssMb"] * (1 + rss_tolerance):
+            regressions.append((key, f"peak RSS {old['peakRssMb']:.1f}MB -> {r['peakRssMb']:.1f}MB"))
+        if old["feasible"] and not r["feasible"]:
+            regressions.append((key, "solution no longer feasible"))
+    return regressions
+
+
+def environment():
+    return {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__.split("\n\n")[0], formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--instances", nargs="+", default=None,
+                        help="nama instance (default: semua yang di-vendor + " + " ".join(DEFAULT_SYNTHETIC) + ")")
+    parser.add_argument("--algorithms", nargs="+", default=list(VARIANTS), choices=list(VARIANTS))
+    parser.add_argument("--seeds", nargs="+", type=int, default=[0])
+    parser.add_argument("--output", help="tulis hasil ke file JSON ini")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--update-baseline", action="store_true", help="simpan hasil sebagai baseline")
+    parser.add_argument("--time-tolerance", type=float, default=0.5, help="regresi kalau waktu > baseline * (1 + t)")
+    parser.add_argument("--cost-tolerance", type=float, default=0.0)
+    parser.add_argument("--rss-tolerance", type=float, default=0.2)
+    parser.add_argument("--in-process", action="store_true",
+                        help="jalankan semua run di proses ini (lebih cepat, peak RSS kumulatif)")
+    args = parser.parse_args()
+
+    instances = args.instances or vendored_names() + DEFAULT_SYNTHETIC
+    cases = [(i, a, s) for i in instances for a in args.algorithms for s in args.seeds]
+    for name in instances:
+        # nama salah / data .sol tidak cocok -> gagal sebelum mulai
+        try:
+            load_instance(name)
+        except (ValueError, OSError) as e:
+            parser.error(str(e))
+
+    results = run_suite(cases, isolate=not args.in_process)
+    if args.in_process:
+        for r in results:
+            print_result(r)
+
+    report = {"environment": environment(), "results": results}
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=1)
+
+    if args.update_baseline:
+        # run lain di baseline lama (instance / algoritma / seed berbeda) tetap disimpan
+        old = []
+        if os.path.exists(args.baseline):
+            with open(args.baseline) as f:
+                old = json.load(f)["results"]
+        keys = {case_key(r) for r in results}
+        report["results"] = [r for r in old if case_key(r) not in keys] + results
+        with open(args.baseline, "w") as f:
+            json.dump(report, f, indent=1)
+        print(f"baseline written to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        return 0
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    regressions = compare(results, baseline, args.time_tolerance, args.cost_tolerance, args.rss_tolerance)
+    if baseline.get("environment") != report["environment"]:
+        print("note: baseline was recorded on a different environment; time / RSS may not be comparable")
+    for key, message in regressions:
+        print(f"REGRESSION {key}: {message}")
+    print(f"{len(regressions)} regression(s) against {args.baseline}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,99 @@
+"""
+Loader instance benchmark: file CVRPLIB (format TSPLIB .vrp, + .sol kalau ada)
+di benchmarks/instances, dan instance sintetis armada mobil + motor.
+
+Nama instance:
+    A-n32-k5            file benchmarks/instances/A-n32-k5.vrp
+    synthetic-n200      synthetic_instance(200), seed 0
+    synthetic-n200-s3   synthetic_instance(200, seed=3)
+
+Instance CVRPLIB homogen: armada k mobil (k dari "-k5" di nama) berkapasitas
+CAPACITY, matriks motor = matriks mobil, jarak EUC_2D dibulatkan (nint) seperti
+di CVRPLIB, jadi cost bisa langsung dibandingkan dengan best-known.
+"""
+import glob
+import os
+import re
+
+from solver_speed import synthetic_instance
+from solving.instances import parse_vrp, euc_2d, best_known, cvrplib_vehicles
+
+INSTANCE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "instances")
+
+
+class Instance:
+    def __init__(self, name, dist_car, dist_bike, demands, vehicles, bks=None, source="synthetic"):
+        self.name = name
+        self.dist_car = dist_car
+        self.dist_bike = dist_bike
+        self.demands = demands
+        self.vehicles = vehicles
+        # best-known solution value (None untuk instance sintetis)
+        self.bks = bks
+        self.source = source
+
+    @property
+    def size(self):
+        return len(self.demands) - 1
+
+
+def vendored_names():
+    return sorted(os.path.splitext(os.path.basename(p))[0]
+                  for p in glob.glob(os.path.join(INSTANCE_DIR, "*.vrp")))
+
+
+def read_solution(path):
+    """File .sol CVRPLIB -> (rute dengan index customer 1..n-1, cost)."""
+    routes = []
+    cost = None
+    with open(path) as f:
+        for line in f:
+            if line.startswith("Route"):
+                routes.append([int(c) for c in line.split(":", 1)[1].split()])
+            elif line.startswith("Cost"):
+                cost = float(line.split()[1])
+    return routes, cost
+
+
+def check_solution(instance, path):
+    """
+    Cek data instance dengan solusi best-known yang di-vendor: cost harus sama
+    persis dan semua rute muat. Raise ValueError kalau tidak.
+    """
+    routes, cost = read_solution(path)
+    capacity = instance.vehicles[0]["capacity"]
+    total = 0.0
+    for route in routes:
+        path_nodes = [0] + route + [0]
+        total += sum(instance.dist_car[a, b] for a, b in zip(path_nodes, path_nodes[1:]))
+        if sum(instance.demands[c] for c in route) > capacity:
+            raise ValueError(f"{instance.name}: solution route over capacity")
+    served = sorted(c for r in routes for c in r)
+    if served != list(range(1, len(instance.demands))) or total != cost:
+        raise ValueError(f"{instance.name}: solution cost {total} != {cost}")
+
+
+def load_vrp(name):
+    path = os.path.join(INSTANCE_DIR, name + ".vrp")
+    with open(path) as f:
+        header, coords, demands = parse_vrp(f.read())
+
+    dist = euc_2d(coords)
+    vehicles = cvrplib_vehicles(name, header, demands)
+    instance = Instance(name, dist, dist, demands, vehicles, best_known(header), source="cvrplib")
+
+    solution = os.path.join(INSTANCE_DIR, name + ".sol")
+    if os.path.exists(solution):
+        check_solution(instance, solution)
+    return instance
+
+
+def load_instance(name):
+    match = re.fullmatch(r"synthetic-n(\d+)(?:-s(\d+))?", name)
+    if match:
+        n, seed = int(match.group(1)), int(match.group(2) or 0)
+        dist_car, dist_bike, demands, vehicles = synthetic_instance(n, seed)
+        return Instance(name, dist_car, dist_bike, demands, vehicles)
+    if name in vendored_names():
+        return load_vrp(name)
+    raise ValueError(f"Unknown instance '{name}' (not in {INSTANCE_DIR})")
@@ -0,0 +1,228 @@
+"""
+Batch solve dari command line, tanpa Flask / web stack: untuk cron job dan
+profiling solver secara terisolasi.
+
+    cd backend
+    python cli.py data/locations.json --vehicles data/vehicles.json --time-budget 5
+    python cli.py benchmarks/instances/*.vrp --algorithm genetic --seed 0 1 2 --workers 3
+    python cli.py orders.csv --vehicles data/vehicles.json --set maxIterations=2000 --set neighborhood=granular
+    python -m cProfile -s cumtime cli.py benchmarks/instances/A-n32-k5.vrp --output /tmp/run
+
+Format instance: lihat solving/instances.py (.json, .csv, .vrp).
+Per run ditulis <output>/<instance>.<algorithm>.s<seed>.json (hasil, format
+response /api/solve tanpa path visualisasi) dan satu baris di
+<output>/metrics.jsonl (durasi per fase, cost, gap ke best-known, counter
+solver, peak RSS). Exit code 1 kalau ada run yang gagal.
+
+--workers = jumlah run (instance x seed) yang jalan paralel di proses
+terpisah; 1 = semua di proses ini (cocok untuk profiler). Backend jarak
+default: euclidean untuk lokasi x/y, haversine untuk lat/lng; osrm memuat
+client HTTP (requests) hanya kalau dipilih.
+"""
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import multiprocessing
+import argparse
+import random
+import json
+import time
+import sys
+import os
+
+import numpy as np
+
+from routing import estimate
+from solving.instances import read_instance
+from solving.portfolio import run_portfolio
+from solving.runners import RUNNERS
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+SOLVERS = dict(RUNNERS, portfolio=run_portfolio)
+DISTANCE_BACKENDS = ("haversine", "euclidean", "osrm")
+
+
+def peak_rss_mb():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux: KiB, macOS: byte
+    return round(peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024, 1)
+
+
+def parse_value(text):
+    # --set key=value: value JSON kalau bisa (angka, bool, list), selain itu string
+    try:
+        return json.loads(text)
+    except ValueError:
+        return text
+
+
+def build_matrix(instance, backend):
+    if instance.matrices is not None:
+        return instance.matrices
+    if backend == "osrm":
+        # import di sini: routing.matrix memuat client OSRM (requests)
+        from routing.matrix import build_distance_matrix
+        return build_distance_matrix(instance.locations, backend)
+    if backend == "euclidean":
+        return estimate.build_euclidean_matrix(instance.locations)
+    return estimate.build_estimated_matrix(instance.locations)
+
+
+def run_one(path, algorithm, seed, overrides, backend=None):
+    """Satu run (instance x seed). Return (baris metrik, hasil)."""
+    phases = {}
+    started = time.perf_counter()
+    instance = read_instance(path)
+    phases["load"] = time.perf_counter() - started
+
+    params = dict(instance.params, **overrides)
+    if not params.get("vehicles"):
+        raise ValueError(f"{path}: no vehicles (use --vehicles or params.vehicles in the file)")
+    if instance.matrices is not None:
+        backend = "cvrplib"
+    else:
+        default = "haversine" if "lat" in instance.locations[0] else "euclidean"
+        backend = backend or params.get("distanceBackend", default)
+        if backend not in DISTANCE_BACKENDS:
+            raise ValueError(f"Unsupported distance backend '{backend}' (use {', '.join(DISTANCE_BACKENDS)})")
+
+    started = time.perf_counter()
+    dist_car, dist_bike = build_matrix(instance, backend)
+    phases["matrix"] = time.perf_counter() - started
+
+    random.seed(seed)
+    np.random.seed(seed % 2 ** 32)
+    params.setdefault("seed", seed)
+    started = time.perf_counter()
+    full_routes, _, result = SOLVERS[algorithm](dist_car, dist_bike, instance.demands, params)
+    phases["solve"] = time.perf_counter() - started
+
+    cost = float(result["finalCost"])
+    result["finalCost"] = cost
+    result["vehicleRoutes"] = [[instance.locations[i] for i in r] for r in full_routes]
+    result["totalVehicles"] = len(full_routes)
+    result["distanceBackend"] = backend
+    row = {
+        "instance": instance.name,
+        "file": path,
+        "algorithm": algorithm,
+        "seed": seed,
+        "n": instance.size,
+        "cost": round(cost, 4),
+        "bks": instance.bks,
+        "gap": round(100 * (cost - instance.bks) / instance.bks, 3) if instance.bks else None,
+        "stopReason": result.get("stopReason"),
+        "phases": {name: round(seconds, 6) for name, seconds in phases.items()},
+        "solver": result.pop("solverStats", None),
+        "peakRssMb": peak_rss_mb(),
+    }
+    return row, result
+
+
+def write_run(output, row, result):
+    name = f"{row['instance']}.{row['algorithm']}.s{row['seed']}.json"
+    with open(os.path.join(output, name), "w") as f:
+        json.dump(result, f, indent=1)
+    with open(os.path.join(output, "metrics.jsonl"), "a") as f:
+        f.write(json.dumps(row) + "\n")
+
+
+def print_row(row):
+    if "error" in row:
+        print(f"{row['instance']:18} {row['algorithm']:20} seed={row['seed']:<3} FAILED: {row['error']}")
+        return
+    gap = "" if row["gap"] is None else f"{row['gap']:7.2f}%"
+    print(f"{row['instance']:18} {row['algorithm']:20} seed={row['seed']:<3} "
+          f"{row['phases']['solve']:8.3f}s cost={row['cost']:<14.2f} {gap:>8} {row['stopReason']}")
+
+
+def run_batch(runs, workers, output):
+    """Jalankan semua run, tulis hasil begitu selesai. Return jumlah run gagal."""
+    failed = 0
+
+    def finish(run, outcome=None, error=None):
+        nonlocal failed
+        if error is not None:
+            failed += 1
+            path, algorithm, seed = run[:3]
+            row = {"instance": os.path.splitext(os.path.basename(path))[0], "file": path,
+                   "algorithm": algorithm, "seed": seed, "error": str(error)}
+            with open(os.path.join(output, "metrics.jsonl"), "a") as f:
+                f.write(json.dumps(row) + "\n")
+        else:
+            row = outcome[0]
+            write_run(output, *outcome)
+        print_row(row)
+
+    if workers == 1:
+        for run in runs:
+            try:
+                outcome = run_one(*run)
+            except Exception as e:
+                finish(run, error=e)
+                continue
+            finish(run, outcome)
+        return failed
+
+    # "spawn": proses worker bersih, tidak mewarisi state proses ini
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(workers, mp_context=context) as pool:
+        futures = {pool.submit(run_one, *run): run for run in runs}
+        for future in as_completed(futures):
+            try:
+                outcome = future.result()
+            except Exception as e:
+                finish(futures[future], error=e)
+                continue
+            finish(futures[future], outcome)
+    return failed
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__.split("\n\n")[0], formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("instances", nargs="+", help="file instance (.json, .csv, .vrp)")
+    parser.add_argument("--algorithm", default="tabu-search", choices=list(SOLVERS))
+    parser.add_argument("--time-budget", type=float, help="budget solver per run dalam detik (params.timeBudget)")
+    parser.add_argument("--seed", nargs="+", type=int, default=[0], help="satu run per seed")
+    parser.add_argument("--workers", type=int, default=1, help="jumlah run paralel (proses)")
+    parser.add_argument("--vehicles", help="file armada (format data/vehicles.json)")
+    parser.add_argument("--distance-backend", choices=DISTANCE_BACKENDS,
+                        help="default: params file, lalu euclidean (x/y) / haversine (lat/lng)")
+    parser.add_argument("--set", action="append", default=[], metavar="KEY=VALUE",
+                        help="params solver tambahan, mis. maxIterations=2000")
+    parser.add_argument("--output", default="results", help="direktori hasil & metrics.jsonl")
+    args = parser.parse_args()
+
+    overrides = {}
+    for item in args.set:
+        key, sep, value = item.partition("=")
+        if not sep:
+            parser.error(f"--set expects KEY=VALUE, got '{item}'")
+        overrides[key] = parse_value(value)
+    if args.time_budget is not None:
+        if args.time_budget <= 0:
+            parser.error("--time-budget must be positive")
+        overrides["timeBudget"] = args.time_budget
+    if args.vehicles:
+        with open(args.vehicles) as f:
+            overrides["vehicles"] = json.load(f)
+    for path in args.instances:
+        if not os.path.isfile(path):
+            parser.error(f"instance file not found: {path}")
+
+    os.makedirs(args.output, exist_ok=True)
+    runs = [(path, args.algorithm, seed, overrides, args.distance_backend)
+            for path in args.instances for seed in args.seed]
+    failed = run_batch(runs, max(1, args.workers), args.output)
+    print(f"{len(runs) - failed}/{len(runs)} run(s) finished, results in {args.output}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
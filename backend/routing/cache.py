@@ -0,0 +1,185 @@
+import contextvars
+import threading
+import sqlite3
+import json
+import time
+import os
+
+# Lokasi file cache, default di folder data backend
+CACHE_FILE = os.environ.get(
+    "ROUTE_CACHE_FILE",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "data", "route_cache.sqlite")
+)
+CACHE_MAX_ENTRIES = int(os.environ.get("ROUTE_CACHE_MAX_ENTRIES", 500000))
+CACHE_TTL = float(os.environ.get("ROUTE_CACHE_TTL", 30 * 24 * 3600))
+# Overflow dicek setiap sekian write (bukan setiap write), jadi cache boleh
+# lewat max_entries sebanyak paling banyak interval ini per proses
+CACHE_EVICT_INTERVAL = int(os.environ.get("ROUTE_CACHE_EVICT_INTERVAL", 1000))
+# TTL untuk lookup yang gagal (disimpan sebagai null), supaya dicoba ulang nanti
+NEGATIVE_TTL = float(os.environ.get("ROUTE_CACHE_NEGATIVE_TTL", 300))
+
+# Presisi pembulatan koordinat untuk key (5 desimal ~ 1 meter)
+COORD_PRECISION = 5
+
+# Batas jumlah parameter per query sqlite
+_CHUNK = 500
+
+
+# counter stats untuk solve yang sedang berjalan saja (di-set oleh
+# solving.metrics.Diagnostics), di samping RouteCache.stats kumulatif
+request_stats = contextvars.ContextVar("route_cache_request_stats", default=None)
+
+
+def point_key(p):
+    return f"{round(p['lat'], COORD_PRECISION)},{round(p['lng'], COORD_PRECISION)}"
+
+
+def distance_key(profile, p1, p2):
+    return f"d:{profile}:{point_key(p1)}:{point_key(p2)}"
+
+
+def path_key(profile, p1, p2):
+    return f"p:{profile}:{point_key(p1)}:{point_key(p2)}"
+
+
+class RouteCache:
+    """
+    Cache persisten (sqlite) untuk jarak & geometri OSRM.
+    Setiap entry punya TTL, dan kalau jumlah entry melebihi max_entries
+    entry yang paling lama tidak diakses dibuang (LRU).
+    Aman dipakai beberapa proses sekaligus (WAL + busy timeout).
+    """
+
+    def __init__(self, path=CACHE_FILE, max_entries=CACHE_MAX_ENTRIES, ttl=CACHE_TTL):
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.evict_interval = max(1, min(CACHE_EVICT_INTERVAL, max_entries // 100))
+        self._unchecked = 0
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0, "expired": 0, "writes": 0}
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                " key TEXT PRIMARY KEY,"
+                " value TEXT NOT NULL,"
+                " expires_at REAL NOT NULL,"
+                " accessed_at REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_accessed ON entries (accessed_at)")
+            conn.commit()
+            self._local.conn = conn
+        return conn
+
+    def _count(self, name, amount=1):
+        counts = request_stats.get()
+        with self._lock:
+            self.stats[name] += amount
+            if counts is not None:
+                counts[name] += amount
+
+    def get_many(self, keys):
+        """Return dict key -> value untuk key yang ada dan belum expired."""
+        keys = list(keys)
+        if not keys:
+            return {}
+
+        conn = self._conn()
+        now = time.time()
+        found = {}
+        expired = []
+
+        for s in range(0, len(keys), _CHUNK):
+            chunk = keys[s:s + _CHUNK]
+            marks = ",".join("?" * len(chunk))
+            rows = conn.execute(
+                f"SELECT key, value, expires_at FROM entries WHERE key IN ({marks})", chunk
+            ).fetchall()
+            for key, value, expires_at in rows:
+                if expires_at < now:
+                    expired.append(key)
+                else:
+                    found[key] = json.loads(value)
+
+        with conn:
+            if found:
+                conn.executemany(
+                    "UPDATE entries SET accessed_at = ? WHERE key = ?",
+                    [(now, k) for k in found]
+                )
+            if expired:
+                conn.executemany("DELETE FROM entries WHERE key = ?", [(k,) for k in expired])
+
+        self._count("hits", len(found))
+        self._count("misses", len(keys) - len(found))
+        self._count("expired", len(expired))
+        return found
+
+    def get(self, key, default=None):
+        return self.get_many([key]).get(key, default)
+
+    def set_failed(self, keys):
+        """Negative caching: tandai key gagal selama NEGATIVE_TTL."""
+        self.set_many({k: None for k in keys}, ttl=NEGATIVE_TTL)
+
+    def set_many(self, items, ttl=None):
+        """Simpan dict key -> value (harus JSON serializable)."""
+        if not items:
+            return
+
+        conn = self._conn()
+        now = time.time()
+        expires_at = now + (self.ttl if ttl is None else ttl)
+
+        with conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO entries (key, value, expires_at, accessed_at) VALUES (?, ?, ?, ?)",
+                [(k, json.dumps(v), expires_at, now) for k, v in items.items()]
+            )
+        self._count("writes", len(items))
+        with self._lock:
+            self._unchecked += len(items)
+            due = self._unchecked >= self.evict_interval
+            if due:
+                self._unchecked = 0
+        if due:
+            self._evict(conn)
+
+    def set(self, key, value, ttl=None):
+        self.set_many({key: value}, ttl)
+
+    def _evict(self, conn):
+        # max(rowid) >= jumlah entry dan murah (ujung b-tree); COUNT(*) menscan
+        # seluruh tabel, jadi hanya dijalankan kalau rowid sudah lewat batas
+        high = conn.execute("SELECT max(rowid) FROM entries").fetchone()[0] or 0
+        if high <= self.max_entries:
+            return
+
+        total = conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+        overflow = total - self.max_entries
+        if overflow <= 0:
+            return
+
+        with conn:
+            conn.execute(
+                "DELETE FROM entries WHERE key IN"
+                " (SELECT key FROM entries ORDER BY accessed_at ASC LIMIT ?)",
+                (overflow,)
+            )
+        self._count("evictions", overflow)
+
+    def clear(self):
+        conn = self._conn()
+        with conn:
+            conn.execute("DELETE FROM entries")
+
+
+route_cache = RouteCache()
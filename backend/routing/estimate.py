@@ -0,0 +1,84 @@
+import numpy as np
+
+from routing.profiles import ROUTE_METHOD
+
+EARTH_RADIUS = 6371008.8
+
+# Faktor per profil untuk estimasi tanpa router:
+# detour = rasio jarak jalan / jarak garis lurus, speed dalam m/s
+PROFILE_FACTORS = {
+    ROUTE_METHOD.CAR: {"detour": 1.35, "speed": 30 / 3.6},
+    ROUTE_METHOD.BIKE: {"detour": 1.25, "speed": 25 / 3.6},
+}
+
+
+def _coordinates(locations, keys):
+    return np.array([[loc[keys[0]], loc[keys[1]]] for loc in locations], dtype=np.float64)
+
+
+def great_circle_matrix(locations:list, origins:list=None):
+    """
+    Matriks jarak haversine (meter), dihitung vektorisasi: n x n, atau
+    len(origins) x n (baris untuk lokasi baru saja) kalau origins diberikan.
+    """
+    coords = np.radians(_coordinates(locations, ("lat", "lng")))
+    lat = coords[:, 0]
+    lng = coords[:, 1]
+    if origins is None:
+        src_lat, src_lng = lat, lng
+    else:
+        src = np.radians(_coordinates(origins, ("lat", "lng")))
+        src_lat, src_lng = src[:, 0], src[:, 1]
+
+    dlat = src_lat[:, None] - lat[None, :]
+    dlng = src_lng[:, None] - lng[None, :]
+
+    h = np.sin(dlat / 2) ** 2 + np.cos(src_lat)[:, None] * np.cos(lat)[None, :] * np.sin(dlng / 2) ** 2
+    return 2 * EARTH_RADIUS * np.arcsin(np.sqrt(np.clip(h, 0.0, 1.0)))
+
+
+def euclidean_matrix(locations:list):
+    """Matriks jarak euclidean dari koordinat x/y (mis. instance CVRPLIB)."""
+    coords = _coordinates(locations, ("x", "y"))
+    diff = coords[:, None, :] - coords[None, :, :]
+    return np.sqrt((diff ** 2).sum(axis=2))
+
+
+def estimate_matrix(locations:list, route_method:ROUTE_METHOD, annotation="distance", base=None):
+    """
+    Estimasi jarak (meter) atau durasi (detik) jalan untuk satu profil:
+    jarak great-circle dikali faktor detour profil.
+    """
+    factors = PROFILE_FACTORS[route_method]
+    if base is None:
+        base = great_circle_matrix(locations)
+
+    matrix = base * factors["detour"]
+    if annotation == "duration":
+        matrix = matrix / factors["speed"]
+    return matrix
+
+
+def build_estimated_matrix(locations:list, origins:list=None):
+    # origins: hanya baris lokasi ini (jarak estimasi simetris)
+    base = great_circle_matrix(locations, origins)
+    dist_car = estimate_matrix(locations, ROUTE_METHOD.CAR, base=base)
+    dist_bike = estimate_matrix(locations, ROUTE_METHOD.BIKE, base=base)
+    return dist_car, dist_bike
+
+
+def build_euclidean_matrix(locations:list):
+    # jarak planar sama untuk semua profil
+    dist = euclidean_matrix(locations)
+    return dist, dist.copy()
+
+
+def straight_paths(locations:list, full_routes:list):
+    """Geometri garis lurus antar stop ([lng, lat]), tanpa request ke router."""
+    paths = []
+    for route in full_routes:
+        paths.append([
+            [locations[i].get("lng", locations[i].get("x")), locations[i].get("lat", locations[i].get("y"))]
+            for i in route
+        ])
+    return paths
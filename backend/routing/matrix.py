@@ -0,0 +1,191 @@
+from collections import OrderedDict
+import threading
+import numpy as np
+import os
+
+from routing import osrm
+from routing import estimate
+from routing.osrm import ROUTE_METHOD, DistanceLookupError
+
+# Backend jarak yang tersedia:
+# - osrm      : jarak jalan dari OSRM /table (default)
+# - haversine : estimasi great-circle x faktor detour, tanpa network
+# - euclidean : jarak planar dari koordinat x/y
+# - hybrid    : solve dengan estimasi haversine, lalu edge yang dipakai
+#               di rute akhir di-refine lewat OSRM
+DISTANCE_BACKENDS = ("osrm", "haversine", "euclidean", "hybrid")
+DEFAULT_BACKEND = os.environ.get("DISTANCE_BACKEND", "osrm")
+
+# Tipe matriks yang diberikan ke solver (float32 menghemat setengah memori)
+MATRIX_DTYPE = np.dtype(os.environ.get("MATRIX_DTYPE", "float64"))
+# Jumlah matriks terakhir yang diingat per proses (warm start / dispatch)
+MATRIX_MEMORY = int(os.environ.get("MATRIX_MEMORY", 4))
+# Backend yang matriksnya diingat (lokasi lat/lng); euclidean murah dihitung ulang
+REMEMBERED_BACKENDS = ("osrm", "haversine", "hybrid")
+
+_recent = OrderedDict()
+_recent_lock = threading.Lock()
+
+
+def _block(n):
+    # satu blok (2, n, n) supaya solver bisa memakainya tanpa copy
+    return np.empty((2, n, n), dtype=MATRIX_DTYPE)
+
+
+def _points(locations):
+    # identitas lokasi di memori proses: koordinat mentah (lebih murah dari
+    # point_key, yang dibulatkan untuk key cache persisten)
+    return tuple((loc["lat"], loc["lng"]) for loc in locations)
+
+
+def _key(points, backend):
+    # haversine & hybrid memakai matriks estimasi yang sama
+    return "osrm" if backend == "osrm" else "estimate", points
+
+
+def _remember(points, backend, dist_car, dist_bike):
+    key = _key(points, backend)
+    with _recent_lock:
+        _recent[key] = (dist_car, dist_bike)
+        _recent.move_to_end(key)
+        while len(_recent) > MATRIX_MEMORY:
+            _recent.popitem(last=False)
+
+
+def _recall(points, backend):
+    key = _key(points, backend)
+    with _recent_lock:
+        if key not in _recent:
+            return None
+        _recent.move_to_end(key)
+        return _recent[key]
+
+
+def build_distance_matrix(locations:list, backend=DEFAULT_BACKEND):
+    """Return (dist_car, dist_bike) sebagai array numpy contiguous."""
+    if backend == "osrm":
+        dist_car, dist_bike = osrm.build_distance_matrix(locations)
+    elif backend in ("haversine", "hybrid"):
+        dist_car, dist_bike = estimate.build_estimated_matrix(locations)
+    elif backend == "euclidean":
+        dist_car, dist_bike = estimate.build_euclidean_matrix(locations)
+    else:
+        raise ValueError(f"Unknown distance backend: {backend}")
+
+    block = _block(len(locations))
+    block[0] = dist_car
+    block[1] = dist_bike
+    if backend in REMEMBERED_BACKENDS:
+        _remember(_points(locations), backend, block[0], block[1])
+    return block[0], block[1]
+
+
+def get_distance_matrix(locations:list, backend=DEFAULT_BACKEND):
+    """Matriks yang masih diingat untuk set lokasi ini, atau build baru."""
+    recalled = _recall(_points(locations), backend) if backend in REMEMBERED_BACKENDS else None
+    if recalled is not None:
+        return recalled
+    return build_distance_matrix(locations, backend)
+
+
+def update_distance_matrix(prior_locations:list, locations:list, backend=DEFAULT_BACKEND):
+    """
+    Warm start: matriks untuk `locations` dari matriks `prior_locations` yang
+    masih diingat proses ini. Entry antar lokasi lama di-copy, hanya baris &
+    kolom lokasi baru yang diambil dari OSRM (lewat cache) atau diestimasi.
+    Build penuh kalau matriks lama tidak ada.
+    """
+    if backend not in REMEMBERED_BACKENDS:
+        return build_distance_matrix(locations, backend)
+    prior_points = _points(prior_locations)
+    prior = _recall(prior_points, backend)
+    if prior is None:
+        return build_distance_matrix(locations, backend)
+
+    points = _points(locations)
+    index = {point: i for i, point in enumerate(prior_points)}
+    old = [index.get(point) for point in points]
+    kept = [i for i, o in enumerate(old) if o is not None]
+    new = [i for i, o in enumerate(old) if o is None]
+    src = np.array([old[i] for i in kept], dtype=np.intp)
+
+    n = len(locations)
+    block = _block(n)
+    # lokasi lama tetap di depan dengan urutan sama (hanya tambah): copy slice
+    prefix = src.tolist() == list(range(len(kept))) and kept == list(range(len(kept)))
+    if backend != "osrm":
+        # estimasi simetris: baris lokasi baru = kolomnya
+        rows = estimate.build_estimated_matrix(locations, [locations[i] for i in new]) if new else None
+        for p in range(2):
+            _copy_prior(block[p], prior[p], kept, src, prefix)
+            if new:
+                block[p][new, :] = rows[p]
+                block[p][:, new] = rows[p].T
+        _remember(points, backend, block[0], block[1])
+        return block[0], block[1]
+
+    # dua blok request: baris baru x semua lokasi, lalu lokasi lama x kolom baru
+    new_rows = [(i, j) for i in new for j in range(n) if i != j]
+    new_cols = [(i, j) for i in kept for j in new]
+    unresolved = []
+    for p, method in enumerate((ROUTE_METHOD.CAR, ROUTE_METHOD.BIKE)):
+        _copy_prior(block[p], prior[p], kept, src, prefix)
+        block[p][new, new] = 0
+        fetched = osrm.fetch_pairs(locations, method, new_rows)
+        fetched.update(osrm.fetch_pairs(locations, method, new_cols))
+        for (i, j), d in fetched.items():
+            if d is None:
+                unresolved.append((method.value, i, j))
+            else:
+                block[p][i, j] = d
+
+    if unresolved:
+        raise DistanceLookupError(unresolved)
+    _remember(points, backend, block[0], block[1])
+    return block[0], block[1]
+
+
+def _copy_prior(matrix, prior, kept, src, prefix):
+    if prefix:
+        k = len(kept)
+        matrix[:k, :k] = prior[:k, :k]
+    else:
+        matrix[np.ix_(kept, kept)] = prior[np.ix_(src, src)]
+
+
+def build_paths(locations:list, full_routes:list, methods:list, backend=DEFAULT_BACKEND):
+    # backend offline tidak menyentuh network, path digambar garis lurus
+    if backend in ("haversine", "euclidean"):
+        return estimate.straight_paths(locations, full_routes)
+    return osrm.build_vehicle_paths(locations, full_routes, methods)
+
+
+def refine_route_cost(locations:list, full_routes:list, methods:list, dist_car, dist_bike):
+    """
+    Mode hybrid: ganti jarak estimasi dengan jarak OSRM hanya untuk edge
+    yang benar-benar dipakai rute akhir. Return selisih total cost
+    (refined - estimated) dan ringkasan refinement.
+    """
+    used = {}
+    for route, method in zip(full_routes, methods):
+        for i in range(len(route) - 1):
+            if route[i] != route[i + 1]:
+                edge = (route[i], route[i + 1])
+                used.setdefault(method, []).append(edge)
+
+    delta = 0.0
+    refined = 0
+    unresolved = 0
+    for method, edges in used.items():
+        dist = dist_bike if method == ROUTE_METHOD.BIKE else dist_car
+        actual = osrm.fetch_pairs(locations, method, set(edges))
+        for i, j in edges:
+            d = actual.get((i, j))
+            if d is None:
+                # tetap pakai estimasi kalau OSRM gagal
+                unresolved += 1
+                continue
+            delta += d - float(dist[i, j])
+            refined += 1
+
+    return delta, {"refinedEdges": refined, "unresolvedEdges": unresolved}
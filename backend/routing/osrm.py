@@ -0,0 +1,420 @@
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+import contextvars
+import threading
+import requests
+import time
+import os
+
+from routing.cache import route_cache, distance_key, path_key
+from routing.profiles import ROUTE_METHOD
+
+# Base URL OSRM, bisa diarahkan ke server lokal lewat env
+OSRM_URL = os.environ.get("OSRM_URL", "https://router.project-osrm.org")
+
+# Batas jumlah koordinat per request table (default server OSRM: 100)
+MAX_TABLE_SIZE = int(os.environ.get("OSRM_MAX_TABLE_SIZE", 100))
+
+# Jumlah worker paralel untuk fetch geometri rute
+ROUTE_WORKERS = int(os.environ.get("OSRM_ROUTE_WORKERS", 8))
+
+# Retry untuk error jaringan / 5xx / 429, dengan exponential backoff
+MAX_RETRIES = int(os.environ.get("OSRM_RETRIES", 2))
+RETRY_BACKOFF = float(os.environ.get("OSRM_RETRY_BACKOFF", 0.5))
+
+# Jumlah maksimum pasangan yang dicantumkan di laporan error
+MAX_REPORTED_PAIRS = 100
+
+class DistanceLookupError(Exception):
+    """Sebagian jarak tidak bisa di-resolve; solver tidak boleh jalan dengan matriks ini."""
+
+    def __init__(self, unresolved):
+        self.unresolved = unresolved
+        super().__init__(f"{len(unresolved)} distance pair(s) could not be resolved")
+
+    def report(self, locations):
+        pairs = []
+        for profile, i, j in self.unresolved[:MAX_REPORTED_PAIRS]:
+            pairs.append({
+                "profile": profile,
+                "from": i,
+                "to": j,
+                "fromName": locations[i].get("name"),
+                "toName": locations[j].get("name")
+            })
+        return {
+            "error": "Distance lookup failed for some location pairs",
+            "unresolvedCount": len(self.unresolved),
+            "unresolvedPairs": pairs
+        }
+
+# statistik fetch table terakhir (jumlah request & durasi)
+table_stats = {"requests": 0, "seconds": 0.0}
+# statistik fetch geometri terakhir
+route_stats = {"legs": 0, "requests": 0, "seconds": 0.0}
+# counter kumulatif request ke OSRM per endpoint (diagnostics & /metrics);
+# "failed" = request yang tetap gagal setelah retry
+upstream_stats = {"table": 0, "route": 0, "failed": 0}
+# counter request yang sama, tapi hanya untuk solve yang sedang berjalan
+# (di-set oleh solving.metrics.Diagnostics selama satu fase)
+request_upstream = contextvars.ContextVar("request_upstream", default=None)
+_stats_lock = threading.Lock()
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_session():
+    # satu Session dipakai bersama supaya koneksi keep-alive di-reuse
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=ROUTE_WORKERS)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            _session = session
+    return _session
+
+
+def _count_upstream(name, amount=1):
+    # dipanggil juga dari thread fetch geometri
+    counts = request_upstream.get()
+    with _stats_lock:
+        upstream_stats[name] += amount
+        if counts is not None:
+            counts[name] += amount
+
+
+def _get_json(url, params, timeout):
+    # retry terbatas dengan backoff; 4xx (mis. NoRoute) tidak di-retry
+    for attempt in range(MAX_RETRIES + 1):
+        try:
+            res = get_session().get(url, params=params, timeout=timeout)
+            if res.status_code == 429 or res.status_code >= 500:
+                res.raise_for_status()
+            return res.json()
+        except (requests.RequestException, ValueError):
+            if attempt == MAX_RETRIES:
+                raise
+            time.sleep(RETRY_BACKOFF * (2 ** attempt))
+
+
+def _coords(points):
+    return ";".join(f"{p['lng']},{p['lat']}" for p in points)
+
+
+def osrm_table(points, route_method:ROUTE_METHOD, sources=None, destinations=None):
+    """
+    Satu request many-to-many ke OSRM /table.
+    Return matriks len(sources) x len(destinations) (entry None = OSRM
+    menjawab null / tidak ada rute), atau None kalau request gagal
+    (jaringan / HTTP / response tidak valid).
+    """
+    url = f"{OSRM_URL}/table/v1/{route_method.value}/{_coords(points)}"
+    query = {"annotations": "distance"}
+    if sources is not None:
+        query["sources"] = ";".join(str(i) for i in sources)
+    if destinations is not None:
+        query["destinations"] = ";".join(str(i) for i in destinations)
+
+    table_stats["requests"] += 1
+    _count_upstream("table")
+    try:
+        res = _get_json(url, query, timeout=30)
+        rows = res["distances"]
+    except Exception:
+        _count_upstream("failed")
+        return None
+
+    return rows
+
+
+def _blocks(items, size):
+    return [items[s:s + size] for s in range(0, len(items), size)]
+
+
+def _tiles(rows, cols):
+    # satu request kalau semua koordinat muat, selain itu pecah jadi tile
+    if len(set(rows) | set(cols)) <= MAX_TABLE_SIZE:
+        return [(rows, cols)]
+    size = max(1, MAX_TABLE_SIZE // 2)
+    # sisi yang kecil (mis. 1 lokasi baru) tidak perlu dipecah
+    if len(rows) <= size:
+        return [(rows, c) for c in _blocks(cols, MAX_TABLE_SIZE - len(rows))]
+    if len(cols) <= size:
+        return [(r, cols) for r in _blocks(rows, MAX_TABLE_SIZE - len(cols))]
+    return [(r, c) for r in _blocks(rows, size) for c in _blocks(cols, size)]
+
+
+def _fetch_block(locations, route_method, rows, cols):
+    """
+    Fetch jarak rows x cols, return dict (i, j) -> jarak (None = OSRM
+    menjawab null). Pasangan dari tile yang request-nya gagal tidak ada di
+    dict: gagal sementara, tidak boleh masuk negative cache.
+    """
+    result = {}
+    for tile_rows, tile_cols in _tiles(rows, cols):
+        # gabungkan koordinat baris & kolom tanpa duplikat
+        index = {}
+        for i in tile_rows + tile_cols:
+            index.setdefault(i, len(index))
+        points = [locations[i] for i in index]
+
+        if tile_rows == tile_cols:
+            table = osrm_table(points, route_method)
+        else:
+            table = osrm_table(
+                points, route_method,
+                sources=[index[i] for i in tile_rows],
+                destinations=[index[j] for j in tile_cols]
+            )
+        if table is None:
+            continue
+
+        for a, i in enumerate(tile_rows):
+            for b, j in enumerate(tile_cols):
+                if i != j:
+                    result[(i, j)] = table[a][b]
+    return result
+
+
+def _cover(missing, n):
+    """
+    Pilih node seminimal mungkin sehingga setiap pasangan (i, j) yang belum
+    ada di cache punya i atau j di dalamnya (greedy vertex cover).
+    Kalau lokasi baru ditambah, yang terpilih cuma lokasi baru tsb.
+    """
+    if len(missing) * 4 > n * (n - 1):
+        return list(range(n))
+
+    incident = {}
+    for i, j in missing:
+        incident.setdefault(i, set()).add((i, j))
+        incident.setdefault(j, set()).add((i, j))
+
+    chosen = []
+    remaining = set(missing)
+    while remaining:
+        node = max(incident, key=lambda k: len(incident[k]))
+        chosen.append(node)
+        for pair in incident.pop(node):
+            if pair in remaining:
+                remaining.discard(pair)
+                other = pair[1] if pair[0] == node else pair[0]
+                if other in incident:
+                    incident[other].discard(pair)
+    return sorted(chosen)
+
+
+def fetch_matrix(locations:list, route_method:ROUTE_METHOD):
+    """
+    Matriks jarak n x n untuk satu profil.
+    Pasangan yang sudah ada di cache tidak di-fetch ulang; sisanya diambil
+    dengan request /table (dipecah jadi tile kalau melebihi batas server).
+    Return (matrix, unresolved) dengan unresolved = list (i, j) yang gagal;
+    entry matriksnya None.
+    """
+    n = len(locations)
+    matrix = [[0] * n for _ in range(n)]
+    if n < 2:
+        return matrix, []
+
+    profile = route_method.value
+    keys = {
+        (i, j): distance_key(profile, locations[i], locations[j])
+        for i in range(n) for j in range(n) if i != j
+    }
+    cached = route_cache.get_many(keys.values())
+
+    missing = []
+    unresolved = []
+    for (i, j), key in keys.items():
+        if key not in cached:
+            missing.append((i, j))
+        elif cached[key] is None:
+            # negative cache: baru saja gagal, jangan di-fetch ulang dulu
+            matrix[i][j] = None
+            unresolved.append((i, j))
+        else:
+            matrix[i][j] = cached[key]
+
+    if not missing:
+        return matrix, unresolved
+
+    everyone = list(range(n))
+    cover = _cover(missing, n)
+    fetched = _fetch_block(locations, route_method, cover, everyone)
+    covered = set(cover)
+    rest = [i for i in everyone if i not in covered]
+    if rest:
+        fetched.update(_fetch_block(locations, route_method, rest, cover))
+
+    to_store = {}
+    failed = []
+    for i, j in missing:
+        d = fetched.get((i, j))
+        matrix[i][j] = d
+        if d is not None:
+            to_store[keys[(i, j)]] = d
+            continue
+        unresolved.append((i, j))
+        # negative cache hanya untuk null dari OSRM, bukan request yang gagal
+        if (i, j) in fetched:
+            failed.append(keys[(i, j)])
+    route_cache.set_many(to_store)
+    route_cache.set_failed(failed)
+
+    return matrix, unresolved
+
+
+def fetch_pairs(locations:list, route_method:ROUTE_METHOD, pairs):
+    """
+    Jarak untuk sekumpulan pasangan (i, j) saja, lewat cache dulu.
+    Return dict (i, j) -> jarak (None kalau gagal).
+    """
+    profile = route_method.value
+    keys = {(i, j): distance_key(profile, locations[i], locations[j]) for i, j in pairs if i != j}
+    cached = route_cache.get_many(keys.values())
+    result = {pair: cached[key] for pair, key in keys.items() if key in cached}
+
+    missing = [pair for pair in keys if pair not in result]
+    if missing:
+        rows = sorted({i for i, _ in missing})
+        cols = sorted({j for _, j in missing})
+        fetched = _fetch_block(locations, route_method, rows, cols)
+        for pair in missing:
+            result[pair] = fetched.get(pair)
+        route_cache.set_many({keys[p]: result[p] for p in missing if result[p] is not None})
+        route_cache.set_failed([keys[p] for p in missing if p in fetched and fetched[p] is None])
+
+    return result
+
+
+def _no_route(res):
+    # OSRM menjawab tapi tidak ada rute (boleh di-negative cache); selain
+    # itu (jaringan / HTTP / response rusak) dianggap gagal sementara
+    return isinstance(res, dict) and res.get("code") in ("NoRoute", "NoSegment")
+
+
+def osrm_distance(p1, p2, route_method:ROUTE_METHOD):
+    """Jarak satu pasangan, None kalau tidak bisa di-resolve."""
+    key = distance_key(route_method.value, p1, p2)
+    cached = route_cache.get_many([key])
+    if key in cached:
+        return cached[key]
+
+    url = f"{OSRM_URL}/route/v1/{route_method.value}/{p1['lng']},{p1['lat']};{p2['lng']},{p2['lat']}"
+
+    _count_upstream("route")
+    res = None
+    try:
+        res = _get_json(url, {"overview": "false"}, timeout=5)
+        d = res["routes"][0]["distance"]
+    except Exception:
+        _count_upstream("failed")
+        if _no_route(res):
+            route_cache.set_failed([key])
+        return None
+
+    route_cache.set(key, d)
+    return d
+
+
+def build_distance_matrix(locations:list):
+    """
+    Bangun matriks jarak mobil & motor.
+    Raise DistanceLookupError kalau ada pasangan yang gagal di-resolve,
+    supaya solver tidak mengoptimasi terhadap jarak palsu.
+    """
+    started = time.perf_counter()
+    table_stats["requests"] = 0
+
+    dist_car, failed_car = fetch_matrix(locations, ROUTE_METHOD.CAR)
+    dist_bike, failed_bike = fetch_matrix(locations, ROUTE_METHOD.BIKE)
+
+    table_stats["seconds"] = time.perf_counter() - started
+
+    unresolved = [(ROUTE_METHOD.CAR.value, i, j) for i, j in failed_car]
+    unresolved += [(ROUTE_METHOD.BIKE.value, i, j) for i, j in failed_bike]
+    if unresolved:
+        raise DistanceLookupError(unresolved)
+
+    return dist_car, dist_bike
+
+
+def osrm_route_path(p1, p2, route_method:ROUTE_METHOD):
+    """Geometri satu leg; [] kalau OSRM tidak menemukan rute, None kalau request gagal."""
+    url = f"{OSRM_URL}/route/v1/{route_method.value}/{p1['lng']},{p1['lat']};{p2['lng']},{p2['lat']}"
+
+    _count_upstream("route")
+    res = None
+    try:
+        res = _get_json(url, {"overview": "full", "geometries": "geojson"}, timeout=5)
+        return res["routes"][0]["geometry"]["coordinates"]
+    except Exception:
+        _count_upstream("failed")
+        return [] if _no_route(res) else None
+
+
+def fetch_route_paths(locations:list, legs:list):
+    """
+    Fetch geometri untuk list leg (i, j, route_method) secara paralel.
+    Leg yang sama cukup di-fetch sekali, leg yang ada di cache tidak di-fetch.
+    Return dict leg -> coordinates.
+    """
+    unique = list(dict.fromkeys(legs))
+    if not unique:
+        return {}
+
+    keys = {leg: path_key(leg[2].value, locations[leg[0]], locations[leg[1]]) for leg in unique}
+    cached = route_cache.get_many(keys.values())
+    # geometri yang baru gagal (negative cache) digambar kosong
+    paths = {leg: cached[key] or [] for leg, key in keys.items() if key in cached}
+    pending = [leg for leg in unique if leg not in paths]
+    if not pending:
+        return paths
+
+    def fetch(leg):
+        i, j, method = leg
+        return osrm_route_path(locations[i], locations[j], method)
+
+    # context dicopy per leg supaya request di thread worker tetap dihitung
+    # ke diagnostics solve ini
+    contexts = [contextvars.copy_context() for _ in pending]
+    with ThreadPoolExecutor(max_workers=min(ROUTE_WORKERS, len(pending))) as pool:
+        fetched = list(pool.map(lambda context, leg: context.run(fetch, leg), contexts, pending))
+
+    route_stats["requests"] += len(pending)
+    for leg, path in zip(pending, fetched):
+        paths[leg] = path or []
+    # leg tanpa rute ([]) di-negative cache, request yang gagal (None) tidak
+    route_cache.set_many({keys[leg]: path for leg, path in zip(pending, fetched) if path})
+    route_cache.set_failed([keys[leg] for leg, path in zip(pending, fetched) if path == []])
+    return paths
+
+
+def build_vehicle_paths(locations:list, full_routes:list, methods:list):
+    """
+    Susun vehiclePaths untuk setiap rute (sudah termasuk depot),
+    urutan output sama dengan urutan full_routes.
+    """
+    started = time.perf_counter()
+    route_stats["requests"] = 0
+
+    legs = []
+    for route, method in zip(full_routes, methods):
+        for i in range(len(route) - 1):
+            legs.append((route[i], route[i + 1], method))
+    paths = fetch_route_paths(locations, legs)
+
+    vehicle_paths = []
+    for route, method in zip(full_routes, methods):
+        path = []
+        for i in range(len(route) - 1):
+            path.extend(paths[(route[i], route[i + 1], method)])
+        vehicle_paths.append(path)
+
+    route_stats["legs"] = len(legs)
+    route_stats["seconds"] = time.perf_counter() - started
+    return vehicle_paths
@@ -0,0 +1,7 @@
+from enum import Enum
+
+# Profil routing per jenis kendaraan (nama profil OSRM). Dipisah dari
+# routing.osrm supaya solver & estimasi offline tidak meng-import requests.
+class ROUTE_METHOD(Enum):
+    CAR = "driving"
+    BIKE = "bike"
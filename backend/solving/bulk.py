@@ -0,0 +1,223 @@
+"""
+Bulk solve: banyak skenario what-if independen (fleet / demand berbeda) pada
+satu set lokasi, dikirim dan dijawab sebagai NDJSON.
+
+    POST /api/bulk/solve/<algorithm>   (Content-Type: application/x-ndjson)
+    {"locations": [...], "params": {...}}                               <- header
+    {"id": "mix-a", "params": {"vehicles": [...]}}                      <- skenario
+    {"id": "forecast-b", "algorithm": "genetic", "demands": [0, 3, 5, ...]}
+    ...
+
+Baris pertama = lokasi bersama + params default; setiap baris berikutnya
+satu skenario (algoritma default dari URL, params di-merge ke default,
+`demands` opsional mengganti demand per lokasi, urut seperti locations,
+`params.seed` untuk hasil yang reproducible). Matriks jarak dibangun sekali
+dan ditaruh di shared memory, skenario dijalankan di process pool.
+
+Response: satu baris per skenario begitu selesai (urutan selesai, bukan
+urutan kirim; `index` = nomor baris skenario; skenario gagal -> status
+"error" + payload error + `code` HTTP), lalu satu baris summary.
+Body request dibaca bertahap dan skenario yang sedang jalan / antri dibatasi
+(2 x workers), jadi memori tidak bergantung jumlah skenario. Path
+visualisasi (vehiclePaths) tidak dibuat di bulk solve.
+"""
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+import multiprocessing
+import multiprocessing.util
+import threading
+import random
+import json
+import time
+import os
+
+import numpy as np
+
+from algorithms.matrix import SharedMatrix, attach_shared, detach_shared, CAR, BIKE
+from routing.matrix import DEFAULT_BACKEND, build_distance_matrix
+from routing.osrm import DistanceLookupError
+from solving.errors import SolveError
+from solving.metrics import Diagnostics
+from solving.pipeline import SOLVERS, validate_request, refine_result
+from solving import metrics
+
+BULK_WORKERS = int(os.environ.get("BULK_WORKERS", os.cpu_count() or 1))
+CONTENT_TYPE = "application/x-ndjson"
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _solve_scenario(spec, algorithm, demands, params):
+    """Satu skenario di proses worker -> (full_routes, methods, result) atau error."""
+    shm, block = attach_shared(spec)
+    try:
+        seed = params.get("seed")
+        if seed is not None:
+            random.seed(seed)
+            np.random.seed(int(seed) % 2 ** 32)
+
+        diagnostics = Diagnostics()
+        try:
+            with diagnostics.phase("solve"):
+                full_routes, methods, result = SOLVERS[algorithm](block[CAR], block[BIKE], demands, params)
+        except SolveError as e:
+            # SolveError tidak bisa di-pickle balik (payload), kirim sebagai data
+            return None, None, dict(e.payload, code=e.status)
+        finally:
+            block = None
+
+        result["finalCost"] = float(result["finalCost"])
+        result["diagnostics"] = diagnostics.report(result.pop("solverStats", None))
+        return full_routes, methods, result
+    finally:
+        detach_shared(shm)
+
+
+def _get_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(BULK_WORKERS, mp_context=multiprocessing.get_context("spawn"))
+            multiprocessing.util.Finalize(_pool, _pool.shutdown, exitpriority=100)
+        return _pool
+
+
+def _line(data):
+    return json.dumps(data) + "\n"
+
+
+class BulkSolve:
+    """
+    Satu request bulk. Header divalidasi dan matriks dibangun di constructor
+    (error -> SolveError sebelum response dimulai); stream() menghasilkan
+    baris NDJSON.
+    """
+
+    def __init__(self, algorithm, header):
+        if not isinstance(header, dict) or not header.get("locations"):
+            raise SolveError({"error": "The first line needs 'locations'"})
+        self.locations = header["locations"]
+        self.algorithm = algorithm
+        self.params = header.get("params", {})
+        self.backend = self.params.get("distanceBackend", DEFAULT_BACKEND)
+        if self.params.get("warmStart") is not None:
+            raise SolveError({"error": "warmStart is not supported in bulk solve"})
+        validate_request(algorithm, self.params)
+        workers = self.params.get("workers", BULK_WORKERS)
+        if isinstance(workers, bool) or not isinstance(workers, int) or workers < 1:
+            raise SolveError({"error": "'workers' must be a positive integer"})
+        self.workers = min(workers, BULK_WORKERS)
+
+        self.diagnostics = Diagnostics()
+        try:
+            with self.diagnostics.phase("matrix"):
+                self.dist_car, self.dist_bike = build_distance_matrix(self.locations, self.backend)
+        except DistanceLookupError as e:
+            raise SolveError(e.report(self.locations), 502)
+        self.demands = [0] + [loc.get("demand", 0) for loc in self.locations[1:]]
+
+    @staticmethod
+    def _parse(line):
+        try:
+            scenario = json.loads(line)
+        except ValueError as e:
+            raise SolveError({"error": f"Invalid JSON: {e}"})
+        if not isinstance(scenario, dict):
+            raise SolveError({"error": "A scenario must be a JSON object"})
+        return scenario
+
+    def _scenario(self, scenario):
+        """Skenario -> (algorithm, demands, params). Raise SolveError."""
+        if not isinstance(scenario.get("params", {}), dict):
+            raise SolveError({"error": "Scenario 'params' must be an object"})
+        algorithm = scenario.get("algorithm", self.algorithm)
+        params = dict(self.params, **scenario.get("params", {}))
+        if params.get("warmStart") is not None:
+            raise SolveError({"error": "warmStart is not supported in bulk solve"})
+        if params.get("distanceBackend", DEFAULT_BACKEND) != self.backend:
+            raise SolveError({"error": "distanceBackend must be set in the header line"})
+        validate_request(algorithm, params)
+
+        demands = scenario.get("demands", self.demands)
+        if not isinstance(demands, list) or len(demands) != len(self.locations):
+            raise SolveError({"error": f"'demands' needs one value per location ({len(self.locations)})"})
+        return algorithm, demands, params
+
+    def _result(self, index, scenario_id, algorithm, params, outcome):
+        full_routes, methods, result = outcome
+        label = algorithm if algorithm in SOLVERS else "unknown"
+        if full_routes is None:
+            metrics.record_failure(label, result["code"])
+            return dict(result, index=index, id=scenario_id, status="error")
+
+        if self.backend == "hybrid":
+            refine_result(result, self.locations, full_routes, methods, self.dist_car, self.dist_bike)
+        result["vehicleRoutes"] = [[self.locations[i] for i in r] for r in full_routes]
+        result["totalVehicles"] = len(full_routes)
+        result["distanceBackend"] = self.backend
+
+        diagnostics = result.pop("diagnostics")
+        metrics.record_solve(label, diagnostics)
+        if params.get("diagnostics"):
+            result["diagnostics"] = diagnostics
+        return {"index": index, "id": scenario_id, "status": "ok", "result": result}
+
+    def stream(self, lines):
+        """
+        Generator baris NDJSON. `lines` dibaca bertahap; paling banyak
+        2 x workers skenario yang sedang jalan / antri di pool.
+        """
+        pool = _get_pool()
+        started = time.perf_counter()
+        counts = {"ok": 0, "error": 0}
+        pending = {}
+        lines = enumerate(line for line in lines if line.strip())
+        exhausted = False
+
+        with SharedMatrix(self.dist_car, self.dist_bike) as shared:
+            try:
+                while True:
+                    while not exhausted and len(pending) < 2 * self.workers:
+                        index, line = next(lines, (None, None))
+                        if line is None:
+                            exhausted = True
+                            break
+                        scenario_id = None
+                        try:
+                            scenario = self._parse(line)
+                            scenario_id = scenario.get("id")
+                            algorithm, demands, params = self._scenario(scenario)
+                        except SolveError as e:
+                            counts["error"] += 1
+                            yield _line(dict(e.payload, index=index, id=scenario_id, status="error", code=e.status))
+                            continue
+                        future = pool.submit(_solve_scenario, shared.spec, algorithm, demands, params)
+                        pending[future] = (index, scenario_id, algorithm, params)
+                    if not pending:
+                        break
+
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        index, scenario_id, algorithm, params = pending.pop(future)
+                        try:
+                            outcome = future.result()
+                        except Exception as e:
+                            outcome = None, None, {"error": str(e), "code": 500}
+                        data = self._result(index, scenario_id, algorithm, params, outcome)
+                        counts[data["status"]] += 1
+                        yield _line(data)
+            finally:
+                # client putus: skenario yang belum mulai tidak dijalankan
+                for future in pending:
+                    future.cancel()
+
+        yield _line({
+            "summary": {
+                "scenarios": counts["ok"] + counts["error"],
+                "ok": counts["ok"],
+                "failed": counts["error"],
+                "workers": self.workers,
+                "matrixSeconds": round(self.diagnostics.phases["matrix"], 6),
+                "seconds": round(time.perf_counter() - started, 6),
+            }
+        })
@@ -0,0 +1,127 @@
+"""
+Insertion real-time order baru ke rute yang sedang berjalan, tanpa solver.
+
+    POST /api/dispatch/insert
+    {
+        "locations": [depot, ...],   # lokasi plan yang sedang jalan (depot index 0)
+        "routes": [
+            {"type": "Mobil", "capacity": 100,
+             "position": <lokasi>,   # stop terakhir yang dikunjungi (default depot)
+             "stops": [<lokasi>, ...]},  # stop yang belum dikunjungi, urut
+            ...
+        ],
+        "order": <lokasi baru dengan demand>,
+        "params": {"distanceBackend": "osrm"}
+    }
+
+Posisi kendaraan dinyatakan sebagai lokasi di `locations` (bukan koordinat
+GPS bebas) supaya jaraknya sudah ada di matriks. Order hanya boleh disisipkan
+setelah posisi kendaraan, dan kapasitas dicek terhadap demand stop yang
+belum dikunjungi + order. Lokasi dicocokkan seperti warm start (nama atau
+koordinat).
+
+Matriks untuk `locations` diingat per proses (routing.matrix), jadi order
+baru hanya perlu baris & kolomnya sendiri; response mengembalikan
+`locations` + order untuk request berikutnya.
+"""
+from algorithms.core import Problem, vehicle_profile
+from algorithms.insertion import vehicle_insertions
+from algorithms.matrix import BIKE
+from routing.matrix import DISTANCE_BACKENDS, DEFAULT_BACKEND, get_distance_matrix, update_distance_matrix
+from routing.osrm import DistanceLookupError
+from solving.errors import SolveError
+from solving.metrics import Diagnostics
+from solving.warmstart import location_id
+
+
+def validate_dispatch(locations, routes, order):
+    if not locations:
+        raise SolveError({"error": "'locations' needs at least the depot"})
+    if not isinstance(routes, list) or not routes:
+        raise SolveError({"error": "'routes' needs at least one vehicle"})
+    for route in routes:
+        if not isinstance(route, dict) or "type" not in route or "capacity" not in route:
+            raise SolveError({"error": "Every route needs 'type' and 'capacity'"})
+    if not isinstance(order, dict):
+        raise SolveError({"error": "No valid 'order'"})
+
+
+def _index(index, loc, what):
+    i = index.get(location_id(loc))
+    if i is None:
+        raise SolveError({"error": f"{what} not found in locations: {location_id(loc)}"})
+    return i
+
+
+def _option(routes, order, option, problem):
+    delta, v, pos = option
+    stops = routes[v].get("stops", [])
+    return {
+        "vehicle": v,
+        "type": problem.vehicles[v]["type"],
+        "position": pos,
+        "addedDistance": delta,
+        "stops": stops[:pos] + [order] + stops[pos:],
+    }
+
+
+def insert_order(locations, routes, order, params):
+    """
+    Return dict insertion terbaik (semua kendaraan dan per profil car / bike).
+    Raise SolveError kalau input tidak valid, 409 kalau tidak ada kendaraan
+    yang muat.
+    """
+    validate_dispatch(locations, routes, order)
+    backend = params.get("distanceBackend", DEFAULT_BACKEND)
+    if backend not in DISTANCE_BACKENDS:
+        raise SolveError({"error": f"Unknown distance backend '{backend}'"})
+    diagnostics = Diagnostics()
+
+    index = {location_id(loc): i for i, loc in enumerate(locations)}
+    customer = index.get(location_id(order))
+    served = {location_id(stop) for route in routes for stop in route.get("stops", [])}
+    if location_id(order) in served:
+        raise SolveError({"error": f"Order is already routed: {location_id(order)}"})
+
+    # matriks `locations` diingat (build sekali); order baru hanya menambah
+    # baris & kolomnya sendiri
+    try:
+        with diagnostics.phase("matrix"):
+            dist_car, dist_bike = get_distance_matrix(locations, backend)
+            if customer is None:
+                locations = list(locations) + [order]
+                customer = len(locations) - 1
+                dist_car, dist_bike = update_distance_matrix(locations[:-1], locations, backend)
+    except DistanceLookupError as e:
+        raise SolveError(e.report(locations), 502)
+
+    with diagnostics.phase("insertion"):
+        demands = [0] * len(locations)
+        for i, loc in enumerate(locations[1:], 1):
+            demands[i] = loc.get("demand", 0)
+        demands[customer] = order.get("demand", 0)
+
+        fleet = [(route["type"], route["capacity"]) for route in routes]
+        problem = Problem(dist_car, dist_bike, demands, fleet)
+        stops = [[_index(index, stop, "Stop") for stop in route.get("stops", [])] for route in routes]
+        starts = [_index(index, route["position"], "Vehicle position") if route.get("position") else 0
+                  for route in routes]
+        options = vehicle_insertions(problem, stops, problem.route_loads(stops), customer, starts)
+
+    if not options:
+        raise SolveError({"error": "No vehicle has capacity left for this order"}, 409)
+
+    best = min(options)
+    by_profile = {}
+    for option in options:
+        profile = "bike" if vehicle_profile(routes[option[1]]["type"]) == BIKE else "car"
+        if profile not in by_profile or option < by_profile[profile]:
+            by_profile[profile] = option
+
+    return {
+        "best": _option(routes, order, best, problem),
+        "byProfile": {p: _option(routes, order, o, problem) for p, o in by_profile.items()},
+        "locations": locations,
+        "distanceBackend": backend,
+        "diagnostics": diagnostics.report(),
+    }
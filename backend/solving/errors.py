@@ -0,0 +1,7 @@
+class SolveError(Exception):
+    """Request tidak bisa di-solve; payload dikirim apa adanya sebagai JSON."""
+
+    def __init__(self, payload, status=400):
+        super().__init__(payload.get("error"))
+        self.payload = payload
+        self.status = status
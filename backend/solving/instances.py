@@ -0,0 +1,142 @@
+"""
+File instance untuk batch solve tanpa Flask (cli.py) dan benchmark:
+
+    .json  body request /api/solve ({"locations", "params"}), atau list lokasi
+           saja (format data/locations.json)
+    .csv   satu baris per lokasi, kolom name, lat, lng (atau x, y), demand;
+           baris pertama = depot
+    .vrp   CVRPLIB (TSPLIB EUC_2D): armada k mobil (k dari "-k5" di nama)
+           berkapasitas CAPACITY, jarak dibulatkan (nint) seperti di CVRPLIB
+
+Instance .vrp membawa matriksnya sendiri; lokasi .json / .csv dihitung
+matriksnya oleh caller sesuai backend jarak.
+"""
+import csv
+import json
+import os
+import re
+
+import numpy as np
+
+
+class InstanceFile:
+    def __init__(self, name, locations, params, matrices=None, bks=None):
+        self.name = name
+        self.locations = locations
+        # params default dari file (mis. vehicles), bisa ditimpa caller
+        self.params = params
+        # (dist_car, dist_bike) kalau sudah ditentukan file-nya (CVRPLIB)
+        self.matrices = matrices
+        # best-known solution value (CVRPLIB), None kalau tidak ada
+        self.bks = bks
+
+    @property
+    def demands(self):
+        return [0] + [loc.get("demand", 0) for loc in self.locations[1:]]
+
+    @property
+    def size(self):
+        return len(self.locations) - 1
+
+
+def parse_vrp(text):
+    """Parse file .vrp (TSPLIB) -> (header dict, coords, demands)."""
+    header = {}
+    coords = {}
+    demands = {}
+    depots = []
+    section = None
+    for line in text.splitlines():
+        line = line.strip()
+        if not line or line == "EOF":
+            continue
+        if line.endswith("_SECTION"):
+            section = line
+            continue
+        if ":" in line and section is None:
+            key, value = line.split(":", 1)
+            header[key.strip()] = value.strip()
+            continue
+
+        fields = line.split()
+        if section == "NODE_COORD_SECTION":
+            coords[int(fields[0])] = (float(fields[1]), float(fields[2]))
+        elif section == "DEMAND_SECTION":
+            demands[int(fields[0])] = int(fields[1])
+        elif section == "DEPOT_SECTION" and int(fields[0]) != -1:
+            depots.append(int(fields[0]))
+
+    if header.get("EDGE_WEIGHT_TYPE") != "EUC_2D":
+        raise ValueError(f"Unsupported EDGE_WEIGHT_TYPE {header.get('EDGE_WEIGHT_TYPE')}")
+    if depots != [1]:
+        raise ValueError("Only instances with node 1 as the single depot are supported")
+
+    nodes = sorted(coords)
+    return header, [coords[i] for i in nodes], [demands[i] for i in nodes]
+
+
+def euc_2d(coords):
+    # jarak TSPLIB EUC_2D: euclid dibulatkan ke integer terdekat
+    xy = np.asarray(coords, dtype=np.float64)
+    return np.floor(np.sqrt(((xy[:, None, :] - xy[None, :, :]) ** 2).sum(axis=2)) + 0.5)
+
+
+def best_known(header):
+    match = re.search(r"(?:Optimal|Best) value:\s*([\d.]+)", header.get("COMMENT", ""))
+    return float(match.group(1)) if match else None
+
+
+def cvrplib_vehicles(name, header, demands):
+    match = re.search(r"-k(\d+)", name)
+    trucks = int(match.group(1)) if match else len(demands) - 1
+    return [{"type": "Mobil", "count": trucks, "capacity": int(header["CAPACITY"])}]
+
+
+def _read_vrp(path, name):
+    with open(path) as f:
+        header, coords, demands = parse_vrp(f.read())
+    locations = [{"name": str(i + 1), "x": x, "y": y, "demand": d}
+                 for i, ((x, y), d) in enumerate(zip(coords, demands))]
+    dist = euc_2d(coords)
+    params = {"vehicles": cvrplib_vehicles(name, header, demands)}
+    return InstanceFile(name, locations, params, (dist, dist), best_known(header))
+
+
+def _read_json(path, name):
+    with open(path) as f:
+        data = json.load(f)
+    if isinstance(data, list):
+        return InstanceFile(name, data, {})
+    if not isinstance(data, dict) or "locations" not in data:
+        raise ValueError(f"{path}: expected a list of locations or an object with 'locations'")
+    return InstanceFile(name, data["locations"], data.get("params", {}))
+
+
+def _read_csv(path, name):
+    locations = []
+    with open(path, newline="") as f:
+        for row in csv.DictReader(f):
+            loc = {"name": row.get("name") or str(len(locations))}
+            for key in ("lat", "lng", "x", "y"):
+                if row.get(key) not in (None, ""):
+                    loc[key] = float(row[key])
+            loc["demand"] = float(row.get("demand") or 0)
+            if loc["demand"].is_integer():
+                loc["demand"] = int(loc["demand"])
+            locations.append(loc)
+    return InstanceFile(name, locations, {})
+
+
+READERS = {".vrp": _read_vrp, ".json": _read_json, ".csv": _read_csv}
+
+
+def read_instance(path):
+    """File instance -> InstanceFile. Raise ValueError kalau format tidak dikenal / tidak valid."""
+    name, ext = os.path.splitext(os.path.basename(path))
+    reader = READERS.get(ext.lower())
+    if reader is None:
+        raise ValueError(f"{path}: unknown instance format (expected {', '.join(READERS)})")
+    instance = reader(path, name)
+    if not instance.locations:
+        raise ValueError(f"{path}: no locations")
+    return instance
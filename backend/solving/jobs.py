@@ -0,0 +1,233 @@
+"""
+Job solve asynchronous: submit -> job id, titik history di-stream (SSE) selama
+solve berjalan, bisa dibatalkan, dan hasilnya diambil setelah selesai.
+Solve dijalankan di worker pool (default: proses terpisah) supaya worker web
+tetap bebas melayani request lain.
+"""
+import multiprocessing
+import threading
+import atexit
+import json
+import time
+import uuid
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import queue
+
+from solving.pipeline import solve_request, validate_request, SolveError
+from solving import metrics
+
+JOB_WORKERS = int(os.environ.get("SOLVE_JOB_WORKERS", 2))
+# "process" (default) atau "thread" (mis. untuk development)
+JOB_EXECUTOR = os.environ.get("SOLVE_JOB_EXECUTOR", "process")
+# Job yang sudah selesai disimpan selama JOB_TTL detik
+JOB_TTL = float(os.environ.get("SOLVE_JOB_TTL", 3600))
+# Interval komentar keep-alive di stream SSE
+HEARTBEAT = 15
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+CANCELLED = "cancelled"
+FINISHED = (DONE, FAILED, CANCELLED)
+
+
+class JobCancelled(Exception):
+    pass
+
+
+def _run_job(algorithm, locations, params, events, cancel):
+    """
+    Dijalankan di worker. Semua status dikirim ke proses web lewat queue
+    `events`; pembatalan dicek setiap kali solver melapor progress.
+    """
+    def progress(point):
+        if cancel.is_set():
+            raise JobCancelled()
+        events.put(("progress", point))
+
+    try:
+        if cancel.is_set():
+            raise JobCancelled()
+        events.put((RUNNING, None))
+        events.put((DONE, solve_request(algorithm, locations, params, progress)))
+    except JobCancelled:
+        events.put((CANCELLED, None))
+    except SolveError as e:
+        events.put((FAILED, {"payload": e.payload, "status": e.status}))
+    except Exception as e:
+        events.put((FAILED, {"payload": {"error": str(e)}, "status": 500}))
+
+
+class Job:
+    def __init__(self, algorithm, cancel, diagnostics=False):
+        self.id = uuid.uuid4().hex
+        self.algorithm = algorithm
+        # block diagnostics ikut di hasil kalau diminta (params.diagnostics)
+        self.diagnostics = diagnostics
+        self.status = QUEUED
+        self.history = []
+        self.result = None
+        self.error = None
+        self.error_status = None
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.cancel_event = cancel
+        self.future = None
+        self.changed = threading.Condition()
+
+    def snapshot(self, since=None):
+        data = {
+            "jobId": self.id,
+            "algorithm": self.algorithm,
+            "status": self.status,
+            "progress": {
+                "points": len(self.history),
+                "last": self.history[-1] if self.history else None,
+            },
+            "createdAt": self.created_at,
+            "startedAt": self.started_at,
+            "finishedAt": self.finished_at,
+        }
+        if self.error is not None:
+            data["error"] = self.error
+        if since is not None:
+            # polling: titik history mulai index `since`
+            data["history"] = self.history[since:]
+        return data
+
+    def _update(self, event, data):
+        with self.changed:
+            if event == "progress":
+                self.history.append(data)
+            elif event == RUNNING:
+                self.status = RUNNING
+                self.started_at = time.time()
+            elif self.status not in FINISHED:
+                self.status = event
+                self.finished_at = time.time()
+                if event == DONE:
+                    diagnostics = data.pop("diagnostics")
+                    metrics.record_solve(self.algorithm, diagnostics)
+                    if self.diagnostics:
+                        data["diagnostics"] = diagnostics
+                    self.result = data
+                elif event == FAILED:
+                    self.error = data["payload"]
+                    self.error_status = data["status"]
+                    metrics.record_failure(self.algorithm, self.error_status)
+            self.changed.notify_all()
+
+    def stream(self, cursor=0):
+        """
+        Generator Server-Sent Events: satu event `progress` per titik history
+        (id = index, untuk Last-Event-ID), lalu satu event status akhir.
+        """
+        while True:
+            notified = True
+            with self.changed:
+                if cursor >= len(self.history) and self.status not in FINISHED:
+                    notified = self.changed.wait(HEARTBEAT)
+                points = self.history[cursor:]
+                status = self.status
+
+            for point in points:
+                yield f"id: {cursor}\nevent: progress\ndata: {json.dumps(point)}\n\n"
+                cursor += 1
+            if not points and status in FINISHED:
+                yield f"event: {status}\ndata: {json.dumps(self.snapshot())}\n\n"
+                return
+            if not notified:
+                yield ": keep-alive\n\n"
+
+
+class JobManager:
+    def __init__(self, workers=JOB_WORKERS, executor=JOB_EXECUTOR, ttl=JOB_TTL):
+        self.workers = workers
+        self.kind = executor
+        self.ttl = ttl
+        self.jobs = {}
+        self._lock = threading.Lock()
+        self._executor = None
+        self._manager = None
+
+    def _pool(self):
+        # dibuat saat job pertama; "spawn" supaya proses worker tidak mewarisi
+        # thread / koneksi sqlite dari proses web
+        if self._executor is None:
+            if self.kind == "thread":
+                self._executor = ThreadPoolExecutor(self.workers, thread_name_prefix="solve-job")
+            else:
+                context = multiprocessing.get_context("spawn")
+                self._manager = context.Manager()
+                self._executor = ProcessPoolExecutor(self.workers, mp_context=context)
+            atexit.register(self.shutdown)
+        return self._executor
+
+    def _channel(self):
+        if self.kind == "thread":
+            return queue.Queue(), threading.Event()
+        return self._manager.Queue(), self._manager.Event()
+
+    def submit(self, algorithm, locations, params):
+        """Validasi lalu masukkan job ke antrian. Raise SolveError kalau input salah."""
+        validate_request(algorithm, params)
+
+        with self._lock:
+            self._prune()
+            executor = self._pool()
+            events, cancel = self._channel()
+            job = Job(algorithm, cancel, bool(params.get("diagnostics", False)))
+            self.jobs[job.id] = job
+
+        job.future = executor.submit(_run_job, algorithm, locations, params, events, cancel)
+        job.future.add_done_callback(lambda f: self._finished(f, events))
+        threading.Thread(target=self._pump, args=(job, events), daemon=True).start()
+        return job
+
+    def _pump(self, job, events):
+        # teruskan event dari worker ke objek Job sampai status akhir
+        while True:
+            event, data = events.get()
+            job._update(event, data)
+            if event in FINISHED:
+                return
+
+    def _finished(self, future, events):
+        # job dibatalkan sebelum jalan, atau worker mati (mis. pool rusak)
+        if future.cancelled():
+            events.put((CANCELLED, None))
+        elif future.exception() is not None:
+            events.put((FAILED, {"payload": {"error": str(future.exception())}, "status": 500}))
+
+    def get(self, job_id):
+        return self.jobs.get(job_id)
+
+    def cancel(self, job_id):
+        job = self.jobs.get(job_id)
+        if job is None:
+            return None
+        if job.status not in FINISHED:
+            job.cancel_event.set()
+            job.future.cancel()
+        return job
+
+    def _prune(self):
+        now = time.time()
+        expired = [
+            job_id for job_id, job in self.jobs.items()
+            if job.status in FINISHED and now - job.finished_at > self.ttl
+        ]
+        for job_id in expired:
+            del self.jobs[job_id]
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+        if self._manager is not None:
+            self._manager.shutdown()
+
+
+job_manager = JobManager()
@@ -0,0 +1,174 @@
+"""
+Telemetry solve: durasi per fase, request ke OSRM, hit ratio cache dan counter
+solver. Satu solve -> block `diagnostics` (Diagnostics.report()), dan semua
+solve diakumulasi di registry yang diekspor dalam format teks Prometheus
+(GET /metrics, tanpa dependency prometheus_client).
+
+Metrik dicatat di proses web dari block diagnostics: job async membawa
+diagnostics-nya bersama hasil dari proses worker, jadi tidak perlu collector
+multi-proses.
+"""
+from contextlib import contextmanager
+import threading
+import time
+
+from routing import osrm
+from routing.cache import route_cache, request_stats
+
+# bucket histogram durasi fase (detik)
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# nama -> (type, help)
+METRICS = {
+    "vrp_solve_requests_total": ("counter", "Solve requests by algorithm and status."),
+    "vrp_solve_phase_seconds": ("histogram", "Wall time per solve phase."),
+    "vrp_upstream_requests_total": ("counter", "Requests sent to OSRM by endpoint."),
+    "vrp_upstream_failures_total": ("counter", "OSRM requests that failed after retries."),
+    "vrp_route_cache_lookups_total": ("counter", "Route cache lookups during solves by result."),
+    "vrp_solver_moves_evaluated_total": ("counter", "Candidate moves / chromosomes evaluated."),
+    "vrp_solver_moves_accepted_total": ("counter", "Moves applied / offspring kept."),
+    "vrp_solver_improvements_total": ("counter", "Times the best solution improved."),
+    "vrp_solver_seconds_total": ("counter", "Time spent inside the solver loop."),
+}
+
+
+class Diagnostics:
+    """
+    Collector satu solve. Request OSRM & lookup cache dihitung per solve
+    (context variable selama phase()), jadi solve yang berjalan bersamaan di
+    proses yang sama tidak saling tercampur.
+    """
+
+    def __init__(self):
+        # matrix, insertion (warm start), solve, refine (hybrid), paths,
+        # serialize (sync /api/solve)
+        self.phases = {}
+        self.started = time.perf_counter()
+        self._upstream = dict.fromkeys(osrm.upstream_stats, 0)
+        self._cache = dict.fromkeys(route_cache.stats, 0)
+
+    @contextmanager
+    def phase(self, name):
+        started = time.perf_counter()
+        upstream = osrm.request_upstream.set(self._upstream)
+        cache = request_stats.set(self._cache)
+        try:
+            yield
+        finally:
+            request_stats.reset(cache)
+            osrm.request_upstream.reset(upstream)
+            self.phases[name] = self.phases.get(name, 0.0) + time.perf_counter() - started
+
+    def report(self, solver_stats=None):
+        upstream = dict(self._upstream)
+        cache = dict(self._cache)
+        lookups = cache["hits"] + cache["misses"]
+        return {
+            "phases": {name: round(seconds, 6) for name, seconds in self.phases.items()},
+            "totalSeconds": round(time.perf_counter() - self.started, 6),
+            "upstream": {
+                "tableRequests": upstream["table"],
+                "routeRequests": upstream["route"],
+                "failedRequests": upstream["failed"],
+            },
+            "cache": dict(cache, hitRatio=round(cache["hits"] / lookups, 4) if lookups else None),
+            "solver": solver_stats,
+        }
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(labels):
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in labels) + "}"
+
+
+def _number(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class MetricsRegistry:
+    """Counter & histogram in-memory (label = tuple pasangan (nama, nilai))."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counters = {}
+        # (nama, labels) -> [count per bucket..., sum, count]
+        self.histograms = {}
+
+    def inc(self, name, labels=(), amount=1):
+        if not amount:
+            return
+        with self._lock:
+            key = (name, tuple(labels))
+            self.counters[key] = self.counters.get(key, 0) + amount
+
+    def observe(self, name, value, labels=()):
+        with self._lock:
+            key = (name, tuple(labels))
+            data = self.histograms.setdefault(key, [0] * (len(BUCKETS) + 2))
+            for i, bound in enumerate(BUCKETS):
+                if value <= bound:
+                    data[i] += 1
+            data[-2] += value
+            data[-1] += 1
+
+    def render(self):
+        """Exposition format teks Prometheus 0.0.4."""
+        with self._lock:
+            counters = sorted(self.counters.items())
+            histograms = sorted(self.histograms.items())
+
+        lines = []
+        for name, (kind, help_text) in METRICS.items():
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            if kind == "counter":
+                for (metric, labels), value in counters:
+                    if metric == name:
+                        lines.append(f"{name}{_labels(labels)} {_number(value)}")
+                continue
+            for (metric, labels), data in histograms:
+                if metric != name:
+                    continue
+                for bound, count in zip(BUCKETS + (float("inf"),), data[:len(BUCKETS)] + [data[-1]]):
+                    lines.append(f"{name}_bucket{_labels(labels + (('le', _number(bound)),))} {count}")
+                lines.append(f"{name}_sum{_labels(labels)} {_number(data[-2])}")
+                lines.append(f"{name}_count{_labels(labels)} {data[-1]}")
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+
+def record_solve(algorithm, diagnostics):
+    """Catat satu solve yang selesai dari block diagnostics-nya."""
+    label = (("algorithm", algorithm),)
+    registry.inc("vrp_solve_requests_total", label + (("status", "ok"),))
+    for phase, seconds in diagnostics["phases"].items():
+        registry.observe("vrp_solve_phase_seconds", seconds, label + (("phase", phase),))
+
+    upstream = diagnostics["upstream"]
+    registry.inc("vrp_upstream_requests_total", (("endpoint", "table"),), upstream["tableRequests"])
+    registry.inc("vrp_upstream_requests_total", (("endpoint", "route"),), upstream["routeRequests"])
+    registry.inc("vrp_upstream_failures_total", (), upstream["failedRequests"])
+    cache = diagnostics["cache"]
+    registry.inc("vrp_route_cache_lookups_total", (("result", "hit"),), cache["hits"])
+    registry.inc("vrp_route_cache_lookups_total", (("result", "miss"),), cache["misses"])
+
+    solver = diagnostics.get("solver")
+    if solver:
+        registry.inc("vrp_solver_moves_evaluated_total", label, solver["movesEvaluated"])
+        registry.inc("vrp_solver_moves_accepted_total", label, solver["movesAccepted"])
+        registry.inc("vrp_solver_improvements_total", label, solver["improvements"])
+        registry.inc("vrp_solver_seconds_total", label, solver["seconds"])
+
+
+def record_failure(algorithm, status):
+    registry.inc("vrp_solve_requests_total", (("algorithm", algorithm), ("status", str(status))))
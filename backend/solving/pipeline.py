@@ -0,0 +1,127 @@
+"""
+Pipeline solve tanpa Flask: matriks jarak -> algoritma -> path visualisasi.
+Dipakai oleh endpoint /api/solve (sinkron) dan job async (solving/jobs.py).
+"""
+from routing.osrm import DistanceLookupError
+from routing.matrix import (DISTANCE_BACKENDS, DEFAULT_BACKEND, build_distance_matrix, build_paths,
+                            refine_route_cost, update_distance_matrix)
+
+from algorithms.TabuSearch import NEIGHBORHOODS
+from algorithms.GeneticAlgorithm import ENCODINGS
+from algorithms.population import DECODERS
+from algorithms.savings import INITIAL_SOLUTIONS
+from solving.errors import SolveError
+from solving.metrics import Diagnostics
+from solving.warmstart import validate_warm_start, apply_diff, warm_routes, warm_params
+from solving.runners import RUNNERS
+from solving.portfolio import run_portfolio, validate_portfolio
+
+# Portfolio = beberapa restart paralel dari algoritma di RUNNERS
+SOLVERS = dict(RUNNERS, portfolio=run_portfolio)
+
+
+def validate_request(algorithm, params):
+    # cek murah sebelum matriks dibangun / job masuk antrian
+    if algorithm not in SOLVERS:
+        raise SolveError({"error": "Algorithm Not Found"})
+    if algorithm == "portfolio":
+        validate_portfolio(params)
+
+    backend = params.get("distanceBackend", DEFAULT_BACKEND)
+    if backend not in DISTANCE_BACKENDS:
+        raise SolveError({"error": f"Unknown distance backend '{backend}'"})
+
+    neighborhood = params.get("neighborhood", "sampled")
+    if algorithm in ("tabu-search", "portfolio") and neighborhood not in NEIGHBORHOODS:
+        raise SolveError({"error": f"Unknown neighborhood '{neighborhood}'"})
+
+    initial = params.get("initialSolution", "default")
+    if algorithm in ("tabu-search", "simulated-annealing", "portfolio") and initial not in INITIAL_SOLUTIONS:
+        raise SolveError({"error": f"Unknown initial solution '{initial}'"})
+
+    encoding = params.get("encoding", "list")
+    if algorithm in ("genetic", "portfolio") and encoding not in ENCODINGS:
+        raise SolveError({"error": f"Unknown encoding '{encoding}'"})
+
+    decode = params.get("decode", "greedy")
+    if algorithm in ("genetic", "portfolio") and decode not in DECODERS:
+        raise SolveError({"error": f"Unknown decode mode '{decode}'"})
+
+    for key in ("timeBudget", "stagnationWindow"):
+        value = params.get(key)
+        if value is not None and (isinstance(value, bool) or not isinstance(value, (int, float)) or value <= 0):
+            raise SolveError({"error": f"'{key}' must be a positive number"})
+
+    validate_warm_start(params)
+
+
+def refine_result(result, locations, full_routes, methods, dist_car, dist_bike):
+    # hybrid: finalCost jadi jarak OSRM, cost estimasi tetap dilaporkan
+    delta, refinement = refine_route_cost(locations, full_routes, methods, dist_car, dist_bike)
+    result["estimatedCost"] = result["finalCost"]
+    result["finalCost"] = result["finalCost"] + delta
+    result["refinement"] = refinement
+
+
+def solve_request(algorithm, locations, params, progress=None):
+    """
+    Jalankan satu solve lengkap dan return dict hasil (format response API).
+    progress: callback opsional untuk setiap titik history baru.
+    Raise SolveError untuk input tidak valid / jarak yang gagal diambil.
+    result["diagnostics"] selalu diisi (timing per fase, upstream, cache,
+    counter solver); caller yang membuangnya kalau tidak diminta.
+    """
+    validate_request(algorithm, params)
+    backend = params.get("distanceBackend", DEFAULT_BACKEND)
+    diagnostics = Diagnostics()
+
+    # Warm start: locations = lokasi solve sebelumnya, diff diterapkan dulu
+    warm = params.get("warmStart")
+    prior_locations = locations
+    if warm is not None:
+        locations, prior_routes = apply_diff(locations, warm)
+        params = warm_params(params)
+
+    # Bangun matriks jarak (warm start: hanya baris & kolom lokasi baru)
+    try:
+        with diagnostics.phase("matrix"):
+            if warm is not None:
+                dist_car, dist_bike = update_distance_matrix(prior_locations, locations, backend)
+            else:
+                dist_car, dist_bike = build_distance_matrix(locations, backend)
+    except DistanceLookupError as e:
+        raise SolveError(e.report(locations), 502)
+
+    # Bangun demands
+    demands = [0] + [loc.get("demand", 0) for loc in locations[1:]]
+
+    solver_args = {}
+    if warm is not None:
+        with diagnostics.phase("insertion"):
+            solver_args["initial_routes"] = warm_routes(dist_car, dist_bike, demands, params["vehicles"], prior_routes)
+
+    with diagnostics.phase("solve"):
+        full_routes, methods, result = SOLVERS[algorithm](
+            dist_car, dist_bike, demands, params, progress, **solver_args
+        )
+
+    # Mode hybrid: refine edge yang dipakai dengan jarak OSRM
+    if backend == "hybrid":
+        with diagnostics.phase("refine"):
+            refine_result(result, locations, full_routes, methods, dist_car, dist_bike)
+
+    # Convert ke locations & generate path untuk visualisasi
+    result["vehicleRoutes"] = [[locations[i] for i in r] for r in full_routes]
+    with diagnostics.phase("paths"):
+        result["vehiclePaths"] = build_paths(locations, full_routes, methods, backend)
+    result["totalVehicles"] = len(full_routes)
+    result["distanceBackend"] = backend
+    if warm is not None:
+        result["locations"] = locations
+        result["warmStart"] = {
+            "added": len(warm.get("added", [])),
+            "removed": len(warm.get("removed", [])),
+        }
+    result["diagnostics"] = diagnostics.report(result.pop("solverStats", None))
+
+    return result
@@ -0,0 +1,162 @@
+"""
+Portfolio / multi-start: beberapa restart independen (seed berbeda, algoritma
+boleh campuran tabu / SA / GA) dijalankan paralel di process pool dalam satu
+budget waktu, lalu hasil terbaik yang dipakai. Restart yang sedang jalan
+berhenti sendiri di deadline budget dan tetap mengembalikan solusi terbaiknya.
+Matriks jarak ditaruh sekali di shared memory (SharedMatrix); worker hanya
+attach lewat nama, jadi matriks tidak di-pickle per task.
+"""
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+import multiprocessing
+import multiprocessing.util
+import threading
+import random
+import time
+import os
+
+import numpy as np
+
+from algorithms.core import merge_stats
+from algorithms.matrix import SharedMatrix, attach_shared, detach_shared, CAR, BIKE
+from solving.errors import SolveError
+from solving.runners import RUNNERS
+
+PORTFOLIO_WORKERS = int(os.environ.get("PORTFOLIO_WORKERS", os.cpu_count() or 1))
+DEFAULT_ALGORITHMS = ["tabu-search", "simulated-annealing", "genetic"]
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _run_restart(spec, algorithm, seed, demands, params, deadline, initial_routes=None):
+    """Satu restart di proses worker, berhenti paling lambat di deadline."""
+    shm, block = attach_shared(spec)
+    try:
+        random.seed(seed)
+        np.random.seed(seed % 2 ** 32)
+
+        started = time.perf_counter()
+        try:
+            full_routes, methods, result = RUNNERS[algorithm](
+                block[CAR], block[BIKE], demands, params, deadline=deadline,
+                initial_routes=initial_routes
+            )
+        finally:
+            block = None
+
+        result["finalCost"] = float(result["finalCost"])
+        return full_routes, methods, result, time.perf_counter() - started
+    finally:
+        detach_shared(shm)
+
+
+def _get_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(
+                PORTFOLIO_WORKERS, mp_context=multiprocessing.get_context("spawn")
+            )
+            # Finalize (bukan atexit) supaya tetap jalan kalau portfolio dipanggil
+            # dari proses worker job, yang keluar tanpa menjalankan atexit.
+            # Priority > 10 supaya jalan sebelum queue internal pool ditutup.
+            multiprocessing.util.Finalize(_pool, _pool.shutdown, exitpriority=100)
+        return _pool
+
+
+def validate_portfolio(params):
+    algorithms = params.get("algorithms", DEFAULT_ALGORITHMS)
+    unknown = [a for a in algorithms if a not in RUNNERS]
+    if not algorithms or unknown:
+        raise SolveError({"error": f"Unknown portfolio algorithms {unknown}"})
+
+
+def run_portfolio(dist_car, dist_bike, demands, params, progress=None, initial_routes=None):
+    """
+    Params:
+      algorithms  daftar algoritma, dipakai bergiliran per restart
+      restarts    jumlah restart (default = jumlah worker)
+      timeBudget  budget wall-clock dalam detik untuk semua restart
+      workers     maksimal restart yang jalan bersamaan
+      seed        seed awal; restart ke-i memakai seed + i
+    initial_routes: warm start, dipakai semua restart.
+    Restart yang belum dimulai saat budget habis dilewati ("skipped"),
+    restart yang raise dicatat "failed"; SolveError hanya kalau tidak ada
+    restart yang selesai.
+    """
+    algorithms = params.get("algorithms", DEFAULT_ALGORITHMS)
+    workers = max(1, min(int(params.get("workers", PORTFOLIO_WORKERS)), PORTFOLIO_WORKERS))
+    restarts = max(1, int(params.get("restarts", workers)))
+    budget = params.get("timeBudget")
+    base_seed = int(params.get("seed", random.randrange(2 ** 31)))
+    deadline = time.time() + float(budget) if budget else None
+
+    tasks = [(algorithms[i % len(algorithms)], base_seed + i) for i in range(restarts)]
+    pool = _get_pool()
+    runs = []
+    history = []
+    best = best_run = None
+    finished = []
+
+    with SharedMatrix(dist_car, dist_bike) as shared:
+        pending = {}
+        queue = list(enumerate(tasks))
+
+        while queue or pending:
+            # jaga jumlah restart yang jalan bersamaan <= workers;
+            # setelah deadline tidak ada restart baru yang dimulai
+            while queue and len(pending) < workers and (deadline is None or time.time() < deadline):
+                i, (algorithm, seed) = queue.pop(0)
+                future = pool.submit(_run_restart, shared.spec, algorithm, seed, demands, params,
+                                     deadline, initial_routes)
+                pending[future] = i
+            if not pending:
+                break
+
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                i = pending.pop(future)
+                algorithm, seed = tasks[i]
+                try:
+                    outcome = future.result()
+                except Exception as e:
+                    # satu restart gagal tidak menggagalkan portfolio
+                    runs.append({"restart": i, "algorithm": algorithm, "seed": seed, "status": "failed",
+                                 "error": str(e) or type(e).__name__})
+                    continue
+                run = {"restart": i, "algorithm": algorithm, "seed": seed, "status": "done",
+                       "cost": outcome[2]["finalCost"], "seconds": outcome[3],
+                       "stopReason": outcome[2]["stopReason"]}
+                finished.append(outcome[2]["solverStats"])
+                if best is None or run["cost"] < best_run["cost"]:
+                    best, best_run = outcome, run
+                runs.append(run)
+
+                history.append({"iteration": len(runs), "cost": best_run["cost"]})
+                if progress:
+                    progress(history[-1])
+
+        # restart yang tidak sempat dimulai sebelum deadline
+        for i, (algorithm, seed) in queue:
+            runs.append({"restart": i, "algorithm": algorithm, "seed": seed, "status": "skipped"})
+
+    if best is None:
+        failed = [r for r in runs if r["status"] == "failed"]
+        if failed and len(failed) == len(runs):
+            raise SolveError({"error": "All portfolio restarts failed", "restarts": failed}, 500)
+        raise SolveError({"error": "No portfolio restart finished within the time budget"}, 504)
+
+    full_routes, methods, result, _ = best
+    result.update({
+        "algorithm": "portfolio",
+        "history": history,
+        # counter semua restart yang selesai, bukan hanya yang terbaik
+        "solverStats": merge_stats(finished),
+        "portfolio": {
+            "best": {"algorithm": best_run["algorithm"], "seed": best_run["seed"]},
+            "restarts": sorted(runs, key=lambda r: r["restart"]),
+            "workers": workers,
+            "timeBudget": budget,
+        },
+    })
+    return full_routes, methods, result
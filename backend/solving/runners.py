@@ -0,0 +1,279 @@
+"""
+Satu run algoritma pada matriks yang sudah ada -> (full_routes, methods, result).
+Dipisah dari pipeline supaya bisa dipanggil langsung di proses worker.
+
+Semua runner juga berhenti lebih awal lewat params:
+  timeBudget        budget wall-clock solver dalam detik (mis. 0.8)
+  stagnationWindow  berhenti setelah sekian iterasi / generasi tanpa perbaikan
+Alasan berhenti ada di result["stopReason"].
+initial_routes (warm start): solusi awal per kendaraan untuk fleet
+params.vehicles (urutan Problem.from_vehicles); GA hanya memakai rutenya.
+"""
+import time
+
+from routing.profiles import ROUTE_METHOD
+from algorithms.core import BIKE_TYPES, CAR_TYPES, SearchStats, StopCriteria, is_bike_type
+
+# TABU SEARCH
+from algorithms.TabuSearch import solve_tabu_search
+# SIMULATED ANNEALING
+from algorithms.simulatedAnnealing import simulated_annealing
+# GENETIC ALGORITHM
+from algorithms.GeneticAlgorithm import genetic_algorithm, island_genetic_algorithm, FITNESS_CACHE_SIZE, LOCAL_SEARCH_SIZE
+
+
+def stop_criteria(params, deadline=None):
+    # deadline dari caller (mis. budget portfolio) dipakai kalau lebih awal
+    budget = params.get("timeBudget")
+    if budget is not None:
+        own = time.time() + float(budget)
+        deadline = own if deadline is None else min(deadline, own)
+    stagnation = params.get("stagnationWindow")
+    return StopCriteria(deadline, int(stagnation) if stagnation else None)
+
+
+# ============================
+# ALGORITHM: TABU SEARCH
+# ============================
+def run_tabu_search(dist_car, dist_bike, demands, params, progress=None, deadline=None,
+                    initial_routes=None):
+    # Return (full_routes, methods, result) untuk satu run tabu search
+    vehicles = params.get("vehicles", [])
+
+    max_iter = params.get("maxIterations", 500)
+    neighborhood = params.get("neighborhood", "sampled")
+    stats = SearchStats()
+    stop = stop_criteria(params, deadline)
+
+    best_routes, best_cost, history, vehicle_list = solve_tabu_search(
+        dist_car,
+        dist_bike,
+        demands,
+        vehicles,
+        max_iter,
+        tabu_tenure=int(params.get("tabuTenure", 10)),
+        neighborhood=neighborhood,
+        granular_k=int(params.get("granularK", 10)),
+        tenure_jitter=int(params.get("tenureJitter", 0)),
+        dynamic_tenure=bool(params.get("dynamicTenure", False)),
+        initial=params.get("initialSolution", "default"),
+        progress=progress,
+        stats=stats,
+        stop=stop,
+        initial_routes=initial_routes
+    )
+
+    full_routes = []
+    vehicle_types = []
+
+    for idx, route in enumerate(best_routes):
+        if idx < len(vehicle_list):
+            vtype = vehicle_list[idx]["type"]
+        else:
+            vtype = "unknown"
+
+        vehicle_types.append(vtype)
+        full_routes.append([0] + route + [0])
+
+    methods = [ROUTE_METHOD.BIKE if is_bike_type(t) else ROUTE_METHOD.CAR for t in vehicle_types]
+
+    result = {
+        "algorithm": "tabu-search",
+        "neighborhood": neighborhood,
+        "vehicleTypes": vehicle_types,
+        "finalCost": best_cost,
+        "history": history,
+        "stopReason": stop.reason,
+        "solverStats": stats.report()
+    }
+
+    return full_routes, methods, result
+
+
+# ============================
+# ALGORITHM: SIMULATED ANNEALING
+# ============================
+def run_simulated_annealing(dist_car, dist_bike, demands, params, progress=None, deadline=None,
+                            initial_routes=None):
+    # Return (full_routes, methods, result) untuk satu run SA
+    vehicles = params.get("vehicles", [])
+
+    max_iter = params.get("maxIterations", 500)
+    initial_temp = params.get("initialTemp", 1000)
+    cooling_rate = params.get("coolingRate", 0.995)
+
+    stats = SearchStats()
+    stop = stop_criteria(params, deadline)
+
+    best_routes, best_cost, history, vehicle_list = simulated_annealing(
+        dist_car,
+        dist_bike,
+        demands,
+        vehicles,
+        max_iter,
+        initial_temp,
+        cooling_rate,
+        progress=progress,
+        initial=params.get("initialSolution", "default"),
+        stats=stats,
+        stop=stop,
+        initial_routes=initial_routes
+    )
+
+    full_routes = []
+    vehicle_types = []
+
+    for idx, route in enumerate(best_routes):
+        if not route:
+            continue
+
+        vtype = vehicle_list[idx]["type"]
+        vehicle_types.append(vtype)
+
+        # Tambahkan depot di awal, dan handle depot markers (0) di tengah
+        route_with_depots = [0]  # Start from depot
+
+        for customer in route:
+            if customer == 0:
+                # Marker untuk kembali ke depot dan mulai trip baru
+                route_with_depots.append(0)  # Kembali ke depot
+                route_with_depots.append(0)  # Mulai dari depot lagi
+            else:
+                route_with_depots.append(customer)
+
+        route_with_depots.append(0)  # End at depot
+        full_routes.append(route_with_depots)
+
+    methods = [ROUTE_METHOD.BIKE if is_bike_type(t) else ROUTE_METHOD.CAR for t in vehicle_types]
+
+    result = {
+        "algorithm": "simulated-annealing",
+        "vehicleTypes": vehicle_types,
+        "finalCost": best_cost,
+        "history": history,
+        "stopReason": stop.reason,
+        "solverStats": stats.report(),
+        "parameters": {
+            "initialTemp": initial_temp,
+            "coolingRate": cooling_rate,
+            "maxIterations": max_iter
+        }
+    }
+
+    return full_routes, methods, result
+
+
+# ============================
+# ALGORITHM: GENETIC
+# ============================
+def run_genetic(dist_car, dist_bike, demands, params, progress=None, deadline=None,
+                initial_routes=None):
+    # Return (full_routes, methods, result) untuk satu run GA
+    vehicles = params.get("vehicles", [])
+
+    car_count = 0
+    bike_count = 0
+    car_capacity = 100  # default capacity
+    bike_capacity = 50   # default capacity
+
+    for vehicle in vehicles:
+        vtype = vehicle.get("type", "").lower()
+        count = vehicle.get("count", 1)
+        cap = vehicle.get("capacity", 0)
+
+        if vtype in CAR_TYPES:
+            car_count = count
+            if cap > 0:
+                car_capacity = cap
+        elif vtype in BIKE_TYPES:
+            bike_count = count
+            if cap > 0:
+                bike_capacity = cap
+
+    # default value
+    if car_count == 0 and bike_count == 0:
+        car_count = 2
+        bike_count = 1
+
+    ga_args = (
+        dist_car,
+        dist_bike,
+        params.get("populationSize", 50),
+        params.get("generations", 100),
+        params.get("mutationRate", 0.05),
+        car_count,
+        bike_count,
+        car_capacity,
+        bike_capacity,
+        demands,
+    )
+
+    # fitnessCacheSize 0 = tanpa memo fitness / cost rute (hanya encoding list)
+    cache_size = int(params.get("fitnessCacheSize", FITNESS_CACHE_SIZE))
+    encoding = params.get("encoding", "list")
+    # decode "split": rute dari split optimal (selalu memakai populasi array)
+    decode = params.get("decode", "greedy")
+    if decode == "split":
+        encoding = "array"
+    split_max_length = params.get("splitMaxLength")
+    # memetic opt-in: chrom terbaik per generasi yang diperbaiki local search, 0 = GA murni (default)
+    local_search = int(params.get("localSearch", LOCAL_SEARCH_SIZE))
+
+    # islands > 1: populationSize dibagi ke beberapa island paralel
+    islands = int(params.get("islands", 1))
+    island_info = None
+    stats = SearchStats()
+    stop = stop_criteria(params, deadline)
+    if islands > 1:
+        routes_with_types, cost, history, island_info, cache = island_genetic_algorithm(
+            *ga_args,
+            islands=islands,
+            migration_interval=params.get("migrationInterval", 10),
+            migration_size=params.get("migrationSize", 2),
+            workers=params.get("islandWorkers"),
+            cache_size=cache_size,
+            encoding=encoding,
+            decode=decode,
+            split_max_length=split_max_length,
+            progress=progress,
+            stats=stats,
+            stop=stop,
+            initial_routes=initial_routes,
+            local_search=local_search
+        )
+    else:
+        routes_with_types, cost, history, cache = genetic_algorithm(
+            *ga_args, cache_size=cache_size, encoding=encoding, decode=decode,
+            split_max_length=split_max_length, progress=progress, stats=stats, stop=stop,
+            initial_routes=initial_routes, local_search=local_search
+        )
+
+    full_routes = [route_info["route"] for route_info in routes_with_types]
+    vehicle_types = [route_info["type"] for route_info in routes_with_types]
+
+    methods = [ROUTE_METHOD.BIKE if is_bike_type(t) else ROUTE_METHOD.CAR for t in vehicle_types]
+
+    result = {
+        "algorithm": "genetic",
+        "encoding": encoding,
+        "decode": decode,
+        "vehicleTypes": vehicle_types,
+        "finalCost": cost,
+        "history": history,
+        "stopReason": stop.reason,
+        "solverStats": stats.report()
+    }
+    # cache fitness / cost rute hanya ada di encoding list
+    if cache is not None:
+        result["cache"] = cache
+    if island_info is not None:
+        result["islandModel"] = island_info
+
+    return full_routes, methods, result
+
+
+RUNNERS = {
+    "tabu-search": run_tabu_search,
+    "simulated-annealing": run_simulated_annealing,
+    "genetic": run_genetic,
+}
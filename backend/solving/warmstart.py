@@ -0,0 +1,98 @@
+"""
+Warm start / re-optimisasi incremental dari plan sebelumnya.
+
+    params.warmStart = {
+        "vehicleRoutes": [...],   # vehicleRoutes dari response sebelumnya
+        "added":   [lokasi baru],
+        "removed": [lokasi atau nama lokasi yang dihapus]
+    }
+
+`locations` di request = daftar lokasi solve sebelumnya (depot di index 0).
+Daftar lokasi baru = lokasi lama tanpa `removed`, lalu `added` di akhir;
+response warm start mengembalikannya di result["locations"] untuk diff
+berikutnya. Lokasi dicocokkan lewat nama (case-insensitive, seperti
+/api/locations/delete), atau koordinat kalau tidak punya nama.
+
+Rute lama (tanpa stop yang dihapus) dibagi ulang ke fleet, stop baru
+disisipkan dengan cheapest insertion, lalu solver memperbaiki dari situ
+dengan budget pendek (timeBudget default WARM_START_BUDGET).
+"""
+import os
+
+from algorithms.core import Problem
+from algorithms.insertion import insert_customers
+from algorithms.savings import assign_routes
+from routing.cache import point_key
+from solving.errors import SolveError
+
+# budget solver default untuk re-solve warm start (detik)
+WARM_START_BUDGET = float(os.environ.get("WARM_START_BUDGET", 0.5))
+
+
+def location_id(loc):
+    if isinstance(loc, str):
+        return loc.lower()
+    name = loc.get("name")
+    return name.lower() if name else point_key(loc)
+
+
+def validate_warm_start(params):
+    warm = params.get("warmStart")
+    if warm is None:
+        return
+    if not isinstance(warm, dict) or not isinstance(warm.get("vehicleRoutes"), list):
+        raise SolveError({"error": "warmStart needs the previous 'vehicleRoutes'"})
+    if not params.get("vehicles"):
+        raise SolveError({"error": "warmStart needs 'vehicles' in params"})
+
+
+def apply_diff(locations, warm):
+    """
+    Return (lokasi baru, rute lama sebagai list customer index lokasi baru).
+    Raise SolveError kalau diff tidak cocok dengan daftar lokasi.
+    """
+    ids = [location_id(loc) for loc in locations]
+    removed = {location_id(loc) for loc in warm.get("removed", [])}
+    if ids and ids[0] in removed:
+        raise SolveError({"error": "The depot cannot be removed"})
+    unknown = removed - set(ids)
+    if unknown:
+        raise SolveError({"error": f"Removed locations not found: {sorted(unknown)}"})
+
+    added = warm.get("added", [])
+    kept = [loc for loc, i in zip(locations, ids) if i not in removed]
+    kept_ids = {location_id(loc) for loc in kept}
+    duplicate = [location_id(loc) for loc in added if location_id(loc) in kept_ids]
+    if duplicate:
+        raise SolveError({"error": f"Added locations already exist: {duplicate}"})
+
+    new_locations = kept + list(added)
+    index = {location_id(loc): i for i, loc in enumerate(new_locations)}
+    routes = []
+    for route in warm["vehicleRoutes"]:
+        # depot (0) dan stop yang sudah tidak ada dibuang
+        customers = [index.get(location_id(loc)) for loc in route]
+        routes.append([c for c in customers if c])
+    return new_locations, routes
+
+
+def warm_routes(dist_car, dist_bike, demands, vehicles, prior_routes):
+    """
+    Solusi awal per kendaraan (urutan fleet Problem.from_vehicles): rute lama
+    dibagi ke kendaraan, customer yang belum terlayani disisipkan termurah.
+    """
+    problem = Problem.from_vehicles(dist_car, dist_bike, demands, vehicles)
+    if problem.total_vehicles == 0:
+        raise SolveError({"error": "warmStart needs at least one vehicle"})
+    routes = assign_routes([r for r in prior_routes if r], problem.route_matrix,
+                           problem.capacities, demands)
+    routed = {c for r in routes for c in r}
+    insert_customers(problem, routes, [c for c in problem.customers if c not in routed])
+    return routes
+
+
+def warm_params(params):
+    # re-solve dari plan yang sudah bagus: budget pendek kalau tidak diatur
+    if params.get("timeBudget") is None:
+        return dict(params, timeBudget=WARM_START_BUDGET)
+    return params
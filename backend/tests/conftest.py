@@ -0,0 +1,107 @@
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlsplit
+import json
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from routing import osrm
+from routing.cache import RouteCache
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    # cache sqlite terpisah per test, bukan data/route_cache.sqlite
+    cache = RouteCache(str(tmp_path / "cache.sqlite"))
+    monkeypatch.setattr(osrm, "route_cache", cache)
+    return cache
+
+
+def grid_locations(n):
+    return [{"name": f"L{i}", "lat": -7.25 + (i // 10) * 0.01, "lng": 112.75 + (i % 10) * 0.01} for i in range(n)]
+
+
+def fake_distance(p, q):
+    # jarak deterministik dari koordinat (meter kasar)
+    return round(abs(p["lat"] - q["lat"]) * 111000 + abs(p["lng"] - q["lng"]) * 111000, 1)
+
+
+class FakeOsrm:
+    """Pengganti osrm._get_json: menjawab /table dan /route, mencatat setiap request."""
+
+    def __init__(self):
+        self.tables = []
+        self.routes = []
+        self.fail = lambda points: False
+        # pasangan tanpa rute: null di /table, NoRoute di /route
+        self.no_route = lambda p, q: False
+        # jeda per request (detik), untuk mengukur durasi fetch
+        self.delay = 0.0
+
+    def _distance(self, p, q):
+        return None if p != q and self.no_route(p, q) else fake_distance(p, q)
+
+    def __call__(self, url, params, timeout):
+        path = url.split("/")
+        points = [{"lng": float(c.split(",")[0]), "lat": float(c.split(",")[1])} for c in path[-1].split(";")]
+        if self.fail(points):
+            raise osrm.requests.ConnectionError("fake outage")
+        time.sleep(self.delay)
+        if path[-4] == "table":
+            sources = [int(i) for i in params["sources"].split(";")] if "sources" in params else range(len(points))
+            destinations = ([int(i) for i in params["destinations"].split(";")]
+                            if "destinations" in params else range(len(points)))
+            self.tables.append((points, list(sources), list(destinations)))
+            return {"code": "Ok", "distances": [[self._distance(points[a], points[b]) for b in destinations]
+                                                 for a in sources]}
+        self.routes.append(points)
+        if self.no_route(*points):
+            return {"code": "NoRoute", "message": "Impossible route between points"}
+        return {"code": "Ok", "routes": [{"distance": fake_distance(*points),
+                                          "geometry": {"coordinates": [[p["lng"], p["lat"]] for p in points]}}]}
+
+
+@pytest.fixture
+def fake_osrm(monkeypatch, cache):
+    fake = FakeOsrm()
+    monkeypatch.setattr(osrm, "_get_json", fake)
+    return fake
+
+
+class _OsrmHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        url = urlsplit(self.path)
+        try:
+            body = self.server.fake(url.path, dict(parse_qsl(url.query)), None)
+            status = 400 if body["code"] != "Ok" else 200
+        except osrm.requests.ConnectionError:
+            body, status = {"message": "fake outage"}, 503
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def osrm_server(monkeypatch, cache):
+    """Server OSRM palsu di localhost: request lewat HTTP sungguhan (_get_json, session, retry)."""
+    fake = FakeOsrm()
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _OsrmHandler)
+    server.fake = fake
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    monkeypatch.setattr(osrm, "OSRM_URL", f"http://127.0.0.1:{server.server_port}")
+    monkeypatch.setattr(osrm, "RETRY_BACKOFF", 0)
+    yield fake
+    server.shutdown()
+    server.server_close()
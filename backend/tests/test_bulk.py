@@ -0,0 +1,19 @@
+import pytest
+
+from conftest import grid_locations
+from solving.bulk import BulkSolve, BULK_WORKERS
+from solving.errors import SolveError
+
+
+@pytest.mark.parametrize("workers", ["two", 0, -1, 1.5, True, None])
+def test_invalid_workers_rejected(workers):
+    header = {"locations": grid_locations(3), "params": {"workers": workers, "distanceBackend": "haversine"}}
+    with pytest.raises(SolveError) as error:
+        BulkSolve("tabu-search", header)
+    assert error.value.status == 400
+    assert "workers" in error.value.payload["error"]
+
+
+def test_workers_capped_by_pool_size():
+    header = {"locations": grid_locations(3), "params": {"workers": 10 ** 6, "distanceBackend": "haversine"}}
+    assert BulkSolve("tabu-search", header).workers == BULK_WORKERS
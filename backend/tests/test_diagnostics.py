@@ -0,0 +1,50 @@
+import threading
+
+from conftest import grid_locations
+from routing import osrm
+from routing.osrm import ROUTE_METHOD
+from solving.metrics import Diagnostics
+
+
+def test_counts_only_lookups_of_this_solve(fake_osrm):
+    locations = grid_locations(6)
+    diagnostics = Diagnostics()
+    with diagnostics.phase("matrix"):
+        osrm.fetch_matrix(locations, ROUTE_METHOD.CAR)
+    # lookup di luar fase / solve lain tidak ikut dihitung
+    osrm.fetch_matrix(grid_locations(8), ROUTE_METHOD.BIKE)
+    with diagnostics.phase("paths"):
+        osrm.build_vehicle_paths(locations, [[0, 1, 2, 0]], [ROUTE_METHOD.CAR])
+
+    report = diagnostics.report()
+    assert report["upstream"] == {"tableRequests": 1, "routeRequests": 3, "failedRequests": 0}
+    # 30 pasangan matriks + 3 leg geometri, semuanya miss
+    assert report["cache"]["misses"] == 33
+    assert report["cache"]["writes"] == 33
+    assert report["cache"]["hitRatio"] == 0
+
+
+def test_concurrent_solves_not_mixed(fake_osrm):
+    reports = {}
+    barrier = threading.Barrier(2)
+
+    def solve(name, locations):
+        n = len(locations)
+        diagnostics = Diagnostics()
+        barrier.wait()
+        with diagnostics.phase("paths"):
+            osrm.build_vehicle_paths(locations, [list(range(n)) + [0]], [ROUTE_METHOD.CAR])
+        reports[name] = diagnostics.report()
+
+    # lokasi tidak saling overlap, jadi tidak ada leg yang diambil dari cache solve lain
+    locations = grid_locations(12)
+    threads = [threading.Thread(target=solve, args=("small", locations[:3])),
+               threading.Thread(target=solve, args=("large", locations[3:]))]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert reports["small"]["upstream"]["routeRequests"] == 3
+    assert reports["large"]["upstream"]["routeRequests"] == 9
+    assert osrm.upstream_stats["route"] >= 12
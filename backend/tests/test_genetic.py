@@ -0,0 +1,95 @@
+import os
+import random
+from collections import OrderedDict
+
+import numpy as np
+import pytest
+
+from algorithms import GeneticAlgorithm
+from algorithms.GeneticAlgorithm import genetic_algorithm, island_genetic_algorithm, _evolve_island
+from algorithms.matrix import SharedMatrix, detach_shared
+from solving.instances import read_instance
+from solving.runners import RUNNERS
+
+
+INSTANCE = os.path.join(os.path.dirname(__file__), "..", "benchmarks", "instances", "A-n32-k5.vrp")
+# cost rute Clarke-Wright (chrom pertama populasi) untuk A-n32-k5
+SAVINGS_COST = 832
+
+
+def run(local_search, **kwargs):
+    instance = read_instance(INSTANCE)
+    dist_car, dist_bike = instance.matrices
+    random.seed(0)
+    np.random.seed(0)
+    return genetic_algorithm(dist_car, dist_bike, 40, 40, 0.05, 5, 0, 100, 100, instance.demands,
+                             local_search=local_search, **kwargs)
+
+
+def island_config(demands):
+    return dict(pop_size=20, mutation_rate=0.05, car_count=5, bike_count=0, car_capacity=100,
+                bike_capacity=100, demands=demands, deadline=None)
+
+
+@pytest.mark.parametrize("kwargs", [{}, {"encoding": "array"}, {"decode": "split"}])
+def test_improves_past_savings_seed(kwargs):
+    routes, cost, history, _ = run(1, **kwargs)
+    assert history[0]["cost"] <= SAVINGS_COST
+    assert cost < SAVINGS_COST
+    assert sorted(c for r in routes for c in r["route"][1:-1]) == list(range(1, 32))
+
+
+def test_local_search_off_keeps_plain_ga():
+    _, cost, _, _ = run(0)
+    assert cost == SAVINGS_COST
+
+
+def test_islands_evolve_separately():
+    instance = read_instance(INSTANCE)
+    dist_car, dist_bike = instance.matrices
+    random.seed(0)
+    np.random.seed(0)
+    _, cost, history, _, _ = island_genetic_algorithm(dist_car, dist_bike, 40, 20, 0.05, 5, 0, 100, 100,
+                                                      instance.demands, islands=2, migration_interval=5,
+                                                      local_search=1)
+    assert cost < SAVINGS_COST
+    assert any(len(set(h["islandCosts"])) > 1 for h in history)
+
+
+def test_island_worker_keeps_solver_between_epochs(monkeypatch):
+    solvers = OrderedDict()
+    monkeypatch.setattr(GeneticAlgorithm, "_island_solvers", solvers)
+    monkeypatch.setattr(GeneticAlgorithm, "ISLAND_SOLVERS_PER_WORKER", 1)
+    instance = read_instance(INSTANCE)
+    config = island_config(instance.demands)
+
+    with SharedMatrix(*instance.matrices) as first, SharedMatrix(*instance.matrices) as second:
+        try:
+            population, _, _, _ = _evolve_island(first.spec, config, None, 5, 0, True)
+            solver = solvers[first.spec[0]][1]
+            _, _, _, (counts, stats) = _evolve_island(first.spec, config, population, 5, 1, True)
+
+            assert solvers[first.spec[0]][1] is solver
+            # populasi epoch sebelumnya sudah ada di cache fitness solver
+            assert counts["fitness"][0] >= len(population)
+            # counter dikirim per epoch, bukan kumulatif
+            assert stats["iterations"] == 5
+
+            # run baru menggantikan solver run lama
+            _evolve_island(second.spec, config, None, 1, 0, True)
+            assert list(solvers) == [second.spec[0]]
+        finally:
+            for shm, _ in solvers.values():
+                detach_shared(shm)
+            solvers.clear()
+
+
+@pytest.mark.parametrize("params, cached", [({}, True), ({"encoding": "array"}, False), ({"decode": "split"}, False)])
+def test_cache_reported_only_when_used(params, cached):
+    instance = read_instance(INSTANCE)
+    random.seed(0)
+    _, _, result = RUNNERS["genetic"](*instance.matrices, instance.demands,
+                                      dict(instance.params, generations=5, **params))
+    assert ("cache" in result) == cached
+    if cached:
+        assert result["cache"]["fitness"]["misses"] > 0
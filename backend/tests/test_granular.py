@@ -0,0 +1,37 @@
+import numpy as np
+
+from algorithms.core import Problem
+from algorithms.granular import GranularNeighborhood
+
+
+def asymmetric_problem(cars, bikes, n=30, seed=0):
+    rng = np.random.default_rng(seed)
+    # matriks motor tidak sebanding dengan mobil (profil OSRM berbeda)
+    dist_car = rng.random((n, n)) * 100
+    dist_bike = rng.random((n, n)) * 100
+    demands = [0] + [1] * (n - 1)
+    return Problem.from_counts(dist_car, dist_bike, demands, cars, bikes, 50, 20)
+
+
+def candidates(granular):
+    return set(zip(granular.U.tolist(), granular.V.tolist()))
+
+
+def test_bike_fleet_gets_bike_neighbors():
+    problem = asymmetric_problem(2, 2)
+    granular = GranularNeighborhood(problem, 5)
+
+    pairs = candidates(granular)
+    assert len(pairs) == len(granular.U)
+    for profile in (0, 1):
+        lists = problem.neighbors(5, profile)
+        for u in range(1, problem.matrices.n):
+            assert {(u, v) for v in lists[u].tolist()} <= pairs
+
+
+def test_car_only_fleet_keeps_car_list():
+    problem = asymmetric_problem(3, 0)
+    granular = GranularNeighborhood(problem, 5)
+
+    lists = problem.neighbors(5, 0)
+    assert granular.V.tolist() == lists[1:].ravel().tolist()
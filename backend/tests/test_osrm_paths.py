@@ -0,0 +1,73 @@
+from conftest import grid_locations
+from routing import osrm
+from routing.osrm import ROUTE_METHOD
+
+CAR = ROUTE_METHOD.CAR
+BIKE = ROUTE_METHOD.BIKE
+
+
+def coords(*locations):
+    return [[loc["lng"], loc["lat"]] for loc in locations]
+
+
+def test_duplicate_legs_fetched_once(fake_osrm):
+    locations = grid_locations(4)
+    legs = [(0, 1, CAR), (1, 0, CAR), (0, 1, CAR), (0, 1, BIKE)]
+
+    paths = osrm.fetch_route_paths(locations, legs)
+
+    # (0, 1) mobil cukup sekali; arah & profil berbeda = leg berbeda
+    assert len(fake_osrm.routes) == 3
+    assert set(paths) == {(0, 1, CAR), (1, 0, CAR), (0, 1, BIKE)}
+    assert paths[(1, 0, CAR)] == coords(locations[1], locations[0])
+
+
+def test_vehicle_paths_follow_route_order(fake_osrm):
+    locations = grid_locations(5)
+    full_routes = [[0, 3, 1, 0], [0, 2, 4, 0], [0, 1, 3, 0]]
+    methods = [CAR, BIKE, CAR]
+
+    vehicle_paths = osrm.build_vehicle_paths(locations, full_routes, methods)
+
+    assert len(vehicle_paths) == 3
+    for route, path in zip(full_routes, vehicle_paths):
+        expected = []
+        for i, j in zip(route, route[1:]):
+            expected += coords(locations[i], locations[j])
+        assert path == expected
+    assert osrm.route_stats["legs"] == 9
+    assert osrm.route_stats["requests"] == len(fake_osrm.routes) == 9
+
+    fake_osrm.routes.clear()
+    assert osrm.build_vehicle_paths(locations, full_routes, methods) == vehicle_paths
+    assert fake_osrm.routes == []
+
+
+def test_failed_leg_drawn_empty_and_retried(fake_osrm):
+    locations = grid_locations(4)
+    broken = coords(locations[2], locations[3])
+    fake_osrm.fail = lambda points: coords(*points) == broken
+
+    vehicle_paths = osrm.build_vehicle_paths(locations, [[0, 2, 3, 0]], [CAR])
+
+    # leg yang gagal digambar kosong, leg lain tetap lengkap
+    assert vehicle_paths == [coords(locations[0], locations[2]) + coords(locations[3], locations[0])]
+
+    # gagal sementara tidak di-negative cache: request berikutnya di-fetch ulang
+    fake_osrm.fail = lambda points: False
+    fake_osrm.routes.clear()
+    vehicle_paths = osrm.build_vehicle_paths(locations, [[0, 2, 3, 0]], [CAR])
+    assert len(fake_osrm.routes) == 1
+    assert vehicle_paths[0][2:4] == broken
+
+
+def test_leg_without_route_negatively_cached(fake_osrm):
+    locations = grid_locations(3)
+    fake_osrm.no_route = lambda p, q: True
+
+    paths = osrm.fetch_route_paths(locations, [(0, 2, BIKE)])
+    assert paths == {(0, 2, BIKE): []}
+
+    fake_osrm.no_route = lambda p, q: False
+    assert osrm.fetch_route_paths(locations, [(0, 2, BIKE)]) == {(0, 2, BIKE): []}
+    assert len(fake_osrm.routes) == 1
@@ -0,0 +1,187 @@
+import pytest
+
+from conftest import grid_locations, fake_distance
+from routing import osrm
+from routing.osrm import ROUTE_METHOD
+
+
+def covered_pairs(tiles):
+    return [(i, j) for rows, cols in tiles for i in rows for j in cols]
+
+
+def test_tiles_single_request_when_everything_fits(monkeypatch):
+    monkeypatch.setattr(osrm, "MAX_TABLE_SIZE", 10)
+    rows = list(range(10))
+    assert osrm._tiles(rows, rows) == [(rows, rows)]
+
+
+def test_tiles_split_respects_table_limit(monkeypatch):
+    monkeypatch.setattr(osrm, "MAX_TABLE_SIZE", 10)
+    rows = list(range(25))
+    tiles = osrm._tiles(rows, rows)
+
+    # tile 5 x 5 -> 5 blok per sisi
+    assert len(tiles) == 25
+    assert all(len(set(r) | set(c)) <= 10 for r, c in tiles)
+    pairs = covered_pairs(tiles)
+    assert len(pairs) == len(set(pairs)) == 25 * 25
+
+
+def test_tiles_thin_side_not_split(monkeypatch):
+    monkeypatch.setattr(osrm, "MAX_TABLE_SIZE", 10)
+    # satu lokasi baru x 24 lokasi: 9 kolom per request
+    tiles = osrm._tiles([24], list(range(24)))
+    assert len(tiles) == 3
+    assert all(rows == [24] and len(cols) <= 9 for rows, cols in tiles)
+
+
+def test_cover_new_location_only():
+    missing = [(5, j) for j in range(8) if j != 5] + [(i, 5) for i in range(8) if i != 5]
+    assert osrm._cover(missing, 8) == [5]
+
+
+def test_cover_everything_missing():
+    missing = [(i, j) for i in range(6) for j in range(6) if i != j]
+    assert osrm._cover(missing, 6) == list(range(6))
+
+
+def test_fetch_matrix_request_count(fake_osrm, monkeypatch):
+    monkeypatch.setattr(osrm, "MAX_TABLE_SIZE", 10)
+    locations = grid_locations(25)
+
+    matrix, unresolved = osrm.fetch_matrix(locations, ROUTE_METHOD.CAR)
+
+    assert unresolved == []
+    assert len(fake_osrm.tables) == len(osrm._tiles(list(range(25)), list(range(25))))
+    assert all(len(points) <= 10 for points, _, _ in fake_osrm.tables)
+    for i in range(25):
+        for j in range(25):
+            expected = 0 if i == j else fake_distance(locations[i], locations[j])
+            assert matrix[i][j] == expected
+
+    # semua pasangan sudah di cache: tidak ada request lagi
+    osrm.fetch_matrix(locations, ROUTE_METHOD.CAR)
+    assert len(fake_osrm.tables) == 25
+
+
+def test_fetch_matrix_only_fetches_missing_rows_and_columns(fake_osrm, monkeypatch):
+    monkeypatch.setattr(osrm, "MAX_TABLE_SIZE", 10)
+    locations = grid_locations(21)
+    osrm.fetch_matrix(locations[:20], ROUTE_METHOD.CAR)
+    fake_osrm.tables.clear()
+
+    matrix, unresolved = osrm.fetch_matrix(locations, ROUTE_METHOD.CAR)
+
+    assert unresolved == []
+    new = locations[20]
+    point = (new["lat"], new["lng"])
+    requested = set()
+    for points, sources, destinations in fake_osrm.tables:
+        rows = [(points[a]["lat"], points[a]["lng"]) for a in sources]
+        cols = [(points[b]["lat"], points[b]["lng"]) for b in destinations]
+        # setiap request: lokasi baru sebagai satu-satunya source atau destination
+        assert rows == [point] or cols == [point]
+        requested |= {(p, q) for p in rows for q in cols if p != q}
+    assert len(requested) == 2 * 20
+    assert matrix[20][3] == fake_distance(new, locations[3])
+    assert matrix[3][20] == fake_distance(locations[3], new)
+
+
+def test_failed_tile_surfaces_as_unresolved(fake_osrm, monkeypatch):
+    monkeypatch.setattr(osrm, "MAX_TABLE_SIZE", 10)
+    locations = grid_locations(25)
+    broken = locations[24]
+    fake_osrm.fail = lambda points: any(p["lat"] == broken["lat"] and p["lng"] == broken["lng"] for p in points)
+
+    matrix, unresolved = osrm.fetch_matrix(locations, ROUTE_METHOD.CAR)
+
+    assert unresolved
+    assert all(matrix[i][j] is None for i, j in unresolved)
+    assert {(24, j) for j in range(24)} <= set(unresolved)
+    assert matrix[0][1] == fake_distance(locations[0], locations[1])
+
+    with pytest.raises(osrm.DistanceLookupError) as error:
+        osrm.build_distance_matrix(locations)
+    report = error.value.report(locations)
+    assert report["unresolvedCount"] == len(error.value.unresolved)
+    assert report["unresolvedPairs"][0]["profile"] in (ROUTE_METHOD.CAR.value, ROUTE_METHOD.BIKE.value)
+
+
+def test_failed_tile_not_negatively_cached(fake_osrm, monkeypatch):
+    monkeypatch.setattr(osrm, "MAX_TABLE_SIZE", 10)
+    locations = grid_locations(25)
+    fake_osrm.fail = lambda points: True
+    _, unresolved = osrm.fetch_matrix(locations, ROUTE_METHOD.CAR)
+    assert len(unresolved) == 25 * 24
+
+    # OSRM pulih: request berikutnya langsung berhasil, bukan tertahan negative cache
+    fake_osrm.fail = lambda points: False
+    matrix, unresolved = osrm.fetch_matrix(locations, ROUTE_METHOD.CAR)
+    assert unresolved == []
+    assert matrix[24][0] == fake_distance(locations[24], locations[0])
+
+
+def test_null_distance_negatively_cached(fake_osrm):
+    locations = grid_locations(4)
+    island = (locations[3]["lat"], locations[3]["lng"])
+    fake_osrm.no_route = lambda p, q: (q["lat"], q["lng"]) == island
+
+    _, unresolved = osrm.fetch_matrix(locations, ROUTE_METHOD.CAR)
+    assert sorted(unresolved) == [(0, 3), (1, 3), (2, 3)]
+    assert len(fake_osrm.tables) == 1
+
+    # null dari OSRM diingat: tidak di-fetch ulang selama NEGATIVE_TTL
+    fake_osrm.no_route = lambda p, q: False
+    matrix, unresolved = osrm.fetch_matrix(locations, ROUTE_METHOD.CAR)
+    assert sorted(unresolved) == [(0, 3), (1, 3), (2, 3)]
+    assert matrix[0][3] is None
+    assert len(fake_osrm.tables) == 1
+
+
+def test_route_lookup_failure_not_negatively_cached(fake_osrm):
+    p, q = grid_locations(2)
+    fake_osrm.fail = lambda points: True
+    assert osrm.osrm_distance(p, q, ROUTE_METHOD.CAR) is None
+
+    fake_osrm.fail = lambda points: False
+    assert osrm.osrm_distance(p, q, ROUTE_METHOD.CAR) == fake_distance(p, q)
+
+    r = {"name": "far", "lat": -8.0, "lng": 113.0}
+    fake_osrm.no_route = lambda a, b: True
+    assert osrm.osrm_distance(p, r, ROUTE_METHOD.CAR) is None
+    fake_osrm.no_route = lambda a, b: False
+    assert osrm.osrm_distance(p, r, ROUTE_METHOD.CAR) is None
+
+
+def test_build_distance_matrix_reports_table_stats(osrm_server, monkeypatch):
+    monkeypatch.setattr(osrm, "MAX_TABLE_SIZE", 10)
+    osrm_server.delay = 0.02
+    locations = grid_locations(15)
+
+    dist_car, dist_bike = osrm.build_distance_matrix(locations)
+
+    # 15 lokasi, maks 10 koordinat per request: beberapa tile per profil
+    assert osrm.table_stats["requests"] == len(osrm_server.tables) > 2
+    assert osrm.table_stats["seconds"] >= osrm.table_stats["requests"] * osrm_server.delay
+    assert dist_car[3][12] == dist_bike[3][12] == fake_distance(locations[3], locations[12])
+
+    # semua dari cache: statistik fetch terakhir kembali nol request
+    osrm.build_distance_matrix(locations)
+    assert osrm.table_stats["requests"] == 0
+    assert osrm.table_stats["seconds"] < osrm_server.delay
+
+
+def test_server_failure_retried_then_unresolved(osrm_server):
+    osrm_server.fail = lambda points: True
+    locations = grid_locations(4)
+
+    with pytest.raises(osrm.DistanceLookupError) as error:
+        osrm.build_distance_matrix(locations)
+
+    assert len(error.value.unresolved) == 2 * 4 * 3
+    assert osrm.table_stats["requests"] == 2
+
+    # 503 (setelah retry) tidak masuk negative cache: begitu server pulih langsung resolve
+    osrm_server.fail = lambda points: False
+    dist_car, _ = osrm.build_distance_matrix(locations)
+    assert dist_car[0][3] == fake_distance(locations[0], locations[3])
@@ -0,0 +1,87 @@
+import itertools
+import tracemalloc
+
+import numpy as np
+import pytest
+
+from algorithms import population
+from algorithms.matrix import DistanceMatrices
+from algorithms.population import ArrayPopulation
+
+
+def random_ops(rng, n, cars, bikes, max_trip=None):
+    xy = rng.random((n, 2)) * 100
+    dist = np.sqrt(((xy[:, None] - xy[None]) ** 2).sum(axis=2))
+    demands = np.r_[0, rng.integers(1, 25, n - 1)]
+    return ArrayPopulation(DistanceMatrices(dist, dist * 1.1), demands, cars, bikes, 60, 30, 0.1, rng,
+                           "split", max_trip)
+
+
+def reference_split(ops, tour):
+    # semua cara memotong tour jadi trip, dengan tipe kendaraan per trip
+    m = len(tour)
+    best = np.inf
+    for cuts in itertools.product((False, True), repeat=m - 1):
+        bounds = [0] + [k + 1 for k, cut in enumerate(cuts) if cut] + [m]
+        trips = [tour[a:b] for a, b in zip(bounds, bounds[1:])]
+        if any(len(t) > ops.max_trip for t in trips):
+            continue
+        for kinds in itertools.product((0, 1), repeat=len(trips)):
+            if kinds.count(0) > ops.car_count or kinds.count(1) > ops.bike_count:
+                continue
+            total = 0.0
+            for trip, kind in zip(trips, kinds):
+                capacity = ops.bike_capacity if kind else ops.car_capacity
+                if ops.demands[trip].sum() > capacity:
+                    total = np.inf
+                    break
+                path = [0] + list(trip) + [0]
+                total += sum(ops.data[kind][a, b] for a, b in zip(path, path[1:]))
+            best = min(best, total)
+    return best
+
+
+@pytest.mark.parametrize("seed", range(6))
+def test_split_matches_exhaustive_split(seed):
+    rng = np.random.default_rng(seed)
+    ops = random_ops(rng, 8, int(rng.integers(0, 3)), int(rng.integers(1, 3)), max_trip=[None, 2, 3][seed % 3])
+    tours = np.array([rng.permutation(np.arange(1, 8)) for _ in range(5)])
+
+    end, _ = ops._split_dp(tours)
+    expected = [reference_split(ops, tour) for tour in tours]
+    assert np.allclose(end.reshape(len(tours), -1).min(axis=1), expected)
+
+
+def test_split_blocks_and_routes_consistent(monkeypatch):
+    rng = np.random.default_rng(7)
+    ops = random_ops(rng, 40, 3, 3, max_trip=6)
+    tours = np.array([rng.permutation(np.arange(1, 40)) for _ in range(30)])
+    whole, _ = ops._split_dp(tours)
+
+    # blok kecil: populasi dihitung beberapa baris sekaligus, hasil sama
+    monkeypatch.setattr(population, "SPLIT_DP_BYTES", 1)
+    blocked, _ = ops._split_dp(tours)
+    assert np.array_equal(whole, blocked)
+
+    for tour, end in zip(tours[:5], whole[:5]):
+        routes = ops.split_routes(tour)
+        if not np.isfinite(end).any():
+            assert routes is None
+            continue
+        cost = sum(ops.data[int(bike)][a, b] for route, bike in routes
+                   for a, b in zip([0] + route, route + [0]))
+        assert cost == pytest.approx(end.min())
+        assert [c for route, _ in routes for c in route] == tour.tolist()
+
+
+def test_split_memory_does_not_grow_with_tour_length():
+    rng = np.random.default_rng(0)
+    ops = random_ops(rng, 301, 20, 20, max_trip=10)
+    tours = np.array([rng.permutation(np.arange(1, 301)) for _ in range(200)])
+
+    tracemalloc.start()
+    ops._split_dp(tours)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    # tabel penuh (P, m + 1, 21, 21) float64 = ~212 MB
+    assert peak < 2 * population.SPLIT_DP_BYTES
@@ -0,0 +1,38 @@
+import os
+
+import pytest
+
+from solving.errors import SolveError
+from solving.instances import read_instance
+from solving.portfolio import run_portfolio
+
+
+INSTANCE = os.path.join(os.path.dirname(__file__), "..", "benchmarks", "instances", "E-n22-k4.vrp")
+
+
+def instance_args(params):
+    instance = read_instance(INSTANCE)
+    dist_car, dist_bike = instance.matrices
+    return dist_car, dist_bike, instance.demands, dict(instance.params, **params)
+
+
+def test_failed_restart_recorded_and_best_kept():
+    # encoding tidak dikenal: restart genetic raise, restart tabu tetap jalan
+    args = instance_args({"algorithms": ["genetic", "tabu-search"], "restarts": 2, "seed": 1,
+                          "encoding": "bogus", "maxIterations": 50})
+    full_routes, _, result = run_portfolio(*args)
+
+    restarts = result["portfolio"]["restarts"]
+    assert [r["status"] for r in restarts] == ["failed", "done"]
+    assert "bogus" in restarts[0]["error"]
+    assert result["portfolio"]["best"]["algorithm"] == "tabu-search"
+    assert result["finalCost"] == restarts[1]["cost"]
+    assert sorted(c for r in full_routes for c in r if c) == list(range(1, 22))
+
+
+def test_all_restarts_failed():
+    args = instance_args({"algorithms": ["genetic"], "restarts": 2, "encoding": "bogus"})
+    with pytest.raises(SolveError) as error:
+        run_portfolio(*args)
+    assert error.value.status == 500
+    assert len(error.value.payload["restarts"]) == 2
@@ -0,0 +1,41 @@
+from routing.cache import RouteCache
+
+
+def statements(cache):
+    seen = []
+    cache._conn().set_trace_callback(seen.append)
+    return seen
+
+
+def test_eviction_keeps_most_recently_used(tmp_path):
+    cache = RouteCache(str(tmp_path / "cache.sqlite"), max_entries=10)
+    for i in range(10):
+        cache.set(f"k{i}", i)
+    cache.get("k0")
+    cache.set_many({f"n{i}": i for i in range(3)})
+
+    found = cache.get_many([f"k{i}" for i in range(10)] + ["n0", "n1", "n2"])
+    assert len(found) == 10
+    assert "k0" in found and "k1" not in found
+    assert cache.stats["evictions"] == 3
+
+
+def test_writes_do_not_count_the_table(tmp_path):
+    cache = RouteCache(str(tmp_path / "cache.sqlite"), max_entries=100000)
+    seen = statements(cache)
+    for i in range(cache.evict_interval * 3):
+        cache.set(f"k{i}", i)
+
+    # overflow dicek sekali per interval, dan tanpa COUNT(*) selama di bawah batas
+    assert sum("max(rowid)" in sql for sql in seen) == 3
+    assert not any("COUNT(*)" in sql for sql in seen)
+
+
+def test_overflow_bounded_by_interval(tmp_path):
+    cache = RouteCache(str(tmp_path / "cache.sqlite"), max_entries=1000)
+    assert cache.evict_interval == 10
+    for s in range(0, 1500, 5):
+        cache.set_many({f"k{i}": i for i in range(s, s + 5)})
+
+    total = cache._conn().execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+    assert 1000 <= total < 1000 + cache.evict_interval
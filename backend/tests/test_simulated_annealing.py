@@ -0,0 +1,29 @@
+import os
+import random
+
+import numpy as np
+
+from algorithms.core import Problem
+from algorithms.simulatedAnnealing import simulated_annealing
+from solving.instances import read_instance
+
+
+INSTANCE = os.path.join(os.path.dirname(__file__), "..", "benchmarks", "instances", "E-n22-k4.vrp")
+
+
+def test_overloaded_warm_start_is_penalized_and_repaired():
+    instance = read_instance(INSTANCE)
+    dist_car, dist_bike = instance.matrices
+    vehicles = instance.params["vehicles"]
+    problem = Problem.from_vehicles(dist_car, dist_bike, instance.demands, vehicles)
+    # semua stop di kendaraan pertama, seperti insertion yang tidak menemukan tempat muat
+    initial = [list(problem.customers)] + [[] for _ in problem.vehicles[1:]]
+
+    random.seed(0)
+    np.random.seed(0)
+    routes, cost, history, _ = simulated_annealing(dist_car, dist_bike, instance.demands, vehicles,
+                                                   300, 1000, 0.99, initial_routes=initial)
+
+    assert history[0]["cost"] == problem.total_cost(initial) > problem.distance(initial)
+    assert problem.overload(routes) == 0
+    assert cost == problem.distance(routes)
@@ -301,29 +301,37 @@ function App() {
           tabuTenure: params?.tabuTenure ?? 20,
         };
 
+        // titik history di-plot langsung selama job berjalan
+        const livePoints = [];
+        const onProgress = (point) => {
+          livePoints.push(point);
+          setHistory([...livePoints]);
+          setCurrentIteration(livePoints.length - 1);
+        };
+
         switch (algorithm) {
           case "simulated-annealing":
-            data = await api.solveSimulatedAnnealing(locations, {
+            data = await api.solveJob(algorithm, locations, {
               vehicles: vehicles,
               maxIterations: saParams.maxIterations,
               coolingRate: saParams.coolingRate,
               initialTemp: saParams.initialTemp,
-            });
+            }, onProgress);
             break;
           case "genetic":
-            data = await api.solveGenetic(locations, {
+            data = await api.solveJob(algorithm, locations, {
               vehicles: vehicles,
               populationSize: saParams.populationSize,
               generations: saParams.generations,
               mutationRate: saParams.mutationRate,
-            });
+            }, onProgress);
             break;
           case "tabu-search":
-            data = await api.solveTabuSearch(locations, {
+            data = await api.solveJob(algorithm, locations, {
               vehicles: vehicles,
               maxIterations: saParams.maxIterations,
               tabuTenure: saParams.tabuTenure,
-            });
+            }, onProgress);
             break;
           default:
             throw new Error(`Algorithm "${algorithm}" tidak dikenali`);
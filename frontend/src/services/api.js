@@ -119,6 +119,61 @@ export const api = {
     }
   },
 
+  // Async job: submit ke /api/jobs, stream progress (SSE), lalu ambil hasil
+  solveJob: async (algorithm, locations, params = {}, onProgress) => {
+    try {
+      const response = await fetch(`${API_URL}/api/jobs/${algorithm}`, {
+        method: "POST",
+        headers: {
+          "Content-Type": "application/json",
+        },
+        body: JSON.stringify({ locations, params }),
+      });
+
+      if (!response.ok) {
+        throw new Error(`Failed to submit ${algorithm} job`);
+      }
+
+      const job = await response.json();
+
+      await new Promise((resolve, reject) => {
+        const source = new EventSource(`${API_URL}/api/jobs/${job.jobId}/events`);
+        source.addEventListener("progress", (event) => {
+          if (onProgress) onProgress(JSON.parse(event.data));
+        });
+        ["done", "failed", "cancelled"].forEach((status) =>
+          source.addEventListener(status, () => {
+            source.close();
+            resolve();
+          })
+        );
+        source.onerror = () => {
+          // EventSource reconnect sendiri, kecuali koneksi sudah ditutup
+          if (source.readyState === EventSource.CLOSED) {
+            reject(new Error("Job progress stream closed"));
+          }
+        };
+      });
+
+      const result = await fetch(`${API_URL}/api/jobs/${job.jobId}/result`);
+      if (!result.ok) {
+        throw new Error(`Failed to solve with ${algorithm}`);
+      }
+
+      return await result.json();
+    } catch (error) {
+      console.error("Solve job error:", error);
+      throw error;
+    }
+  },
+
+  cancelJob: async (jobId) => {
+    const response = await fetch(`${API_URL}/api/jobs/${jobId}/cancel`, {
+      method: "POST",
+    });
+    return await response.json();
+  },
+
   saveLocation: async (locationData) => {
     try {
       const response = await axios.post(